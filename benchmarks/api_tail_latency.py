@@ -0,0 +1,137 @@
+"""Tail latency and outage behaviour of the API client with and without TailLatencyGuard.
+
+Usage:
+    python benchmarks/api_tail_latency.py --requests 200 --slow-rate 0.02 --slow-latency 5
+
+Starts the stub API (stub_football_api.py) in-process with fault injection
+and runs two scenarios against it, once with the previous behaviour (a flat
+30-second timeout, no hedging, no retries, no circuit breaker) and once with
+the guard (src/api_extraction/resilience.py):
+
+- tail: --requests sequential teams/{id} requests, --slow-rate of which the
+  stub only answers after --slow-latency seconds. Reports p50, p99 and max
+  latency and the extra requests hedging sent;
+- outage: the stub stops answering within --slow-latency seconds for
+  --outage-requests requests. Reports how long the requests took to fail and
+  how many of them reached the API.
+
+Each client first sends --warmup healthy requests so the guard has latencies
+to adapt to. --min-timeout lowers the floor of adaptive timeouts (5s by
+default) to keep the outage scenario short.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+import requests
+
+from stub_football_api import StubFootballAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from football_api_client import FootballAPIClient  # noqa: E402
+from resilience import CircuitBreaker, TailLatencyGuard  # noqa: E402
+
+
+def baseline_guard() -> TailLatencyGuard:
+    """A guard reproducing the previous client: flat timeout, no hedging, retries or breaker."""
+    return TailLatencyGuard(
+        connect_timeout=30.0, min_timeout=30.0, max_hedge_ratio=0, max_retries=0,
+        breaker=CircuitBreaker(failure_threshold=0)
+    )
+
+
+def served(server: StubFootballAPI) -> int:
+    return server.stats().get('bench', {}).get('served', 0)
+
+
+def warm_up(client: FootballAPIClient, server: StubFootballAPI, args):
+    server.slow_rate = 0.0
+    for team_id in range(args.warmup):
+        client.get_team(team_id)
+
+
+def tail(client: FootballAPIClient, server: StubFootballAPI, args) -> dict:
+    warm_up(client, server, args)
+    server.slow_rate = args.slow_rate
+    sent_before = served(server)
+    latencies = []
+    for team_id in range(args.requests):
+        start = time.monotonic()
+        client.get_team(team_id)
+        latencies.append(time.monotonic() - start)
+    latencies.sort()
+    return {
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        'max': latencies[-1],
+        'extra': served(server) - sent_before - args.requests,
+    }
+
+
+def outage(client: FootballAPIClient, server: StubFootballAPI, args) -> dict:
+    warm_up(client, server, args)
+    server.slow_rate = 1.0
+    sent_before = served(server)
+    failed = 0
+    start = time.monotonic()
+    for team_id in range(args.outage_requests):
+        try:
+            client.get_team(team_id)
+        except requests.exceptions.RequestException:
+            failed += 1
+    return {'seconds': time.monotonic() - start, 'failed': failed, 'reached': served(server) - sent_before}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--outage-requests', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds the stub takes to answer normally')
+    parser.add_argument('--slow-rate', type=float, default=0.02)
+    parser.add_argument('--slow-latency', type=float, default=5.0)
+    parser.add_argument('--min-timeout', type=float, default=1.0)
+    args = parser.parse_args()
+    # Per-request log lines and the expected failures would bury the tables
+    logging.disable(logging.ERROR)
+
+    server = StubFootballAPI(
+        ('127.0.0.1', 0), quota=10 ** 9, latency=args.latency, slow_latency=args.slow_latency, seed=42
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v4"
+
+    def guards():
+        yield 'flat', baseline_guard()
+        yield 'guarded', TailLatencyGuard(min_timeout=args.min_timeout, backoff_seconds=0.2)
+
+    print(
+        f"tail: {args.requests} requests, {args.slow_rate:.0%} answered after {args.slow_latency:g}s "
+        f"(otherwise {args.latency * 1000:.0f}ms)"
+    )
+    print(f"{'client':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'max ms':>7} | {'extra requests':>14}")
+    print('-' * 56)
+    for name, guard in guards():
+        result = tail(FootballAPIClient(api_key='bench', base_url=base_url, guard=guard), server, args)
+        print(
+            f"{name:>8} | {result['p50'] * 1000:>7.0f} | {result['p99'] * 1000:>7.0f} | "
+            f"{result['max'] * 1000:>7.0f} | {result['extra']:>14}"
+        )
+
+    print(f"\noutage: {args.outage_requests} requests while no answer comes within {args.slow_latency:g}s")
+    print(f"{'client':>8} | {'seconds':>7} | {'failed':>6} | {'reached API':>11}")
+    print('-' * 44)
+    for name, guard in guards():
+        result = outage(FootballAPIClient(api_key='bench', base_url=base_url, guard=guard), server, args)
+        print(f"{name:>8} | {result['seconds']:>7.1f} | {result['failed']:>6} | {result['reached']:>11}")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Prompt tokens per task of the football analytics crew.
+
+Usage:
+    python benchmarks/crew_prompt_tokens.py --answer-tokens 800
+
+Builds the crew (without calling any LLM) and estimates the task part of each
+prompt: the description and expected output, plus the outputs of the tasks in
+its `context=`, which is what crew.run_tasks_parallel (the default) passes on.
+With --sequential, tasks without a context get the previous task's output
+instead, as crew.kickoff() with Process.sequential does. Every task output is
+assumed to be --answer-tokens long. The agents' role, goal and backstory are
+the same in every prompt and are left out.
+
+Tokens are estimated at four characters per token, as in context_pack.py.
+Run it before and after changing tasks.py or crew.py to compare.
+"""
+
+import argparse
+import os
+import sys
+import logging
+
+# No model is called; replay mode builds the agents without an LLM client or API key
+os.environ.setdefault('CREW_LLM_CACHE_MODE', 'replay')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'crewai_agents'))
+from context_pack import CHARS_PER_TOKEN  # noqa: E402
+from crew import create_football_analytics_crew  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--answer-tokens', type=int, default=800, help='Assumed length of every task output')
+    parser.add_argument('--sequential', action='store_true', help='Model crew.kickoff() instead')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    tasks = create_football_analytics_crew().tasks
+    print(f"{'task':>36} | {'own':>6} | {'context':>7} | {'prompt':>6}")
+    print('-' * 66)
+    total = 0
+    for i, task in enumerate(tasks):
+        own = len(task.description + (task.expected_output or '')) // CHARS_PER_TOKEN
+        upstream = len(task.context) if task.context else min(i, 1) if args.sequential else 0
+        context = upstream * args.answer_tokens
+        total += own + context
+        name = task.description.split('.')[0].split('\n')[0][:36]
+        print(f"{name:>36} | {own:>6} | {context:>7} | {own + context:>6}")
+    print(f"Total prompt tokens: {total} ({len(tasks)} tasks, {args.answer_tokens}-token answers)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Parse-time budget check for the Airflow DAG files.
+
+Usage:
+    python benchmarks/dag_parse_time.py --budget-ms 200
+
+Parses the DAG folder with DagBag several times, reports the median parse time
+per file, and exits non-zero when a file is over budget, fails to import, or
+pulls the extraction modules in at parse time.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+DAG_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'airflow', 'dags'))
+
+# Modules that must only be imported inside task callables
+TASK_ONLY_MODULES = ['extract_football_data', 'football_api_client', 'database_loader', 'refresh_planner', 'team_ratings', 'rate_limiter', 'spool', 'pipelined_loader', 'enrichment', 'resilience']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=200.0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    from airflow.models import DagBag
+
+    durations = {}
+    for _ in range(args.runs):
+        dag_bag = DagBag(dag_folder=DAG_FOLDER, include_examples=False)
+        if dag_bag.import_errors:
+            for path, error in dag_bag.import_errors.items():
+                print(f"Import error in {path}:\n{error}")
+            return 1
+        for stat in dag_bag.dagbag_stats:
+            duration = stat.duration.total_seconds() if hasattr(stat.duration, 'total_seconds') else stat.duration
+            durations.setdefault(stat.file, []).append(duration * 1000)
+
+    failures = 0
+    for path, samples in sorted(durations.items()):
+        median_ms = statistics.median(samples)
+        status = 'ok' if median_ms <= args.budget_ms else 'OVER BUDGET'
+        print(f"{path:<40} median {median_ms:8.1f} ms  (budget {args.budget_ms:.0f} ms)  {status}")
+        if median_ms > args.budget_ms:
+            failures += 1
+
+    leaked = [name for name in TASK_ONLY_MODULES if name in sys.modules]
+    if leaked:
+        print(f"Imported at parse time: {', '.join(leaked)}")
+        failures += 1
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    exit_code = main()
+    print(f"Finished in {time.perf_counter() - start:.1f}s")
+    sys.exit(exit_code)
@@ -0,0 +1,85 @@
+"""Side-by-side timing of full dbt builds on Postgres and on local DuckDB.
+
+Usage:
+    python benchmarks/dbt_build_timing.py --scales 100000 1000000
+
+Each scale generates synthetic raw data, writes Parquet extracts for the
+`local` (DuckDB) target, loads the same rows into the Postgres raw schema for
+the `dev` target, then times `dbt build --full-refresh` on both.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate_raw_tables, write_extracts, load_into_postgres
+
+DBT_PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dbt_football'))
+
+
+def postgres_connection_string() -> str:
+    """Build the Postgres connection string from the same variables as profiles.yml."""
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    db = os.getenv('POSTGRES_DB', 'football_analytics')
+    user = os.getenv('POSTGRES_USER', 'airflow')
+    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+    return f'postgresql://{user}:{password}@{host}:{port}/{db}'
+
+
+def time_dbt_build(target: str, env: dict) -> float:
+    """Run a full-refresh dbt build against a target and return elapsed seconds."""
+    start = time.perf_counter()
+    subprocess.run(
+        ['dbt', 'build', '--full-refresh', '--profiles-dir', '.', '--target', target],
+        cwd=DBT_PROJECT_DIR,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--skip-postgres', action='store_true', help='Only time the DuckDB target')
+    args = parser.parse_args()
+
+    results = []
+    for n_matches in args.scales:
+        con = generate_raw_tables(n_matches)
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            extracts_dir = os.path.join(work_dir, 'raw')
+            write_extracts(con, extracts_dir)
+
+            env = dict(os.environ)
+            env['FOOTBALL_RAW_EXTRACTS'] = f"read_parquet('{extracts_dir}/{{name}}.parquet')"
+            env['DUCKDB_PATH'] = os.path.join(work_dir, 'benchmark.duckdb')
+            duckdb_seconds = time_dbt_build('local', env)
+
+        postgres_seconds = None
+        if not args.skip_postgres:
+            load_into_postgres(con, postgres_connection_string())
+            postgres_seconds = time_dbt_build('dev', dict(os.environ))
+
+        con.close()
+        results.append((n_matches, postgres_seconds, duckdb_seconds))
+
+    print()
+    print(f"{'matches':>12} | {'postgres (s)':>12} | {'duckdb (s)':>10} | {'speedup':>7}")
+    print('-' * 52)
+    for n_matches, postgres_seconds, duckdb_seconds in results:
+        if postgres_seconds is None:
+            print(f"{n_matches:>12} | {'-':>12} | {duckdb_seconds:>10.2f} | {'-':>7}")
+        else:
+            speedup = postgres_seconds / duckdb_seconds
+            print(f"{n_matches:>12} | {postgres_seconds:>12.2f} | {duckdb_seconds:>10.2f} | {speedup:>6.1f}x")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""API quota spent on team and match details: naive fetching versus DetailPlanner.
+
+Usage:
+    python benchmarks/enrichment_cost.py --days 60 --budget 100
+
+Simulates daily runs over a synthetic season (five 20-team leagues playing a
+round a week, plus two 36-team European competitions drawn from the same
+clubs), starting mid-season with no details stored. Two strategies fetch
+details every day:
+
+- naive: teams/{id} for every team of every competition, and matches/{id} for
+  every match from the day before to a week ahead, as a loop over the
+  competition payloads would;
+- planned: the requests DetailPlanner ranks (see src/api_extraction/enrichment.py),
+  cut off at --budget requests a day.
+
+Reports the requests spent, the share of finished matches with final details,
+and the share of teams with details younger than the TTL at the end. No API
+or database is involved; the planner's decisions run on the simulated state.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from enrichment import DetailPlanner  # noqa: E402
+
+MATCH_DURATION = timedelta(hours=2, minutes=30)
+SEASON_START = datetime(2024, 8, 17, 15, 0)
+
+
+def season_fixtures():
+    """Match ID, competition, kickoff and teams of every fixture of the season."""
+    fixtures = []
+    leagues = [2021, 2014, 2002, 2019, 2015]
+    clubs = {comp: [comp * 100 + i for i in range(20)] for comp in leagues}
+    for comp, teams in clubs.items():
+        for round_ in range(38):
+            kickoff = SEASON_START + timedelta(days=7 * round_)
+            # Circle method: every team plays once per round
+            rotated = teams[:1] + teams[1:][round_ % 19:] + teams[1:][:round_ % 19]
+            for i in range(10):
+                fixtures.append((len(fixtures) + 1, comp, kickoff, rotated[i], rotated[19 - i]))
+
+    # European competitions: the top and next clubs of each league, a round every two weeks
+    for comp, picks, offset in ((2001, slice(0, 8), 3), (2146, slice(8, 16), 4)):
+        teams = [team for league in leagues for team in clubs[league][picks]][:36]
+        for round_ in range(8):
+            kickoff = SEASON_START + timedelta(days=30 + 14 * round_ + offset)
+            for i in range(18):
+                home, away = teams[(i + round_) % 36], teams[(35 - i + round_) % 36]
+                fixtures.append((len(fixtures) + 1, comp, kickoff, home, away))
+    return fixtures
+
+
+def status(kickoff: datetime, now: datetime) -> str:
+    return 'FINISHED' if kickoff + MATCH_DURATION <= now else 'TIMED'
+
+
+def simulate(strategy: str, args) -> dict:
+    fixtures = season_fixtures()
+    planner = DetailPlanner(db_loader=None, team_ttl_days=args.team_ttl_days, match_ttl_hours=args.match_ttl_hours)
+    team_details, match_details = {}, {}
+    spent = 0
+
+    start = SEASON_START + timedelta(days=args.start_day, hours=-9)
+    for day in range(args.days):
+        now = start + timedelta(days=day)
+        if strategy == 'naive':
+            memberships = {(comp, team) for _, comp, _, home, away in fixtures for team in (home, away)}
+            window = [f for f in fixtures if now - timedelta(days=1) <= f[2] < now + planner.lookahead]
+            for _, team in memberships:
+                team_details[team] = now
+            for match_id, _, kickoff, _, _ in window:
+                match_details[match_id] = (status(kickoff, now), now)
+            spent += len(memberships) + len(window)
+            continue
+
+        teams = {}
+        for _, comp, kickoff, home, away in fixtures:
+            for team in (home, away):
+                state = teams.setdefault(team, {'competitions': set(), 'upcoming': 0, 'extracted_at': None})
+                state['competitions'].add(comp)
+                state['upcoming'] += kickoff >= now
+        for team, state in teams.items():
+            state['competitions'] = len(state['competitions'])
+            state['extracted_at'] = team_details.get(team)
+        matches = [
+            {
+                'id': match_id, 'status': status(kickoff, now), 'utc_date': kickoff,
+                'detail_status': match_details.get(match_id, (None, None))[0],
+                'extracted_at': match_details.get(match_id, (None, None))[1],
+            }
+            for match_id, _, kickoff, _, _ in fixtures if kickoff < now + planner.lookahead
+        ]
+        planned = sorted(
+            planner.team_requests(teams, now) + planner.match_requests(matches, now),
+            key=lambda request: request.priority
+        )[:args.budget]
+        kickoffs = {f[0]: f[2] for f in fixtures}
+        for request in planned:
+            if request.entity == 'team':
+                team_details[request.entity_id] = now
+            else:
+                match_details[request.entity_id] = (status(kickoffs[request.entity_id], now), now)
+        spent += len(planned)
+
+    end = start + timedelta(days=args.days - 1)
+    finished = [f[0] for f in fixtures if status(f[2], end) == 'FINISHED']
+    final = sum(match_details.get(match_id, (None,))[0] == 'FINISHED' for match_id in finished)
+    teams = {team for f in fixtures for team in f[3:]}
+    fresh = sum(
+        team in team_details and end - team_details[team] < timedelta(days=args.team_ttl_days) for team in teams
+    )
+    return {
+        'requests': spent,
+        'finished_coverage': final / len(finished),
+        'team_coverage': fresh / len(teams),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--start-day', type=int, default=100, help='Season day of the first run')
+    parser.add_argument('--budget', type=int, default=100, help='Detail requests per daily run')
+    parser.add_argument('--team-ttl-days', type=float, default=7)
+    parser.add_argument('--match-ttl-hours', type=float, default=24)
+    args = parser.parse_args()
+
+    print(f"{args.days} daily runs from season day {args.start_day}, budget {args.budget} requests a day")
+    print(f"{'strategy':>8} | {'requests':>8} | {'per day':>7} | {'finished matches':>16} | {'fresh teams':>11}")
+    print('-' * 64)
+    for strategy in ('naive', 'planned'):
+        result = simulate(strategy, args)
+        print(
+            f"{strategy:>8} | {result['requests']:>8} | {result['requests'] / args.days:>7.0f} | "
+            f"{result['finished_coverage']:>16.1%} | {result['team_coverage']:>11.1%}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""TCP proxy that adds network latency in front of Postgres.
+
+Usage:
+    python benchmarks/latency_proxy.py --listen-port 6543 --target localhost:5432 --delay-ms 2
+
+Every chunk is forwarded --delay-ms after it arrives, in each direction, so a
+round trip through the proxy costs twice the delay while throughput is not
+throttled. This stands in for `tc qdisc add dev lo root netem delay ...`, which
+needs root and slows down everything else on the loopback interface. The
+target may also be a Unix socket path (e.g. /var/run/postgresql/.s.PGSQL.5432).
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+
+class LatencyProxy:
+    """Asyncio TCP proxy delaying traffic by a fixed one-way latency."""
+
+    def __init__(self, target: str, delay_seconds: float, listen_host: str = '127.0.0.1', listen_port: int = 0):
+        """Initialize the proxy.
+
+        Args:
+            target: host:port or Unix socket path to forward to
+            delay_seconds: One-way delay added to every chunk
+            listen_host: Address to listen on
+            listen_port: Port to listen on (0 picks a free port)
+        """
+        self.target = target
+        self.delay_seconds = delay_seconds
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self._loop = None
+        self._server = None
+
+    async def _open_target(self):
+        if self.target.startswith('/'):
+            return await asyncio.open_unix_connection(self.target)
+        host, port = self.target.rsplit(':', 1)
+        return await asyncio.open_connection(host, int(port))
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Forward chunks from reader to writer, each one delay after it was read."""
+        in_flight: asyncio.Queue = asyncio.Queue()
+
+        async def deliver():
+            while True:
+                due, chunk = await in_flight.get()
+                if chunk is None:
+                    break
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+                writer.write(chunk)
+                await writer.drain()
+            writer.close()
+
+        delivery = asyncio.ensure_future(deliver())
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                in_flight.put_nowait((time.monotonic() + self.delay_seconds, chunk))
+        except ConnectionError:
+            pass
+        finally:
+            in_flight.put_nowait((0.0, None))
+            await delivery
+
+    async def _handle(self, client_reader, client_writer):
+        try:
+            target_reader, target_writer = await self._open_target()
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(
+            self._pipe(client_reader, target_writer),
+            self._pipe(target_reader, client_writer),
+            return_exceptions=True,
+        )
+
+    async def _start_server(self):
+        self._server = await asyncio.start_server(self._handle, self.listen_host, self.listen_port)
+        self.listen_port = self._server.sockets[0].getsockname()[1]
+
+    def start(self) -> int:
+        """Run the proxy on a background thread.
+
+        Returns:
+            Port the proxy listens on
+        """
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start_server())
+        # Open connections keep being served until their clients disconnect
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        return self.listen_port
+
+    def stop(self):
+        """Stop accepting connections."""
+        self._loop.call_soon_threadsafe(self._server.close)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listen-port', type=int, default=6543)
+    parser.add_argument('--target', default='localhost:5432')
+    parser.add_argument('--delay-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    proxy = LatencyProxy(args.target, args.delay_ms / 1000, listen_port=args.listen_port)
+    proxy.start()
+    print(f"Forwarding 127.0.0.1:{proxy.listen_port} to {args.target} with {args.delay_ms:g} ms each way")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        proxy.stop()
+
+
+if __name__ == '__main__':
+    main()
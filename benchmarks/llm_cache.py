@@ -0,0 +1,62 @@
+"""Crew runs against a cold, warm and replayed LLM response cache.
+
+Usage:
+    python benchmarks/llm_cache.py --latency 2.0
+
+Runs the football analytics crew three times against a fresh cache file, with
+a stub LLM that answers every prompt after --latency seconds:
+
+    cold    read_write mode on an empty cache (every prompt is a miss)
+    warm    read_write mode again (every unchanged prompt is a hit)
+    replay  replay mode with no model behind the cache at all
+
+and reports wall-clock time, hit rate and model time saved for each run.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from crew_parallel import SlowStubLLM
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'crewai_agents'))
+from llm import set_llm  # noqa: E402
+from llm_cache import CachedLLM, LLMResponseCache  # noqa: E402
+from crew import create_football_analytics_crew, run_tasks_parallel  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=2.0, help='Seconds per LLM call')
+    args = parser.parse_args()
+
+    stub = SlowStubLLM(latency=args.latency)
+    cache_path = os.path.join(tempfile.mkdtemp(), 'llm_responses.sqlite')
+
+    print(f"{'run':>6} | {'wall clock (s)':>14} | {'hits':>4} | {'misses':>6} | {'hit rate':>8} | {'saved (s)':>9}")
+    print('-' * 63)
+    for label, mode in (('cold', 'read_write'), ('warm', 'read_write'), ('replay', 'replay')):
+        cache = LLMResponseCache(path=cache_path)
+        set_llm(CachedLLM(
+            inner=None if mode == 'replay' else stub,
+            cache=cache,
+            llm_params={'model_name': 'slow-stub'},
+            mode=mode
+        ))
+
+        start = time.perf_counter()
+        run_tasks_parallel(create_football_analytics_crew().tasks)
+        elapsed = time.perf_counter() - start
+
+        stats = cache.stats()
+        print(
+            f"{label:>6} | {elapsed:>14.2f} | {stats['hits']:>4} | {stats['misses']:>6} | "
+            f"{stats['hit_rate']:>8.0%} | {stats['seconds_saved']:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
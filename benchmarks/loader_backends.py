@@ -0,0 +1,154 @@
+"""Load time of DatabaseLoader versus the pipelined psycopg 3 backend.
+
+Usage:
+    python benchmarks/loader_backends.py --competitions 7 --delays-ms 0 1 5
+
+Generates API-shaped payloads for --competitions competitions (20 teams, a
+standings table and 380 matches each) and loads every competition's
+standings and matches, then the teams, the way the extraction does: once
+through DatabaseLoader (one SQLAlchemy upsert and transaction per entity) and
+once through PipelinedDatabaseLoader (one pipelined transaction per
+competition). Each load runs through latency_proxy.py, which adds the given
+one-way delay to every packet, to show the effect of round trips on a remote
+database. The target is the database configured through the usual POSTGRES_*
+variables (or BENCHMARK_DATABASE_URL); rows are written with IDs far above
+real ones and deleted afterwards.
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from latency_proxy import LatencyProxy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from database_loader import DatabaseLoader  # noqa: E402
+from pipelined_loader import PipelinedDatabaseLoader  # noqa: E402
+
+ID_OFFSET = 1_000_000_000
+TEAMS_PER_COMPETITION = 20
+
+
+def connection_string() -> str:
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    db = os.getenv('POSTGRES_DB', 'football_analytics')
+    user = os.getenv('POSTGRES_USER', 'airflow')
+    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+    return os.getenv('BENCHMARK_DATABASE_URL', f'postgresql://{user}:{password}@{host}:{port}/{db}')
+
+
+def proxy_target(url) -> str:
+    """host:port of the database, or its Unix socket path."""
+    host = url.query.get('host') or url.host or 'localhost'
+    port = url.port or 5432
+    return f"{host}/.s.PGSQL.{port}" if host.startswith('/') else f"{host}:{port}"
+
+
+def competition_payloads(comp_index: int, rng: random.Random):
+    """Teams, standings and matches payloads of one synthetic competition."""
+    comp_id = ID_OFFSET + comp_index
+    team_ids = [ID_OFFSET + comp_index * 100 + i for i in range(TEAMS_PER_COMPETITION)]
+    teams = [
+        {'id': team_id, 'name': f"Team {team_id}", 'shortName': f"T{team_id}", 'tla': 'TST',
+         'crest': f"https://crests.example/{team_id}.png", 'address': 'Somewhere 1', 'website': 'https://example.com',
+         'founded': 1900, 'clubColors': 'Red / White', 'venue': 'Stadium'}
+        for team_id in team_ids
+    ]
+    standings = {
+        'season': {'id': comp_id},
+        'standings': [{
+            'stage': 'REGULAR_SEASON', 'type': 'TOTAL', 'group': None,
+            'table': [
+                {'position': pos + 1, 'team': {'id': team_id, 'name': f"Team {team_id}"}, 'playedGames': 38,
+                 'won': 20, 'draw': 10, 'lost': 8, 'points': 70, 'goalsFor': 60, 'goalsAgainst': 40,
+                 'goalDifference': 20}
+                for pos, team_id in enumerate(team_ids)
+            ],
+        }],
+    }
+    matches = []
+    for n, (home, away) in enumerate((h, a) for h in team_ids for a in team_ids if h != a):
+        home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+        matches.append({
+            'id': ID_OFFSET + comp_index * 1000 + n, 'utcDate': f"2024-{8 + n % 5:02d}-{1 + n % 28:02d}T15:00:00Z",
+            'status': 'FINISHED', 'matchday': 1 + n // 10, 'stage': 'REGULAR_SEASON', 'group': None,
+            'competition': {'id': comp_id}, 'season': {'id': comp_id},
+            'homeTeam': {'id': home, 'name': f"Team {home}"}, 'awayTeam': {'id': away, 'name': f"Team {away}"},
+            'score': {
+                'winner': 'HOME_TEAM' if home_goals > away_goals else 'AWAY_TEAM' if away_goals > home_goals else 'DRAW',
+                'duration': 'REGULAR',
+                'fullTime': {'home': home_goals, 'away': away_goals},
+                'halfTime': {'home': home_goals // 2, 'away': away_goals // 2},
+            },
+        })
+    return comp_id, teams, standings, matches
+
+
+def run_load(loader, competitions) -> float:
+    """Seconds to load every competition, then the teams of all of them."""
+    start = time.perf_counter()
+    all_teams = []
+    for comp_id, teams, standings, matches in competitions:
+        loader.load_batch([('standings', comp_id, standings), ('matches', comp_id, matches)])
+        all_teams.extend(teams)
+    loader.load_teams(all_teams)
+    return time.perf_counter() - start
+
+
+def cleanup(loader):
+    with loader.engine.begin() as conn:
+        for table in ('matches', 'teams'):
+            conn.execute(text(f"delete from raw.{table} where id >= :offset"), {'offset': ID_OFFSET})
+        conn.execute(text("delete from raw.standings where competition_id >= :offset"), {'offset': ID_OFFSET})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--competitions', type=int, default=7)
+    parser.add_argument('--delays-ms', type=float, nargs='+', default=[0.0, 1.0, 5.0])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(42)
+    competitions = [competition_payloads(i, rng) for i in range(args.competitions)]
+    rows = sum(len(t) + len(m) + len(s['standings'][0]['table']) for _, t, s, m in competitions)
+
+    url = make_url(connection_string())
+    print(f"{args.competitions} competitions, {rows} rows per load, median of {args.repeats}")
+    print(f"{'one-way delay':>13} | {'sqlalchemy':>10} | {'psycopg 3':>10} | {'speedup':>7}")
+    print('-' * 50)
+    for delay_ms in args.delays_ms:
+        proxy = LatencyProxy(proxy_target(url), delay_ms / 1000)
+        port = proxy.start()
+        proxied = url.set(host='127.0.0.1', port=port, query={}).render_as_string(hide_password=False)
+
+        timings = {}
+        for name, loader_class in (('sqlalchemy', DatabaseLoader), ('psycopg', PipelinedDatabaseLoader)):
+            loader = loader_class(proxied)
+            # A first load warms the connection pool and the prepared statements
+            run_load(loader, competitions)
+            timings[name] = statistics.median(run_load(loader, competitions) for _ in range(args.repeats))
+            cleanup(loader)
+            if isinstance(loader, PipelinedDatabaseLoader):
+                loader.close()
+            loader.engine.dispose()
+        proxy.stop()
+
+        print(
+            f"{delay_ms:>10g} ms | {timings['sqlalchemy']:>9.3f}s | {timings['psycopg']:>9.3f}s | "
+            f"{timings['sqlalchemy'] / timings['psycopg']:>6.1f}x"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
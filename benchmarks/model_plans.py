@@ -0,0 +1,237 @@
+"""Query-plan and runtime regression check for the dbt models on Postgres.
+
+Usage:
+    # Record baselines (on the machine that will run the check)
+    python benchmarks/model_plans.py --scales 10000 100000 1000000 --update-baselines
+
+    # Compare against them; exits non-zero on a regression
+    python benchmarks/model_plans.py --scales 10000 100000 1000000
+
+For each scale, loads synthetic raw data into the Postgres raw schema (see
+synthetic_data.py), builds the project with `dbt run --full-refresh`, and runs
+`EXPLAIN (ANALYZE, BUFFERS)` on the compiled SQL of every model that is
+materialized (tables, incremental models and materialized views; staging views
+show up inside them). Incremental models are measured twice: the full rebuild
+and the incremental `is_incremental()` path run by the daily DAG.
+
+Per model it records the median execution time, the shared and temp buffers
+touched, and the scans in the plan, and compares them to
+benchmarks/baselines/model_plans.json. A model regresses when its runtime or
+buffer count grows beyond the thresholds, or when a relation it used to read
+through an index is now only read by a sequential scan. A scaling table (and
+the growth exponent from the smallest to the largest scale) is printed per
+model.
+
+Like dbt_build_timing.py this replaces the raw tables and rebuilds analytics in
+the database configured through the POSTGRES_* variables (the same ones
+profiles.yml reads). The raw sources live in the football_analytics database,
+so point them at a scratch Postgres server rather than at production.
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+
+import psycopg2
+
+from synthetic_data import generate_raw_tables, load_into_postgres, RAW_TABLES
+
+DBT_PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dbt_football'))
+TARGET_PATH = 'target/model_plans'
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'model_plans.json')
+
+# Materializations whose build runs the model's query
+MEASURED_MATERIALIZATIONS = ('table', 'incremental', 'materialized_view')
+
+INDEX_SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Heap Scan', 'Bitmap Index Scan')
+
+
+def postgres_connection_string() -> str:
+    """Build the Postgres connection string from the same variables as profiles.yml."""
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    db = os.getenv('POSTGRES_DB', 'football_analytics')
+    user = os.getenv('POSTGRES_USER', 'airflow')
+    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+    return f'postgresql://{user}:{password}@{host}:{port}/{db}'
+
+
+def run_dbt(*args: str):
+    subprocess.run(
+        ['dbt', *args, '--profiles-dir', '.', '--target', 'dev', '--target-path', TARGET_PATH],
+        cwd=DBT_PROJECT_DIR,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def compiled_models(full_refresh: bool) -> dict:
+    """Compiled SQL and materialization of every model, keyed by model name."""
+    run_dbt('compile', *(['--full-refresh'] if full_refresh else []))
+    with open(os.path.join(DBT_PROJECT_DIR, TARGET_PATH, 'manifest.json')) as f:
+        manifest = json.load(f)
+    return {
+        node['name']: (node['config']['materialized'], node['compiled_code'])
+        for node in manifest['nodes'].values()
+        if node['resource_type'] == 'model'
+    }
+
+
+def plan_scans(plan: dict) -> list:
+    """Scan nodes of a plan as 'Node Type on relation' strings."""
+    scans = []
+    if 'Relation Name' in plan:
+        scans.append(f"{plan['Node Type']} on {plan['Relation Name']}")
+    for child in plan.get('Plans', []):
+        scans.extend(plan_scans(child))
+    return scans
+
+
+def explain(cursor, sql: str, repeats: int) -> dict:
+    """Run EXPLAIN (ANALYZE, BUFFERS) on a query and summarize the runs."""
+    runs = []
+    for _ in range(repeats + 1):
+        cursor.execute(f"explain (analyze, buffers, format json) {sql}")
+        runs.append(cursor.fetchone()[0][0])
+    # The first run only warms the cache
+    runs = runs[1:]
+    plan = runs[-1]['Plan']
+    return {
+        'execution_ms': round(statistics.median(run['Execution Time'] for run in runs), 2),
+        'shared_buffers': plan.get('Shared Hit Blocks', 0) + plan.get('Shared Read Blocks', 0),
+        'temp_buffers': plan.get('Temp Read Blocks', 0) + plan.get('Temp Written Blocks', 0),
+        'scans': sorted(set(plan_scans(plan))),
+    }
+
+
+def measure_scale(n_matches: int, repeats: int) -> dict:
+    """Load a scale, build the project and measure every materialized model."""
+    con = generate_raw_tables(n_matches)
+    load_into_postgres(con, postgres_connection_string())
+    con.close()
+
+    run_dbt('run', '--full-refresh')
+    queries = {}
+    for name, (materialized, sql) in compiled_models(full_refresh=True).items():
+        if materialized in MEASURED_MATERIALIZATIONS:
+            queries[name] = sql
+    for name, (materialized, sql) in compiled_models(full_refresh=False).items():
+        if materialized == 'incremental':
+            queries[f"{name} (incremental)"] = sql
+
+    results = {}
+    with psycopg2.connect(postgres_connection_string()) as conn:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            # Fresh statistics, so plans don't depend on when autovacuum last ran
+            for table in RAW_TABLES:
+                cursor.execute(f"analyze raw.{table}")
+            cursor.execute("analyze")
+            for name, sql in sorted(queries.items()):
+                results[name] = explain(cursor, sql, repeats)
+                print(f"  {name}: {results[name]['execution_ms']:.1f} ms, {results[name]['shared_buffers']} buffers")
+    return results
+
+
+def find_regressions(results: dict, baselines: dict, args) -> list:
+    """Differences from the baselines that exceed the thresholds."""
+    regressions = []
+    for scale, models in results.items():
+        for name, current in models.items():
+            base = baselines.get(scale, {}).get(name)
+            if base is None:
+                print(f"  no baseline for {name} at {scale} matches")
+                continue
+
+            slower = current['execution_ms'] - base['execution_ms']
+            if (current['execution_ms'] > base['execution_ms'] * (1 + args.runtime_threshold)
+                    and slower > args.min_runtime_delta_ms):
+                regressions.append(
+                    f"{name} at {scale} matches: {base['execution_ms']:.1f} -> {current['execution_ms']:.1f} ms"
+                )
+
+            for key in ('shared_buffers', 'temp_buffers'):
+                if current[key] > base[key] * (1 + args.buffer_threshold) and current[key] - base[key] > 100:
+                    regressions.append(f"{name} at {scale} matches: {key} {base[key]} -> {current[key]}")
+
+            # A relation that used to be read through an index is now scanned in full
+            for scan in base['scans']:
+                node_type, relation = scan.split(' on ', 1)
+                if node_type in INDEX_SCANS and not any(
+                    s.endswith(f" on {relation}") and s.split(' on ', 1)[0] in INDEX_SCANS for s in current['scans']
+                ):
+                    regressions.append(f"{name} at {scale} matches: lost {scan}")
+    return regressions
+
+
+def print_scaling(results: dict):
+    """Execution time and buffers per model across scales, with the growth exponent."""
+    scales = sorted(results, key=int)
+    models = sorted({name for models in results.values() for name in models})
+    print()
+    print(f"{'model':<36} | " + ' | '.join(f"{int(s):>18,}" for s in scales) + " | exponent")
+    print('-' * (39 + 21 * len(scales) + 10))
+    for name in models:
+        cells, points = [], []
+        for scale in scales:
+            result = results[scale].get(name)
+            if result is None:
+                cells.append(f"{'-':>18}")
+                continue
+            cells.append(f"{result['execution_ms']:>9.1f}ms {result['shared_buffers']:>6}b")
+            points.append((int(scale), max(result['execution_ms'], 0.01)))
+        # ~1 is linear in the number of matches; clearly above 1 deserves a look
+        exponent = (
+            f"{math.log(points[-1][1] / points[0][1]) / math.log(points[-1][0] / points[0][0]):>8.2f}"
+            if len(points) > 1 else f"{'-':>8}"
+        )
+        print(f"{name:<36} | " + ' | '.join(cells) + f" | {exponent}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--repeats', type=int, default=5, help='Measured runs per model, after one warm-up run')
+    parser.add_argument('--runtime-threshold', type=float, default=0.5, help='Allowed relative runtime growth')
+    parser.add_argument('--min-runtime-delta-ms', type=float, default=20.0,
+                        help='Runtime growth below this is treated as noise')
+    parser.add_argument('--buffer-threshold', type=float, default=0.2, help='Allowed relative buffer growth')
+    parser.add_argument('--update-baselines', action='store_true', help='Store the results as the new baselines')
+    parser.add_argument('--baselines', default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    results = {}
+    for n_matches in args.scales:
+        print(f"{n_matches:,} matches")
+        results[str(n_matches)] = measure_scale(n_matches, args.repeats)
+
+    print_scaling(results)
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+
+    if args.update_baselines:
+        baselines.update(results)
+        os.makedirs(os.path.dirname(args.baselines), exist_ok=True)
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nBaselines written to {args.baselines}")
+        return 0
+
+    print()
+    regressions = find_regressions(results, baselines, args)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
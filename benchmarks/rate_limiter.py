@@ -0,0 +1,99 @@
+"""Throughput and 429s of key-sharded extraction under the shared rate limiter.
+
+Usage:
+    python benchmarks/rate_limiter.py --keys 1 2 4 --workers 8 --quota 20 --window-seconds 5
+
+Starts the stub API (stub_football_api.py) in-process and, for each key
+count, runs --workers threads for --duration seconds. Each thread plays an
+independent worker: its own database engine, ApiKeyPool and FootballAPIClient,
+sharing only the token buckets in Postgres (configured through the usual
+POSTGRES_* variables). A shortened quota window keeps runs short while
+exercising the same limits as 10 requests per minute.
+
+Reports requests per second against the ideal keys * (quota - 1) / window,
+and the 429s the stub had to send (the target is zero).
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, text
+
+from stub_football_api import StubFootballAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from football_api_client import FootballAPIClient  # noqa: E402
+from rate_limiter import ApiKeyPool  # noqa: E402
+
+
+def connection_string() -> str:
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    db = os.getenv('POSTGRES_DB', 'football_analytics')
+    user = os.getenv('POSTGRES_USER', 'airflow')
+    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+    return os.getenv('BENCHMARK_DATABASE_URL', f'postgresql://{user}:{password}@{host}:{port}/{db}')
+
+
+def run(n_keys: int, args, base_url: str, server: StubFootballAPI):
+    # Fresh keys per run, so buckets start full and runs don't share budget
+    keys = [f"bench-{uuid.uuid4().hex[:8]}" for _ in range(n_keys)]
+    stop_at = time.monotonic() + args.duration
+    served = [0] * args.workers
+
+    def worker(i: int):
+        engine = create_engine(connection_string())
+        pool = ApiKeyPool(keys, engine, requests_per_window=args.quota, window_seconds=args.window_seconds)
+        client = FootballAPIClient(base_url=base_url, key_pool=pool)
+        while time.monotonic() < stop_at:
+            client.get_competition_matches(2021)
+            served[i] += 1
+        engine.dispose()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.workers)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    stats = server.stats()
+    rejected = sum(stats.get(key, {}).get('rejected', 0) for key in keys)
+    ideal = n_keys * (args.quota - 1) / args.window_seconds
+    print(f"{n_keys:>4} | {sum(served) / elapsed:>10.2f} | {ideal:>10.2f} | {rejected:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--quota', type=int, default=20)
+    parser.add_argument('--window-seconds', type=float, default=5.0)
+    parser.add_argument('--duration', type=float, default=20.0)
+    args = parser.parse_args()
+
+    with create_engine(connection_string()).connect() as conn:
+        conn.execute(text('create schema if not exists raw'))
+        conn.commit()
+
+    server = StubFootballAPI(('127.0.0.1', 0), args.quota, args.window_seconds, latency=0.02)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v4"
+
+    print(f"{args.workers} workers, {args.quota} requests per {args.window_seconds:g}s per key, {args.duration:g}s runs")
+    print(f"{'keys':>4} | {'req/s':>10} | {'ideal':>10} | {'429s':>5}")
+    print('-' * 38)
+    for n_keys in args.keys:
+        run(n_keys, args, base_url, server)
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Load test for the read API with a cold and a warm cache.
+
+Usage:
+    python benchmarks/read_api_load.py --teams 200 --concurrency 16 --rounds 5
+    python benchmarks/read_api_load.py --url http://localhost:8000
+
+Without --url an in-process server is started against the analytics database
+configured in .env. Team IDs are taken from analytics.team_performance; the
+request set is each team's performance plus the head-to-head of consecutive
+team pairs. The cache is invalidated, every URL is requested once (cold, all
+misses), then --rounds more times (warm), and p50/p99 latency is reported for
+both passes.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from read_api import AnalyticsReader, ReadAPIServer, TTLCache  # noqa: E402
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1)]
+
+
+def timed_get(url: str) -> float:
+    """Milliseconds taken to fetch a URL and read its body."""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_pass(urls: List[str], concurrency: int) -> List[float]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed_get, urls))
+
+
+def report(label: str, latencies: List[float], seconds: float):
+    print(
+        f"{label:>5} | {len(latencies):>8} | {statistics.median(latencies):>8.2f} | "
+        f"{percentile(latencies, 99):>8.2f} | {len(latencies) / seconds:>8,.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Base URL of a running read API (default: start one in-process)')
+    parser.add_argument('--teams', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    reader = AnalyticsReader(pool_size=args.concurrency)
+    with reader.engine.connect() as conn:
+        team_ids = conn.execute(
+            text('select distinct team_id from analytics.team_performance order by team_id limit :limit'),
+            {'limit': args.teams}
+        ).scalars().all()
+    if len(team_ids) < 2:
+        print("analytics.team_performance has fewer than two teams; run the pipeline first")
+        return 1
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = ReadAPIServer(('127.0.0.1', 0), reader, TTLCache(max_entries=len(team_ids) * 4))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    urls = [f"{base_url}/teams/{team_id}/performance" for team_id in team_ids]
+    urls += [f"{base_url}/head-to-head/{a}/{b}" for a, b in zip(team_ids, team_ids[1:])]
+
+    invalidate = urllib.request.Request(f"{base_url}/cache/invalidate", method='POST')
+    if os.getenv('READ_API_INVALIDATE_TOKEN'):
+        invalidate.add_header('X-Invalidate-Token', os.getenv('READ_API_INVALIDATE_TOKEN'))
+    urllib.request.urlopen(invalidate).read()
+
+    print(f"{len(team_ids)} teams, {len(urls)} URLs, concurrency {args.concurrency}")
+    print(f"{'cache':>5} | {'requests':>8} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | {'req/s':>8}")
+    print('-' * 50)
+
+    start = time.perf_counter()
+    cold = run_pass(urls, args.concurrency)
+    report('cold', cold, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    warm = run_pass(urls * args.rounds, args.concurrency)
+    report('warm', warm, time.perf_counter() - start)
+
+    if server is not None:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Memory and transform throughput of slotted records versus the dict pipeline.
+
+Usage:
+    python benchmarks/record_types.py --matches 100000
+
+Generates synthetic API match payloads, then compares the previous pipeline
+(one flattened row dict per match, built up front) with Match records built by
+Match.from_api, which are what the client hands over and the loader holds
+between fetch and load. The last two lines measure the whole path to the
+values passed to insert(): records plus one row each, either a row dict
+(Match.to_row) or the tuple DatabaseLoader.load_matches binds from the slots
+(records.column_values). That is what is alive while a batch is inserted.
+The payloads themselves are shared by all
+pipelines (they back the raw_data column), so only the intermediate objects
+are measured.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from records import Match, column_values  # noqa: E402
+
+
+def synthetic_match_payloads(n_matches: int):
+    """API-shaped match payloads."""
+    return [
+        {
+            'id': 400000 + i,
+            'competition': {'id': 2021, 'name': 'Premier League'},
+            'season': {'id': 2287},
+            'utcDate': f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T15:00:00Z',
+            'status': 'FINISHED',
+            'matchday': i % 38 + 1,
+            'stage': 'REGULAR_SEASON',
+            'group': None,
+            'homeTeam': {'id': 60 + i % 20, 'name': f'Team {60 + i % 20}'},
+            'awayTeam': {'id': 80 + i % 20, 'name': f'Team {80 + i % 20}'},
+            'score': {
+                'winner': 'HOME_TEAM',
+                'duration': 'REGULAR',
+                'fullTime': {'home': i % 4, 'away': i % 3},
+                'halfTime': {'home': i % 2, 'away': 0},
+            },
+        }
+        for i in range(n_matches)
+    ]
+
+
+def dict_match_row(match, extracted_at):
+    """The flattened row dict the loader built per match before records existed."""
+    score = match.get('score', {})
+    full_time = score.get('fullTime', {})
+    half_time = score.get('halfTime', {})
+    return {
+        'id': match.get('id'),
+        'competition_id': match.get('competition', {}).get('id'),
+        'season_id': match.get('season', {}).get('id'),
+        'utc_date': match.get('utcDate'),
+        'status': match.get('status'),
+        'matchday': match.get('matchday'),
+        'stage': match.get('stage'),
+        'group': match.get('group'),
+        'home_team_id': match.get('homeTeam', {}).get('id'),
+        'home_team_name': match.get('homeTeam', {}).get('name'),
+        'away_team_id': match.get('awayTeam', {}).get('id'),
+        'away_team_name': match.get('awayTeam', {}).get('name'),
+        'winner': score.get('winner'),
+        'duration': score.get('duration'),
+        'full_time_home': full_time.get('home'),
+        'full_time_away': full_time.get('away'),
+        'half_time_home': half_time.get('home'),
+        'half_time_away': half_time.get('away'),
+        'raw_data': match,
+        'extracted_at': extracted_at,
+    }
+
+
+def measure(build, payloads):
+    """Peak traced memory (bytes) and wall time (seconds) of one transform."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(payloads)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, elapsed
+
+
+def best_time(build, payloads, runs):
+    """Fastest wall time over several untraced runs."""
+    timings = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        build(payloads)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = synthetic_match_payloads(args.matches)
+    extracted_at = datetime.utcnow()
+
+    def records_to_rows(items):
+        records = [Match.from_api(m) for m in items]
+        return records, [r.to_row(extracted_at) for r in records]
+
+    def records_to_values(items):
+        records = [Match.from_api(m) for m in items]
+        return records, column_values(Match, records, extracted_at)
+
+    pipelines = [
+        ('dict rows', lambda items: [dict_match_row(m, extracted_at) for m in items]),
+        ('Match records', lambda items: [Match.from_api(m) for m in items]),
+        ('records + to_row', records_to_rows),
+        ('records + values', records_to_values),
+    ]
+
+    print(f"{'pipeline':<16} | {'MB per 100k':>11} | {'bytes/row':>9} | {'rows/s':>11}")
+    print('-' * 56)
+    for name, build in pipelines:
+        memory, _ = measure(build, payloads)
+        seconds = best_time(build, payloads, args.runs)
+        print(
+            f"{name:<16} | {memory / args.matches * 100_000 / 2**20:>11.1f} | "
+            f"{memory / args.matches:>9.0f} | {args.matches / seconds:>11,.0f}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
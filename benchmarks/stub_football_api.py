@@ -0,0 +1,168 @@
+"""Local stand-in for the Football-Data.org API with per-key rate limits.
+
+Usage:
+    python benchmarks/stub_football_api.py --port 8765 --quota 10 --window-seconds 60
+    python benchmarks/stub_football_api.py --slow-rate 0.02 --slow-latency 20 --error-rate 0.1
+
+Answers every GET under /v4 with an empty but well-formed payload (a bare
+object with the requested id for teams/{id} and matches/{id}) after
+--latency seconds, and enforces --quota requests per key in any sliding
+window of --window-seconds, answering 429 (with X-RateLimit-Reset) beyond it.
+To exercise the client's timeouts, hedging and circuit breaker it injects
+faults into admitted requests: --slow-rate of them are answered only after
+--slow-latency seconds (a hung upstream), --error-rate of them with a 503.
+GET /stats returns request and 429 counts per key plus the injected faults.
+Point FOOTBALL_API_BASE_URL at http://localhost:<port>/v4 to run the
+extraction against it.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class StubFootballAPI(ThreadingHTTPServer):
+    """Threaded HTTP server that rate limits each X-Auth-Token separately."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        quota: int = 10,
+        window_seconds: float = 60.0,
+        latency: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 30.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        super().__init__(address, StubHandler)
+        self.quota = quota
+        self.window_seconds = window_seconds
+        self.latency = latency
+        # Fault injection; may be changed while serving, e.g. to simulate an outage
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.faults = defaultdict(int)
+        self._lock = threading.Lock()
+        self._recent = defaultdict(deque)
+        self.served = defaultdict(int)
+        self.rejected = defaultdict(int)
+
+    def admit(self, key: str) -> float:
+        """Record a request; 0 if admitted, else seconds until the key has budget."""
+        now = time.monotonic()
+        with self._lock:
+            recent = self._recent[key]
+            while recent and recent[0] <= now - self.window_seconds:
+                recent.popleft()
+            if len(recent) >= self.quota:
+                self.rejected[key] += 1
+                return recent[0] + self.window_seconds - now
+            recent.append(now)
+            self.served[key] += 1
+            return 0.0
+
+    def fault(self) -> str:
+        """Fault to inject into an admitted request: 'error', 'slow' or ''."""
+        with self._lock:
+            draw = self._random.random()
+            fault = 'error' if draw < self.error_rate else 'slow' if draw < self.error_rate + self.slow_rate else ''
+            if fault:
+                self.faults[fault] += 1
+            return fault
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            stats = {
+                key: {'served': self.served[key], 'rejected': self.rejected[key]}
+                for key in set(self.served) | set(self.rejected)
+            }
+            stats['faults'] = dict(self.faults)
+            return stats
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode('utf-8')
+        try:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client timed out, or a hedged request was answered first
+            pass
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, self.server.stats())
+            return
+        if not self.path.startswith('/v4/'):
+            self._send_json(404, {'message': 'not found'})
+            return
+
+        key = self.headers.get('X-Auth-Token', '')
+        retry_after = self.server.admit(key)
+        if retry_after:
+            self._send_json(
+                429,
+                {'message': 'You reached your request limit.', 'errorCode': 429},
+                headers={'X-RateLimit-Reset': str(max(1, round(retry_after)))}
+            )
+            return
+
+        fault = self.server.fault()
+        if fault == 'error':
+            self._send_json(503, {'message': 'Service unavailable'})
+            return
+        time.sleep(self.server.slow_latency if fault == 'slow' else self.server.latency)
+        # Detail endpoints (teams/{id}, matches/{id}) echo the requested id
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if len(parts) == 3 and parts[1] in ('teams', 'matches') and parts[2].isdigit():
+            self._send_json(200, {'id': int(parts[2]), 'status': 'FINISHED'})
+            return
+        self._send_json(200, {
+            'count': 0, 'competitions': [], 'teams': [], 'matches': [], 'standings': [], 'season': {}
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--quota', type=int, default=10)
+    parser.add_argument('--window-seconds', type=float, default=60.0)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='Share of requests answered after --slow-latency')
+    parser.add_argument('--slow-latency', type=float, default=30.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with a 503')
+    args = parser.parse_args()
+
+    server = StubFootballAPI(
+        ('127.0.0.1', args.port), args.quota, args.window_seconds, args.latency,
+        slow_rate=args.slow_rate, slow_latency=args.slow_latency, error_rate=args.error_rate
+    )
+    print(f"Stub API on http://127.0.0.1:{args.port}/v4 ({args.quota} requests per {args.window_seconds:g}s per key)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Synthetic raw data generator for benchmarking the dbt project.
+
+Builds the four raw tables (competitions, teams, matches, standings) inside an
+in-memory DuckDB database so millions of matches can be generated in seconds,
+then writes them out as Parquet/JSON extracts or loads them into Postgres.
+"""
+
+import os
+import sys
+import logging
+
+import duckdb
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RAW_TABLES = ['competitions', 'teams', 'matches', 'standings']
+
+COMPETITION_IDS = [2021, 2014, 2002, 2019, 2015, 2001, 2146]
+TEAMS_PER_COMPETITION = 20
+
+
+def generate_raw_tables(n_matches: int, seed: float = 0.42) -> duckdb.DuckDBPyConnection:
+    """Generate synthetic raw tables shaped like the ones DatabaseLoader creates.
+
+    Args:
+        n_matches: Number of finished matches to generate
+        seed: Random seed for reproducible data
+
+    Returns:
+        DuckDB connection holding the generated tables
+    """
+    con = duckdb.connect()
+    con.execute(f"select setseed({seed})")
+    competition_list = ', '.join(str(c) for c in COMPETITION_IDS)
+
+    con.execute(f"""
+        create table competitions as
+        select
+            id,
+            'Competition ' || id as name,
+            'C' || id as code,
+            case when id in (2001, 2146) then 'CUP' else 'LEAGUE' end as type,
+            null::varchar as emblem,
+            'Europe' as area_name,
+            'EUR' as area_code,
+            '{{"id": ' || id || ', "startDate": "2024-08-01", "endDate": "2025-05-31"}}' as current_season,
+            '{{}}' as raw_data,
+            now()::timestamp as extracted_at
+        from unnest([{competition_list}]) as t(id)
+    """)
+
+    con.execute(f"""
+        create table teams as
+        select
+            c.idx * 1000 + t.k as id,
+            'Team ' || (c.idx * 1000 + t.k) as name,
+            'T' || (c.idx * 1000 + t.k) as short_name,
+            'T' || t.k as tla,
+            null::varchar as crest,
+            null::varchar as address,
+            null::varchar as website,
+            1880 + t.k as founded,
+            null::varchar as club_colors,
+            'Stadium ' || (c.idx * 1000 + t.k) as venue,
+            '{{}}' as raw_data,
+            now()::timestamp as extracted_at
+        from (select unnest(range(1, {len(COMPETITION_IDS) + 1})) as idx) c
+        cross join (select unnest(range(1, {TEAMS_PER_COMPETITION + 1})) as k) t
+    """)
+
+    con.execute(f"""
+        create table matches as
+        with base as (
+            select
+                i,
+                i % {len(COMPETITION_IDS)} as comp_idx,
+                (hash(i) % {TEAMS_PER_COMPETITION})::integer as home_k,
+                (hash(i * 7 + 1) % {TEAMS_PER_COMPETITION - 1})::integer as away_offset,
+                floor(random() * 5)::integer as home_goals,
+                floor(random() * 4)::integer as away_goals,
+                floor(random() * 3)::integer as home_ht_goals,
+                floor(random() * 2)::integer as away_ht_goals
+            from range({n_matches}) as r(i)
+        ),
+        shaped as (
+            select
+                i + 1 as id,
+                list_extract([{competition_list}], comp_idx + 1) as competition_id,
+                2000 + (i // 3800) as season_id,
+                timestamp '2000-08-01 15:00:00' + to_days((i // 35)::integer) as utc_date,
+                'FINISHED' as status,
+                ((i // 70) % 38) + 1 as matchday,
+                'REGULAR_SEASON' as stage,
+                null::varchar as "group",
+                (comp_idx + 1) * 1000 + home_k + 1 as home_team_id,
+                (comp_idx + 1) * 1000 + ((home_k + 1 + away_offset) % {TEAMS_PER_COMPETITION}) + 1 as away_team_id,
+                home_goals,
+                away_goals,
+                least(home_ht_goals, home_goals) as half_time_home,
+                least(away_ht_goals, away_goals) as half_time_away
+            from base
+        )
+        select
+            id,
+            competition_id,
+            season_id,
+            utc_date,
+            status,
+            matchday,
+            stage,
+            "group",
+            home_team_id,
+            'Team ' || home_team_id as home_team_name,
+            away_team_id,
+            'Team ' || away_team_id as away_team_name,
+            case
+                when home_goals > away_goals then 'HOME_TEAM'
+                when away_goals > home_goals then 'AWAY_TEAM'
+                else 'DRAW'
+            end as winner,
+            'REGULAR' as duration,
+            home_goals as full_time_home,
+            away_goals as full_time_away,
+            half_time_home,
+            half_time_away,
+            '{{}}' as raw_data,
+            now()::timestamp as extracted_at
+        from shaped
+    """)
+
+    con.execute("""
+        create table standings as
+        with perspective as (
+            select competition_id, season_id, home_team_id as team_id, home_team_name as team_name,
+                   full_time_home as gf, full_time_away as ga
+            from matches
+            union all
+            select competition_id, season_id, away_team_id, away_team_name,
+                   full_time_away, full_time_home
+            from matches
+        ),
+        latest_season as (
+            select competition_id, max(season_id) as season_id
+            from matches
+            group by competition_id
+        ),
+        latest as (
+            select p.*
+            from perspective p
+            join latest_season s using (competition_id, season_id)
+        ),
+        totals as (
+            select
+                competition_id,
+                season_id,
+                team_id,
+                team_name,
+                count(*) as played_games,
+                count(*) filter (where gf > ga) as won,
+                count(*) filter (where gf = ga) as draw,
+                count(*) filter (where gf < ga) as lost,
+                sum(gf) as goals_for,
+                sum(ga) as goals_against
+            from latest
+            group by all
+        )
+        select
+            row_number() over () as id,
+            competition_id,
+            season_id,
+            'REGULAR_SEASON' as stage,
+            'TOTAL' as type,
+            null::varchar as "group",
+            team_id,
+            team_name,
+            row_number() over (
+                partition by competition_id
+                order by won * 3 + draw desc, goals_for - goals_against desc, goals_for desc
+            ) as position,
+            played_games,
+            won,
+            draw,
+            lost,
+            won * 3 + draw as points,
+            goals_for,
+            goals_against,
+            goals_for - goals_against as goal_difference,
+            '{}' as raw_data,
+            now()::timestamp as extracted_at
+        from totals
+    """)
+
+    logger.info(f"Generated {n_matches} synthetic matches")
+    return con
+
+
+def write_extracts(con: duckdb.DuckDBPyConnection, output_dir: str, file_format: str = 'parquet'):
+    """Write the generated raw tables as extract files for the DuckDB target.
+
+    Args:
+        con: DuckDB connection holding the generated tables
+        output_dir: Directory to write `<table>.<format>` files into
+        file_format: Either 'parquet' or 'json'
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for table in RAW_TABLES:
+        path = os.path.join(output_dir, f'{table}.{file_format}')
+        if file_format == 'parquet':
+            con.execute(f"copy {table} to '{path}' (format parquet)")
+        else:
+            con.execute(f"copy {table} to '{path}' (format json)")
+        logger.info(f"Wrote {path}")
+
+
+def load_into_postgres(con: duckdb.DuckDBPyConnection, connection_string: str):
+    """Replace the contents of the Postgres raw tables with the generated data.
+
+    Args:
+        con: DuckDB connection holding the generated tables
+        connection_string: PostgreSQL connection string
+    """
+    import tempfile
+
+    import psycopg2
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+    from database_loader import DatabaseLoader
+
+    # Make sure the raw tables exist with the loader's own DDL
+    DatabaseLoader(connection_string)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, psycopg2.connect(connection_string) as pg_conn:
+        with pg_conn.cursor() as cursor:
+            for table in RAW_TABLES:
+                # Stream through a CSV file so large scales never materialize in Python
+                csv_path = os.path.join(tmp_dir, f'{table}.csv')
+                con.execute(f"copy {table} to '{csv_path}' (format csv, header true)")
+                columns = [row[0] for row in con.execute(f"describe {table}").fetchall()]
+                column_list = ', '.join(f'"{c}"' for c in columns)
+
+                cursor.execute(f"truncate raw.{table}")
+                with open(csv_path) as csv_file:
+                    cursor.copy_expert(
+                        f"copy raw.{table} ({column_list}) from stdin with (format csv, header true)",
+                        csv_file
+                    )
+                logger.info(f"Loaded raw.{table} into Postgres")
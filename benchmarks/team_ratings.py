@@ -0,0 +1,91 @@
+"""Vectorized Elo rating versus a naive per-match Python loop.
+
+Usage:
+    python benchmarks/team_ratings.py --matches 1000000 2000000
+
+Generates a synthetic fixture list (each team plays at most once a day), rates
+it with team_ratings.rate_matches and with a plain loop over matches, checks
+both give the same ratings, and reports matches rated per second. The naive
+loop is only timed up to --naive-limit matches and extrapolated beyond.
+
+The speedup grows with the number of matches per day (--teams / 2): with only
+a few fixtures per day the per-batch NumPy overhead matches the loop's cost.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api_extraction'))
+from team_ratings import BASE_RATING, HOME_ADVANTAGE, K_FACTOR, rate_matches  # noqa: E402
+
+
+def synthetic_schedule(n_matches: int, n_teams: int = 2000, seed: int = 42):
+    """Date-ordered fixtures where every team plays at most once per day."""
+    rng = np.random.default_rng(seed)
+    per_day = n_teams // 2
+    n_days = math.ceil(n_matches / per_day)
+
+    pairings = np.argsort(rng.random((n_days, n_teams)), axis=1)
+    home_idx = pairings[:, 0::2].ravel()[:n_matches]
+    away_idx = pairings[:, 1::2].ravel()[:n_matches]
+    match_days = np.repeat(np.arange(n_days), per_day)[:n_matches]
+    home_goals = rng.poisson(1.5, n_matches)
+    away_goals = rng.poisson(1.1, n_matches)
+    return n_teams, home_idx, away_idx, home_goals, away_goals, match_days
+
+
+def naive_ratings(n_teams, home_idx, away_idx, home_goals, away_goals):
+    """Rate matches one at a time with plain Python objects."""
+    ratings = [BASE_RATING] * n_teams
+    for home, away, hg, ag in zip(home_idx.tolist(), away_idx.tolist(), home_goals.tolist(), away_goals.tolist()):
+        margin = abs(hg - ag)
+        multiplier = 1.0 if margin <= 1 else 1.5 if margin == 2 else (11.0 + margin) / 8.0
+        actual = 1.0 if hg > ag else 0.0 if hg < ag else 0.5
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[away] - ratings[home] - HOME_ADVANTAGE) / 400.0))
+        delta = K_FACTOR * multiplier * (actual - expected)
+        ratings[home] += delta
+        ratings[away] -= delta
+    return np.array(ratings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, nargs='+', default=[1_000_000, 2_000_000])
+    parser.add_argument('--teams', type=int, default=2000)
+    parser.add_argument('--naive-limit', type=int, default=500_000)
+    args = parser.parse_args()
+
+    print(f"{'matches':>10} | {'numpy (s)':>9} | {'naive (s)':>9} | {'speedup':>7} | {'numpy matches/s':>15}")
+    print('-' * 64)
+    for n_matches in args.matches:
+        n_teams, home_idx, away_idx, home_goals, away_goals, match_days = synthetic_schedule(n_matches, args.teams)
+
+        ratings = np.full(n_teams, BASE_RATING)
+        start = time.perf_counter()
+        rate_matches(ratings, home_idx, away_idx, home_goals, away_goals, match_days)
+        numpy_seconds = time.perf_counter() - start
+
+        n_naive = min(n_matches, args.naive_limit)
+        start = time.perf_counter()
+        expected = naive_ratings(n_teams, home_idx[:n_naive], away_idx[:n_naive], home_goals[:n_naive], away_goals[:n_naive])
+        naive_seconds = (time.perf_counter() - start) * n_matches / n_naive
+
+        if n_naive == n_matches and not np.allclose(ratings, expected):
+            print(f"Ratings differ from the naive loop at {n_matches} matches")
+            return 1
+
+        naive_label = f"{naive_seconds:.2f}" if n_naive == n_matches else f"~{naive_seconds:.2f}"
+        print(
+            f"{n_matches:>10} | {numpy_seconds:>9.2f} | {naive_label:>9} | "
+            f"{naive_seconds / numpy_seconds:>6.1f}x | {n_matches / numpy_seconds:>15,.0f}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
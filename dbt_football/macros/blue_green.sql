@@ -0,0 +1,33 @@
+-- Blue/green deployment of the analytics schema
+-- Build and test with --vars '{blue_green: true}', then promote with
+-- `dbt run-operation swap_analytics_schema`. The serving and shadow schemas trade
+-- names in a single transaction: readers never see a half-built relation, and the
+-- previous serving copy becomes the next run's shadow (keeping incremental state).
+
+{% macro swap_analytics_schema() %}
+    {% set serving = var('serving_schema', 'analytics') %}
+    {% set shadow = shadow_schema_name() %}
+    {% set parking = serving ~ '__swap' %}
+
+    {% if not adapter.check_schema_exists(target.database, shadow) %}
+        {{ exceptions.raise_compiler_error("Shadow schema " ~ shadow ~ " does not exist; build with --vars '{blue_green: true}' first") }}
+    {% endif %}
+
+    {% set serving_exists = adapter.check_schema_exists(target.database, serving) %}
+
+    {% call statement('swap_analytics_schema') %}
+        -- Waits for a targeted run of raw_change_listener.py to finish (its ANALYTICS_SWAP_LOCK)
+        select pg_advisory_xact_lock(hashtext('analytics_swap'));
+        set local lock_timeout = '{{ var("swap_lock_timeout", "10s") }}';
+        {% if serving_exists %}
+        alter schema {{ adapter.quote(serving) }} rename to {{ adapter.quote(parking) }};
+        {% endif %}
+        alter schema {{ adapter.quote(shadow) }} rename to {{ adapter.quote(serving) }};
+        {% if serving_exists %}
+        alter schema {{ adapter.quote(parking) }} rename to {{ adapter.quote(shadow) }};
+        {% endif %}
+    {% endcall %}
+    {% do adapter.commit() %}
+
+    {{ log("Promoted " ~ shadow ~ " to " ~ serving, info=True) }}
+{% endmacro %}
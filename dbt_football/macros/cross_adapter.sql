@@ -0,0 +1,28 @@
+-- Cross-adapter helpers
+-- Lets the same models run on the Postgres warehouse and the local DuckDB target
+
+{% macro json_text(column, key) %}
+    {{ return(adapter.dispatch('json_text')(column, key)) }}
+{% endmacro %}
+
+{% macro default__json_text(column, key) -%}
+    ({{ column }}->>'{{ key }}')
+{%- endmacro %}
+
+{% macro duckdb__json_text(column, key) -%}
+    json_extract_string({{ column }}, '$.{{ key }}')
+{%- endmacro %}
+
+
+{% macro to_numeric(expression) %}
+    {{ return(adapter.dispatch('to_numeric')(expression)) }}
+{% endmacro %}
+
+{% macro default__to_numeric(expression) -%}
+    cast({{ expression }} as numeric)
+{%- endmacro %}
+
+{# DuckDB's bare NUMERIC is DECIMAL(18,3), which would truncate ratios before rounding #}
+{% macro duckdb__to_numeric(expression) -%}
+    cast({{ expression }} as double)
+{%- endmacro %}
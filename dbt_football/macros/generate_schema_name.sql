@@ -0,0 +1,18 @@
+-- Schema naming
+-- Models land in their configured schema as-is (staging, analytics) instead of dbt's
+-- default <target_schema>_<custom_schema>. With the blue_green var set, analytics
+-- models are built into the shadow schema that swap_analytics_schema() promotes.
+
+{% macro generate_schema_name(custom_schema_name, node) -%}
+    {%- if custom_schema_name is none -%}
+        {{ target.schema }}
+    {%- elif custom_schema_name | trim == var('serving_schema', 'analytics') and var('blue_green', false) -%}
+        {{ shadow_schema_name() }}
+    {%- else -%}
+        {{ custom_schema_name | trim }}
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro shadow_schema_name() -%}
+    {{ var('serving_schema', 'analytics') }}_shadow
+{%- endmacro %}
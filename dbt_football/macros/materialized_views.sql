@@ -0,0 +1,12 @@
+-- Materialized view refresh
+-- Overrides dbt-postgres so existing materialized views are refreshed CONCURRENTLY,
+-- which keeps them readable during the nightly run. Requires a unique index on the view;
+-- set refresh_concurrently=false on a model that cannot have one.
+
+{% macro postgres__refresh_materialized_view(relation) %}
+    {%- if config.get('refresh_concurrently', true) -%}
+        refresh materialized view concurrently {{ relation }}
+    {%- else -%}
+        refresh materialized view {{ relation }}
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,58 @@
+-- Scoped and sampled data tests
+-- Tests whose config sets meta.scope_column (the staging tests, see dbt_project.yml)
+-- only check rows changed since the test_since var, e.g.
+--   dbt test --vars '{test_since: "2024-08-01 06:00:00"}'
+-- so the daily run's cost follows the new data rather than all history. With the
+-- test_sample_percent var set, column tests also check a deterministic sample of
+-- key values: hashing the tested column keeps every duplicate of a value in the
+-- same sample, so `unique` still finds them. Rows with a NULL key are always
+-- kept, so a sampled `not_null` test still sees every NULL. Without either var,
+-- tests cover everything (the weekly football_full_test DAG).
+
+{% macro default__get_where_subquery(relation) -%}
+    {%- set filters = [] -%}
+
+    {%- set where = config.get('where') -%}
+    {%- if where -%}
+        {%- do filters.append('(' ~ where ~ ')') -%}
+    {%- endif -%}
+
+    {#- meta is only a mapping once the test is compiled, not while parsing -#}
+    {%- set meta = config.get('meta') -%}
+    {%- set meta = meta if meta is mapping else {} -%}
+
+    {%- set scope_column = meta.get('scope_column') -%}
+    {%- set since = var('test_since', none) -%}
+    {%- if scope_column and since -%}
+        {%- do filters.append(scope_column ~ " >= cast('" ~ since ~ "' as timestamp)") -%}
+    {%- endif -%}
+
+    {%- set sample_percent = var('test_sample_percent', none) -%}
+    {%- set sample_column = meta.get('sample_column', model.column_name) -%}
+    {%- if sample_percent and sample_column -%}
+        {%- do filters.append('(' ~ sample_column ~ ' is null or ' ~ sample_predicate(sample_column, sample_percent) ~ ')') -%}
+    {%- endif -%}
+
+    {%- if filters -%}
+        {%- set filtered -%}
+            (select * from {{ relation }} where {{ filters | join(' and ') }}) dbt_subquery
+        {%- endset -%}
+        {%- do return(filtered) -%}
+    {%- else -%}
+        {%- do return(relation) -%}
+    {%- endif -%}
+{%- endmacro %}
+
+
+{% macro sample_predicate(column, percent) %}
+    {{ return(adapter.dispatch('sample_predicate')(column, percent)) }}
+{% endmacro %}
+
+{% macro default__sample_predicate(column, percent) -%}
+    {#- abs() after the modulo: abs(hashtext(...)) overflows for -2147483648 -#}
+    abs(hashtext(cast({{ column }} as text)) % 100) < {{ percent }}
+{%- endmacro %}
+
+{% macro duckdb__sample_predicate(column, percent) -%}
+    hash({{ column }}) % 100 < {{ percent }}
+{%- endmacro %}
@@ -0,0 +1,44 @@
+-- Analytics model: Monthly competition rollup for dashboards
+-- Pre-aggregated match counts and goals per competition, month and result type.
+-- Reads the raw source rather than staging/analytics relations: Postgres materialized
+-- views depend on the exact relations they select from, and dbt's rename-and-drop
+-- rebuild of views and tables would drop this view on every run.
+
+{{
+    config(
+        materialized=('materialized_view' if target.type == 'postgres' else 'table'),
+        indexes=[
+            {'columns': ['competition_id', 'match_month', 'result_type'], 'unique': True}
+        ]
+    )
+}}
+
+with finished_matches as (
+    select
+        competition_id,
+        {{ dbt.date_trunc('month', 'utc_date') }} as match_month,
+        full_time_home as home_score,
+        full_time_away as away_score,
+        case
+            when full_time_home > full_time_away then 'HOME_WIN'
+            when full_time_away > full_time_home then 'AWAY_WIN'
+            else 'DRAW'
+        end as result_type
+    from {{ source('raw', 'matches') }}
+    where status = 'FINISHED'
+)
+
+select
+    m.competition_id,
+    c.name as competition_name,
+    m.match_month,
+    m.result_type,
+    count(*) as total_matches,
+    sum(m.home_score + m.away_score) as total_goals,
+    sum(m.home_score) as home_goals,
+    sum(m.away_score) as away_goals,
+    sum(case when m.home_score > 0 and m.away_score > 0 then 1 else 0 end) as both_teams_scored_matches,
+    sum(case when m.home_score + m.away_score > 2.5 then 1 else 0 end) as over_2_5_goals_matches
+from finished_matches m
+left join {{ source('raw', 'competitions') }} c on m.competition_id = c.id
+group by m.competition_id, c.name, m.match_month, m.result_type
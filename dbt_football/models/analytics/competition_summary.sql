@@ -41,9 +41,9 @@ select
     coalesce(ms.total_draws, 0) as total_draws,
     coalesce(ms.home_wins, 0) as home_wins,
     coalesce(ms.away_wins, 0) as away_wins,
-    round((ms.home_wins::numeric / nullif(ms.total_matches, 0)) * 100, 2) as home_win_percentage,
-    round((ms.away_wins::numeric / nullif(ms.total_matches, 0)) * 100, 2) as away_win_percentage,
-    round((ms.total_draws::numeric / nullif(ms.total_matches, 0)) * 100, 2) as draw_percentage,
+    round(({{ to_numeric('ms.home_wins') }} / nullif(ms.total_matches, 0)) * 100, 2) as home_win_percentage,
+    round(({{ to_numeric('ms.away_wins') }} / nullif(ms.total_matches, 0)) * 100, 2) as away_win_percentage,
+    round(({{ to_numeric('ms.total_draws') }} / nullif(ms.total_matches, 0)) * 100, 2) as draw_percentage,
     coalesce(ms.highest_scoring_match, 0) as highest_scoring_match,
     current_timestamp as calculated_at
 from {{ ref('stg_competitions') }} c
@@ -0,0 +1,233 @@
+-- Analytics model: League standings per matchday
+-- League table after every matchday, derived from finished league-phase matches.
+-- Position ties are broken by goal difference, then goals scored, then team name;
+-- leagues using head-to-head tie-breaks can differ from the official table on exact ties.
+-- Incremental: a run recomputes each season from the earliest matchday with newly
+-- extracted results onward, starting from the stored totals of the matchday before.
+-- The raw change listener sets changed_competition_ids to scan only those competitions.
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['competition_id', 'season_id', 'matchday', 'team_id'],
+        incremental_strategy='delete+insert',
+        indexes=[
+            {'columns': ['competition_id', 'season_id', 'matchday']}
+        ]
+    )
+}}
+
+{% set totals = ['played_games', 'won', 'draw', 'lost', 'points', 'goals_for', 'goals_against'] %}
+
+with league_matches as (
+    select *
+    from {{ ref('stg_team_matches') }}
+    where match_stage in ('REGULAR_SEASON', 'LEAGUE_STAGE')
+        and matchday is not null
+        {% if is_incremental() and var('changed_competition_ids', none) %}
+        and competition_id in ({{ var('changed_competition_ids') | join(', ') }})
+        {% endif %}
+),
+
+{% if is_incremental() %}
+watermarks as (
+    select
+        competition_id,
+        season_id,
+        max(source_extracted_at) as last_extracted_at
+    from {{ this }}
+    group by competition_id, season_id
+),
+{% endif %}
+
+-- Seasons with new or corrected results, and the first matchday they touch
+affected_seasons as (
+    select
+        m.competition_id,
+        m.season_id,
+        min(m.matchday) as from_matchday
+    from league_matches m
+    {% if is_incremental() %}
+    left join watermarks w
+        on m.competition_id = w.competition_id
+        and m.season_id = w.season_id
+    where w.last_extracted_at is null
+        or m.extracted_at > w.last_extracted_at
+    {% endif %}
+    group by m.competition_id, m.season_id
+),
+
+season_matches as (
+    select
+        m.*,
+        a.from_matchday
+    from league_matches m
+    inner join affected_seasons a
+        on m.competition_id = a.competition_id
+        and m.season_id = a.season_id
+),
+
+season_teams as (
+    select
+        competition_id,
+        season_id,
+        team_id,
+        max(team_name) as team_name
+    from season_matches
+    group by competition_id, season_id, team_id
+),
+
+matchdays as (
+    select distinct
+        competition_id,
+        season_id,
+        matchday
+    from season_matches
+    where matchday >= from_matchday
+),
+
+matchday_results as (
+    select
+        competition_id,
+        season_id,
+        matchday,
+        team_id,
+        count(*) as played_games,
+        sum(case when result = 'W' then 1 else 0 end) as won,
+        sum(case when result = 'D' then 1 else 0 end) as draw,
+        sum(case when result = 'L' then 1 else 0 end) as lost,
+        sum(points) as points,
+        sum(goals_for) as goals_for,
+        sum(goals_against) as goals_against,
+        max(match_date) as last_match_date,
+        max(extracted_at) as source_extracted_at
+    from season_matches
+    where matchday >= from_matchday
+    group by competition_id, season_id, matchday, team_id
+),
+
+-- Every team gets a row for every matchday, including ones it did not play.
+-- The empty rows are stacked under the results and summed rather than left
+-- joined: row estimates for these CTEs are far too low on Postgres, which then
+-- picks a nested loop join that is quadratic in the number of matchdays.
+team_matchdays as (
+    select
+        competition_id,
+        season_id,
+        matchday,
+        team_id,
+        max(team_name) as team_name,
+        {% for column in totals %}
+        sum({{ column }}) as {{ column }},
+        {% endfor %}
+        max(last_match_date) as last_match_date,
+        max(source_extracted_at) as source_extracted_at
+    from (
+        select
+            t.competition_id,
+            t.season_id,
+            d.matchday,
+            t.team_id,
+            t.team_name,
+            {% for column in totals %}
+            0 as {{ column }},
+            {% endfor %}
+            null as last_match_date,
+            null as source_extracted_at
+        from season_teams t
+        inner join matchdays d
+            on t.competition_id = d.competition_id
+            and t.season_id = d.season_id
+
+        union all
+
+        select
+            competition_id,
+            season_id,
+            matchday,
+            team_id,
+            null as team_name,
+            {% for column in totals %}
+            {{ column }},
+            {% endfor %}
+            last_match_date,
+            source_extracted_at
+        from matchday_results
+    ) team_rows
+    group by competition_id, season_id, matchday, team_id
+),
+
+{% if is_incremental() %}
+-- Stored totals as of the last matchday before the recomputed range
+carried as (
+    select *
+    from (
+        select
+            s.*,
+            row_number() over (
+                partition by s.competition_id, s.season_id, s.team_id
+                order by s.matchday desc
+            ) as recency
+        from {{ this }} s
+        inner join affected_seasons a
+            on s.competition_id = a.competition_id
+            and s.season_id = a.season_id
+        where s.matchday < a.from_matchday
+    ) stored
+    where recency = 1
+),
+{% endif %}
+
+cumulative as (
+    select
+        r.competition_id,
+        r.season_id,
+        r.matchday,
+        r.team_id,
+        r.team_name,
+        {% for column in totals %}
+        {% if is_incremental() %}coalesce(c.{{ column }}, 0) + {% endif %}sum(r.{{ column }}) over team_season as {{ column }},
+        {% endfor %}
+        {% if is_incremental() %}
+        coalesce(max(r.last_match_date) over team_season, c.last_match_date) as last_match_date,
+        coalesce(max(r.source_extracted_at) over team_season, c.source_extracted_at) as source_extracted_at
+        {% else %}
+        max(r.last_match_date) over team_season as last_match_date,
+        max(r.source_extracted_at) over team_season as source_extracted_at
+        {% endif %}
+    from team_matchdays r
+    {% if is_incremental() %}
+    left join carried c
+        on r.competition_id = c.competition_id
+        and r.season_id = c.season_id
+        and r.team_id = c.team_id
+    {% endif %}
+    window team_season as (
+        partition by r.competition_id, r.season_id, r.team_id
+        order by r.matchday
+        rows between unbounded preceding and current row
+    )
+)
+
+select
+    competition_id,
+    season_id,
+    matchday,
+    team_id,
+    team_name,
+    row_number() over (
+        partition by competition_id, season_id, matchday
+        order by points desc, goals_for - goals_against desc, goals_for desc, team_name
+    ) as position,
+    played_games,
+    won,
+    draw,
+    lost,
+    points,
+    goals_for,
+    goals_against,
+    goals_for - goals_against as goal_difference,
+    last_match_date,
+    source_extracted_at,
+    current_timestamp as calculated_at
+from cumulative
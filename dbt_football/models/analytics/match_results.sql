@@ -39,7 +39,7 @@ select
         when m.home_score > 0 and m.away_score > 0 then true
         else false
     end as both_teams_scored,
-    date_trunc('month', m.match_date) as match_month,
+    {{ dbt.date_trunc('month', 'm.match_date') }} as match_month,
     extract(year from m.match_date) as match_year,
     current_timestamp as calculated_at
 from {{ ref('stg_matches') }} m
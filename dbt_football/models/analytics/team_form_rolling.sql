@@ -0,0 +1,211 @@
+-- Analytics model: Rolling team form and streaks
+-- Last-N form, rolling goals and current streak per team and competition, one row per match.
+-- Incremental: each run only appends matches newer than a team's latest stored match and
+-- carries the previous N-1 rows forward so windows and streaks continue across runs.
+-- Late-arriving results dated before a team's watermark need a --full-refresh.
+-- The raw change listener sets changed_competition_ids to scan only those competitions.
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['team_id', 'match_id'],
+        incremental_strategy='delete+insert',
+        indexes=[
+            {'columns': ['team_id', 'match_date']}
+        ]
+    )
+}}
+
+{% set form_window = var('form_window', 5) %}
+
+with
+{% if is_incremental() %}
+team_watermarks as (
+    select
+        team_id,
+        competition_id,
+        max(match_date) as last_match_date
+    from {{ this }}
+    group by team_id, competition_id
+),
+{% endif %}
+
+new_matches as (
+    select m.*
+    from {{ ref('stg_team_matches') }} m
+    {% if is_incremental() %}
+    left join team_watermarks w
+        on m.team_id = w.team_id
+        and m.competition_id = w.competition_id
+    where (w.last_match_date is null
+        or m.match_date > w.last_match_date)
+        {% if var('changed_competition_ids', none) %}
+        and m.competition_id in ({{ var('changed_competition_ids') | join(', ') }})
+        {% endif %}
+    {% endif %}
+),
+
+{% if is_incremental() %}
+carried_matches as (
+    select *
+    from (
+        select
+            t.*,
+            row_number() over (
+                partition by t.team_id, t.competition_id
+                order by t.match_date desc, t.match_id desc
+            ) as recency
+        from {{ this }} t
+        where exists (
+            select 1
+            from new_matches n
+            where n.team_id = t.team_id
+                and n.competition_id = t.competition_id
+        )
+    ) recent
+    where recency < {{ form_window }}
+),
+{% endif %}
+
+team_matches as (
+    select
+        team_id,
+        team_name,
+        competition_id,
+        season_id,
+        match_id,
+        match_date,
+        matchday,
+        opponent_id,
+        opponent_name,
+        is_home,
+        goals_for,
+        goals_against,
+        result,
+        points,
+        false as is_carried,
+        cast(null as integer) as stored_streak
+    from new_matches
+    {% if is_incremental() %}
+    union all
+    select
+        team_id,
+        team_name,
+        competition_id,
+        season_id,
+        match_id,
+        match_date,
+        matchday,
+        opponent_id,
+        opponent_name,
+        is_home,
+        goals_for,
+        goals_against,
+        result,
+        points,
+        true as is_carried,
+        current_streak as stored_streak
+    from carried_matches
+    {% endif %}
+),
+
+-- Gaps-and-islands: consecutive identical results share a streak_group
+streak_groups as (
+    select
+        *,
+        row_number() over team_order
+            - row_number() over (
+                partition by team_id, competition_id, result
+                order by match_date, match_id
+            ) as streak_group
+    from team_matches
+    window team_order as (partition by team_id, competition_id order by match_date, match_id)
+),
+
+streak_positions as (
+    select
+        *,
+        row_number() over (
+            partition by team_id, competition_id, result, streak_group
+            order by match_date, match_id
+        ) as streak_position
+    from streak_groups
+),
+
+form as (
+    select
+        team_id,
+        team_name,
+        competition_id,
+        season_id,
+        match_id,
+        match_date,
+        matchday,
+        opponent_id,
+        opponent_name,
+        is_home,
+        goals_for,
+        goals_against,
+        result,
+        points,
+        is_carried,
+        count(*) over form_frame as form_matches,
+        sum(points) over form_frame as form_points,
+        sum(case when result = 'W' then 1 else 0 end) over form_frame as form_wins,
+        sum(case when result = 'D' then 1 else 0 end) over form_frame as form_draws,
+        sum(case when result = 'L' then 1 else 0 end) over form_frame as form_losses,
+        sum(goals_for) over form_frame as form_goals_for,
+        sum(goals_against) over form_frame as form_goals_against,
+        concat(
+            {% for offset in range(form_window - 1, 0, -1) %}
+            lag(result, {{ offset }}) over team_order,
+            {% endfor %}
+            result
+        ) as form,
+        result as current_streak_type,
+        -- Carried rows anchor the streak length of the island they share with new rows
+        streak_position + coalesce(
+            max(case when is_carried then stored_streak - streak_position end) over (
+                partition by team_id, competition_id, result, streak_group
+            ),
+            0
+        ) as current_streak
+    from streak_positions
+    window
+        team_order as (partition by team_id, competition_id order by match_date, match_id),
+        form_frame as (
+            partition by team_id, competition_id
+            order by match_date, match_id
+            rows between {{ form_window - 1 }} preceding and current row
+        )
+)
+
+select
+    team_id,
+    team_name,
+    competition_id,
+    season_id,
+    match_id,
+    match_date,
+    matchday,
+    opponent_id,
+    opponent_name,
+    is_home,
+    goals_for,
+    goals_against,
+    result,
+    points,
+    form_matches,
+    form_points,
+    form_wins,
+    form_draws,
+    form_losses,
+    form_goals_for,
+    form_goals_against,
+    round({{ to_numeric('form_points') }} / nullif(form_matches, 0), 2) as form_points_per_game,
+    form,
+    current_streak_type,
+    current_streak,
+    current_timestamp as calculated_at
+from form
+where not is_carried
@@ -37,8 +37,8 @@ select
     sum(team2_goals) as team2_total_goals,
     round(avg(team1_goals), 2) as team1_avg_goals,
     round(avg(team2_goals), 2) as team2_avg_goals,
-    round((sum(case when match_result = 'TEAM1_WIN' then 1 else 0 end)::numeric / count(*)) * 100, 2) as team1_win_percentage,
-    round((sum(case when match_result = 'TEAM2_WIN' then 1 else 0 end)::numeric / count(*)) * 100, 2) as team2_win_percentage,
+    round(({{ to_numeric("sum(case when match_result = 'TEAM1_WIN' then 1 else 0 end)") }} / count(*)) * 100, 2) as team1_win_percentage,
+    round(({{ to_numeric("sum(case when match_result = 'TEAM2_WIN' then 1 else 0 end)") }} / count(*)) * 100, 2) as team2_win_percentage,
     current_timestamp as calculated_at
 from all_matches
 group by team1_id, team1_name, team2_id, team2_name, competition_id
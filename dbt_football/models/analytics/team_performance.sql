@@ -71,13 +71,13 @@ select
     total_goals_for,
     total_goals_against,
     total_goals_for - total_goals_against as goal_difference,
-    round((total_wins::numeric / nullif(total_games, 0)) * 100, 2) as win_percentage,
-    round((total_draws::numeric / nullif(total_games, 0)) * 100, 2) as draw_percentage,
-    round((total_losses::numeric / nullif(total_games, 0)) * 100, 2) as loss_percentage,
-    round(total_goals_for::numeric / nullif(total_games, 0), 2) as avg_goals_for,
-    round(total_goals_against::numeric / nullif(total_games, 0), 2) as avg_goals_against,
-    round((home_wins::numeric / nullif(home_games, 0)) * 100, 2) as home_win_percentage,
-    round((away_wins::numeric / nullif(away_games, 0)) * 100, 2) as away_win_percentage,
+    round(({{ to_numeric('total_wins') }} / nullif(total_games, 0)) * 100, 2) as win_percentage,
+    round(({{ to_numeric('total_draws') }} / nullif(total_games, 0)) * 100, 2) as draw_percentage,
+    round(({{ to_numeric('total_losses') }} / nullif(total_games, 0)) * 100, 2) as loss_percentage,
+    round({{ to_numeric('total_goals_for') }} / nullif(total_games, 0), 2) as avg_goals_for,
+    round({{ to_numeric('total_goals_against') }} / nullif(total_games, 0), 2) as avg_goals_against,
+    round(({{ to_numeric('home_wins') }} / nullif(home_games, 0)) * 100, 2) as home_win_percentage,
+    round(({{ to_numeric('away_wins') }} / nullif(away_games, 0)) * 100, 2) as away_win_percentage,
     (total_wins * 3) + total_draws as points,
     current_timestamp as calculated_at
 from combined
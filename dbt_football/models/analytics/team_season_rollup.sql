@@ -0,0 +1,56 @@
+-- Analytics model: Team season rollup for dashboards
+-- Pre-aggregated results, goals and points per team, competition and season.
+-- Reads the raw source for the same reason as competition_monthly_rollup.
+
+{{
+    config(
+        materialized=('materialized_view' if target.type == 'postgres' else 'table'),
+        indexes=[
+            {'columns': ['team_id', 'competition_id', 'season_id'], 'unique': True},
+            {'columns': ['competition_id', 'season_id']}
+        ]
+    )
+}}
+
+with team_matches as (
+    select
+        home_team_id as team_id,
+        competition_id,
+        season_id,
+        true as is_home,
+        full_time_home as goals_for,
+        full_time_away as goals_against
+    from {{ source('raw', 'matches') }}
+    where status = 'FINISHED'
+
+    union all
+
+    select
+        away_team_id as team_id,
+        competition_id,
+        season_id,
+        false as is_home,
+        full_time_away as goals_for,
+        full_time_home as goals_against
+    from {{ source('raw', 'matches') }}
+    where status = 'FINISHED'
+)
+
+select
+    tm.team_id,
+    t.name as team_name,
+    tm.competition_id,
+    tm.season_id,
+    count(*) as games_played,
+    sum(case when tm.goals_for > tm.goals_against then 1 else 0 end) as wins,
+    sum(case when tm.goals_for = tm.goals_against then 1 else 0 end) as draws,
+    sum(case when tm.goals_for < tm.goals_against then 1 else 0 end) as losses,
+    sum(tm.goals_for) as goals_for,
+    sum(tm.goals_against) as goals_against,
+    sum(tm.goals_for) - sum(tm.goals_against) as goal_difference,
+    sum(case when tm.goals_for > tm.goals_against then 3 when tm.goals_for = tm.goals_against then 1 else 0 end) as points,
+    sum(case when tm.is_home and tm.goals_for > tm.goals_against then 1 else 0 end) as home_wins,
+    sum(case when not tm.is_home and tm.goals_for > tm.goals_against then 1 else 0 end) as away_wins
+from team_matches tm
+left join {{ source('raw', 'teams') }} t on tm.team_id = t.id
+group by tm.team_id, t.name, tm.competition_id, tm.season_id
@@ -11,8 +11,8 @@ select
     emblem as competition_emblem,
     area_name,
     area_code,
-    (current_season->>'id')::integer as current_season_id,
-    (current_season->>'startDate')::date as season_start_date,
-    (current_season->>'endDate')::date as season_end_date,
+    {{ json_text('current_season', 'id') }}::integer as current_season_id,
+    {{ json_text('current_season', 'startDate') }}::date as season_start_date,
+    {{ json_text('current_season', 'endDate') }}::date as season_end_date,
     extracted_at
 from {{ source('raw', 'competitions') }}
@@ -20,7 +20,7 @@ select
     goals_for,
     goals_against,
     goal_difference,
-    round(points::numeric / nullif(played_games, 0), 2) as points_per_game,
-    round((won::numeric / nullif(played_games, 0)) * 100, 2) as win_percentage,
+    round({{ to_numeric('points') }} / nullif(played_games, 0), 2) as points_per_game,
+    round(({{ to_numeric('won') }} / nullif(played_games, 0)) * 100, 2) as win_percentage,
     extracted_at
 from {{ source('raw', 'standings') }}
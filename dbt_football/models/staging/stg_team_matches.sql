@@ -0,0 +1,66 @@
+-- Staging model for team matches
+-- One row per team per finished match, seen from that team's perspective
+
+{{ config(materialized='view') }}
+
+with finished_matches as (
+    select *
+    from {{ ref('stg_matches') }}
+    where match_status = 'FINISHED'
+)
+
+select
+    match_id,
+    competition_id,
+    season_id,
+    match_date,
+    matchday,
+    match_stage,
+    home_team_id as team_id,
+    home_team_name as team_name,
+    away_team_id as opponent_id,
+    away_team_name as opponent_name,
+    true as is_home,
+    home_score as goals_for,
+    away_score as goals_against,
+    case
+        when home_score > away_score then 'W'
+        when home_score < away_score then 'L'
+        else 'D'
+    end as result,
+    case
+        when home_score > away_score then 3
+        when home_score = away_score then 1
+        else 0
+    end as points,
+    extracted_at
+from finished_matches
+
+union all
+
+select
+    match_id,
+    competition_id,
+    season_id,
+    match_date,
+    matchday,
+    match_stage,
+    away_team_id as team_id,
+    away_team_name as team_name,
+    home_team_id as opponent_id,
+    home_team_name as opponent_name,
+    false as is_home,
+    away_score as goals_for,
+    home_score as goals_against,
+    case
+        when away_score > home_score then 'W'
+        when away_score < home_score then 'L'
+        else 'D'
+    end as result,
+    case
+        when away_score > home_score then 3
+        when away_score = home_score then 1
+        else 0
+    end as points,
+    extracted_at
+from finished_matches
@@ -0,0 +1,52 @@
+-- Reconciliation: derived league standings against the API's standings snapshot
+-- Compares each team's latest derived totals with the stored TOTAL standings when both
+-- cover the same number of games (the API snapshot is refreshed only occasionally).
+-- Positions are not compared: some leagues break ties head-to-head.
+
+{{ config(severity='warn', tags=['reconciliation']) }}
+
+with derived as (
+    select *
+    from (
+        select
+            s.*,
+            row_number() over (
+                partition by competition_id, season_id, team_id
+                order by matchday desc
+            ) as recency
+        from {{ ref('league_standings') }} s
+    ) latest
+    where recency = 1
+),
+
+api as (
+    select *
+    from {{ ref('stg_standings') }}
+    where standing_type = 'TOTAL'
+        and standing_group is null
+)
+
+select
+    api.competition_id,
+    api.season_id,
+    api.team_id,
+    api.team_name,
+    api.played_games,
+    api.points as api_points,
+    derived.points as derived_points,
+    api.goal_difference as api_goal_difference,
+    derived.goal_difference as derived_goal_difference
+from api
+inner join derived
+    on api.competition_id = derived.competition_id
+    and api.season_id = derived.season_id
+    and api.team_id = derived.team_id
+where api.played_games = derived.played_games
+    and (
+        api.points <> derived.points
+        or api.wins <> derived.won
+        or api.draws <> derived.draw
+        or api.losses <> derived.lost
+        or api.goals_for <> derived.goals_for
+        or api.goals_against <> derived.goals_against
+    )
@@ -18,3 +18,11 @@ GRANT ALL PRIVILEGES ON DATABASE football_analytics TO airflow;
 GRANT ALL PRIVILEGES ON SCHEMA raw TO airflow;
 GRANT ALL PRIVILEGES ON SCHEMA staging TO airflow;
 GRANT ALL PRIVILEGES ON SCHEMA analytics TO airflow;
+
+-- Shadow schema for blue/green analytics builds (swapped with analytics after tests pass)
+CREATE SCHEMA IF NOT EXISTS analytics_shadow;
+GRANT ALL PRIVILEGES ON SCHEMA analytics_shadow TO airflow;
+
+-- Team ratings state, kept out of the swapped analytics schemas
+CREATE SCHEMA IF NOT EXISTS ratings;
+GRANT ALL PRIVILEGES ON SCHEMA ratings TO airflow;
@@ -1,23 +1,56 @@
-"""Airflow DAG for Football-Data.org ETL pipeline."""
+"""Airflow DAG for Football-Data.org ETL pipeline.
 
-from datetime import datetime, timedelta
-from airflow import DAG
-from airflow.operators.python import PythonOperator
-from airflow.operators.bash import BashOperator
-from airflow.utils.dates import days_ago
-import sys
+The scheduler re-parses this file every few seconds, so module level only
+defines the DAG structure. The extraction modules (and with them requests,
+SQLAlchemy and python-dotenv) are imported inside the task callables, which
+run on the workers.
+"""
+
+from datetime import timedelta
+import logging
 import os
+import sys
+
+import pendulum
+from airflow.decorators import dag, task
+from airflow.operators.bash import BashOperator
+from airflow.operators.latest_only import LatestOnlyOperator
+
+logger = logging.getLogger(__name__)
+
+# Where the api_extraction package is mounted (see docker-compose.yml)
+API_EXTRACTION_PATH = os.path.join(os.path.dirname(__file__), '..', 'plugins', 'api_extraction')
+
+# Shared pool for every task that calls the Football-Data.org API, so concurrent
+# (backfill) runs stay within the rate limit. Create it once with:
+#   airflow pools set football_api 2 "Football-Data.org API quota"
+FOOTBALL_API_POOL = 'football_api'
 
-# Add the api_extraction module to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'plugins'))
+# Durable spool between the API fetch and the database load (see spool.py);
+# mounted from the host so fetched payloads survive container restarts
+SPOOL_DIR = os.getenv('FOOTBALL_SPOOL_DIR', '/opt/airflow/spool')
 
-from api_extraction.extract_football_data import (
-    extract_competitions,
-    extract_competition_data,
+# Fully loaded spool segments are kept this long for replays
+SPOOL_RETENTION = timedelta(days=7)
+
+# Days of upcoming fixtures fetched on the latest run only
+FIXTURE_LOOKAHEAD_DAYS = 30
+
+# Analytics models are built and tested in a shadow schema, then swapped in
+# atomically so Metabase never reads (or blocks on) relations being rebuilt.
+DBT_BLUE_GREEN_VARS = "--vars '{blue_green: true}'"
+
+# Watermark for scoped dbt tests (empty on the first run, which tests everything)
+DBT_TEST_SINCE = (
+    "{{ prev_start_date_success.strftime('%Y-%m-%d %H:%M:%S') if prev_start_date_success else '' }}"
 )
-from api_extraction.football_api_client import FootballAPIClient
-from api_extraction.database_loader import DatabaseLoader
 
+# Read API (src/api_extraction/read_api.py) whose cache is dropped after each swap
+READ_API_URL = os.getenv('READ_API_URL', 'http://read-api:8000')
+
+# Earliest interval the DAG covers. The scheduler only runs the latest interval
+# (catchup=False); history since this date is loaded with `airflow dags backfill`.
+START_DATE = pendulum.parse(os.getenv('FOOTBALL_ETL_START_DATE', '2024-08-01'), tz='UTC')
 
 default_args = {
     'owner': 'airflow',
@@ -28,78 +61,195 @@ default_args = {
     'retry_delay': timedelta(minutes=5),
 }
 
-# Define the DAG
-dag = DAG(
-    'football_etl_pipeline',
-    default_args=default_args,
-    description='ETL pipeline for Football-Data.org API',
-    schedule_interval='0 6 * * *',  # Daily at 6 AM UTC
-    start_date=days_ago(1),
-    catchup=False,
-    tags=['football', 'etl', 'api'],
-)
-
-
-def extract_competitions_task():
-    """Task to extract competitions data."""
-    api_client = FootballAPIClient()
-    db_loader = DatabaseLoader()
-    extract_competitions(api_client, db_loader)
-
-
-def extract_major_competitions_task():
-    """Task to extract data for major competitions."""
-    api_client = FootballAPIClient()
-    db_loader = DatabaseLoader()
 
-    # Major European competitions
-    major_competition_ids = [
-        2021,  # Premier League
-        2014,  # La Liga
-        2002,  # Bundesliga
-        2019,  # Serie A
-        2015,  # Ligue 1
-        2001,  # Champions League
-        2146,  # Europa League
-    ]
-
-    extract_competition_data(api_client, db_loader, major_competition_ids)
-
-
-# Define tasks
-task_extract_competitions = PythonOperator(
-    task_id='extract_competitions',
-    python_callable=extract_competitions_task,
-    dag=dag,
-)
+def _use_api_extraction():
+    """Make the api_extraction modules importable; called from inside tasks only."""
+    if API_EXTRACTION_PATH not in sys.path:
+        sys.path.insert(0, API_EXTRACTION_PATH)
 
-task_extract_major_competitions = PythonOperator(
-    task_id='extract_major_competitions',
-    python_callable=extract_major_competitions_task,
-    dag=dag,
-)
 
-# dbt tasks
-task_dbt_deps = BashOperator(
-    task_id='dbt_deps',
-    bash_command='cd /opt/airflow/dbt_football && dbt deps --profiles-dir .',
-    dag=dag,
-)
+def _is_latest_interval(data_interval_end) -> bool:
+    """Whether a run covers the most recent interval rather than a backfill."""
+    return data_interval_end >= pendulum.now('UTC') - timedelta(days=1)
 
-task_dbt_run = BashOperator(
-    task_id='dbt_run',
-    bash_command='cd /opt/airflow/dbt_football && dbt run --profiles-dir .',
-    dag=dag,
-)
 
-task_dbt_test = BashOperator(
-    task_id='dbt_test',
-    bash_command='cd /opt/airflow/dbt_football && dbt test --profiles-dir .',
-    dag=dag,
+@dag(
+    dag_id='football_etl_pipeline',
+    default_args=default_args,
+    description='ETL pipeline for Football-Data.org API',
+    schedule_interval='0 6 * * *',  # Daily at 6 AM UTC
+    start_date=START_DATE,
+    # Each run extracts exactly its data interval, so historical runs are
+    # idempotent and a backfill can process them concurrently
+    catchup=False,
+    max_active_runs=8,
+    tags=['football', 'etl', 'api'],
 )
-
-# Define task dependencies
-task_extract_competitions >> task_extract_major_competitions
-task_extract_major_competitions >> task_dbt_deps
-task_dbt_deps >> task_dbt_run
-task_dbt_run >> task_dbt_test
+def football_etl_pipeline():
+
+    @task(task_id='extract_competitions', pool=FOOTBALL_API_POOL)
+    def extract_competitions_task(data_interval_end=None):
+        """Task to extract competitions data."""
+        if not _is_latest_interval(data_interval_end):
+            # The competitions list is a current snapshot; backfills would only rewrite it
+            return
+
+        _use_api_extraction()
+        from extract_football_data import extract_competitions
+        from football_api_client import FootballAPIClient
+        from database_loader import DatabaseLoader
+        from rate_limiter import ApiKeyPool
+
+        db_loader = DatabaseLoader()
+        api_client = FootballAPIClient(as_records=True, key_pool=ApiKeyPool.from_env(db_loader.engine))
+        extract_competitions(api_client, db_loader)
+
+    @task(task_id='plan_refresh')
+    def plan_refresh_task(data_interval_start=None, data_interval_end=None):
+        """Task to plan which competitions and entities this run needs to fetch."""
+        _use_api_extraction()
+        from extract_football_data import MAJOR_COMPETITION_IDS, match_window_for_interval
+        from refresh_planner import RefreshPlanner
+        from database_loader import DatabaseLoader
+
+        is_latest = _is_latest_interval(data_interval_end)
+        date_from, date_to = match_window_for_interval(
+            data_interval_start,
+            data_interval_end,
+            lookahead_days=FIXTURE_LOOKAHEAD_DAYS if is_latest else 0
+        )
+        plan = RefreshPlanner(DatabaseLoader()).plan(
+            MAJOR_COMPETITION_IDS, date_from, date_to, include_snapshots=is_latest
+        )
+
+        # XCom is JSON, so competition IDs travel as string keys
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'include_snapshots': is_latest,
+            'plan': {str(comp_id): entities for comp_id, entities in plan.items()},
+        }
+
+    @task(task_id='extract_major_competitions', pool=FOOTBALL_API_POOL)
+    def extract_major_competitions_task(refresh_plan: dict):
+        """Task to fetch the planned data for major competitions into the spool, loading it meanwhile."""
+        _use_api_extraction()
+        from extract_football_data import extract_competition_data
+        from football_api_client import FootballAPIClient
+        from database_loader import create_database_loader
+        from rate_limiter import ApiKeyPool
+        from spool import PayloadSpool
+
+        plan = {int(comp_id): entities for comp_id, entities in refresh_plan['plan'].items()}
+        if not plan:
+            return
+
+        # Every run draws on the same per-key rate limits in the database. A
+        # failed load does not fail the fetch; load_spool picks up what is left.
+        db_loader = create_database_loader()
+        extract_competition_data(
+            FootballAPIClient(key_pool=ApiKeyPool.from_env(db_loader.engine)),
+            db_loader,
+            list(plan),
+            date_from=refresh_plan['date_from'],
+            date_to=refresh_plan['date_to'],
+            include_snapshots=refresh_plan['include_snapshots'],
+            plan=plan,
+            spool=PayloadSpool(SPOOL_DIR)
+        )
+
+    # Loads whatever the extract task could not (usually nothing); retried without
+    # going back to the API, so a database outage only delays the load
+    @task(task_id='load_spool', retries=6, retry_delay=timedelta(minutes=5), retry_exponential_backoff=True)
+    def load_spool_task():
+        """Task to load every spooled payload not yet in the database."""
+        _use_api_extraction()
+        from extract_football_data import load_spool
+        from database_loader import create_database_loader
+        from spool import PayloadSpool
+
+        spool = PayloadSpool(SPOOL_DIR)
+        load_spool(create_database_loader(), spool)
+        spool.purge(spool.get_offset('database_loader'), min_age_seconds=SPOOL_RETENTION.total_seconds())
+
+    @task(task_id='enrich_details', pool=FOOTBALL_API_POOL)
+    def enrich_details_task():
+        """Task to fetch missing or expired team and match details within the request budget."""
+        _use_api_extraction()
+        from enrichment import enrich_details
+        from extract_football_data import MAJOR_COMPETITION_IDS
+        from football_api_client import FootballAPIClient
+        from database_loader import DatabaseLoader
+        from rate_limiter import ApiKeyPool
+
+        db_loader = DatabaseLoader()
+        api_client = FootballAPIClient(key_pool=ApiKeyPool.from_env(db_loader.engine))
+        enrich_details(api_client, db_loader, MAJOR_COMPETITION_IDS)
+
+    @task(task_id='update_team_ratings')
+    def update_team_ratings_task():
+        """Task to rate matches added to analytics.match_results since the last run."""
+        _use_api_extraction()
+        from team_ratings import TeamRatingEngine
+
+        TeamRatingEngine().update()
+
+    @task(task_id='invalidate_read_cache')
+    def invalidate_read_cache_task():
+        """Task to drop the read API's cached responses once new analytics are live."""
+        import requests
+
+        headers = {}
+        if os.getenv('READ_API_INVALIDATE_TOKEN'):
+            headers['X-Invalidate-Token'] = os.getenv('READ_API_INVALIDATE_TOKEN')
+        try:
+            response = requests.post(f"{READ_API_URL}/cache/invalidate", headers=headers, timeout=10)
+            response.raise_for_status()
+            logger.info(f"Read API cache invalidated: {response.json()}")
+        except requests.exceptions.RequestException as e:
+            # Entries still expire on their TTL, so this must not fail the run
+            logger.warning(f"Could not invalidate read API cache: {str(e)}")
+
+    # Backfill runs only load raw data; transformations run once, on the latest run
+    task_latest_only = LatestOnlyOperator(task_id='latest_only')
+
+    # dbt tasks
+    task_dbt_deps = BashOperator(
+        task_id='dbt_deps',
+        bash_command='cd /opt/airflow/dbt_football && dbt deps --profiles-dir .',
+    )
+
+    task_dbt_run = BashOperator(
+        task_id='dbt_run',
+        bash_command=f'cd /opt/airflow/dbt_football && dbt run --profiles-dir . {DBT_BLUE_GREEN_VARS}',
+    )
+
+    # Staging tests only check rows extracted since the last successful run started;
+    # the weekly football_full_test DAG covers all history
+    task_dbt_test = BashOperator(
+        task_id='dbt_test',
+        bash_command=(
+            'cd /opt/airflow/dbt_football && dbt test --profiles-dir . '
+            '--vars "{blue_green: true, test_since: \'$DBT_TEST_SINCE\'}"'
+        ),
+        env={'DBT_TEST_SINCE': DBT_TEST_SINCE},
+        append_env=True,
+    )
+
+    task_dbt_swap = BashOperator(
+        task_id='dbt_swap_analytics',
+        bash_command='cd /opt/airflow/dbt_football && dbt run-operation swap_analytics_schema --profiles-dir .',
+    )
+
+    # Define task dependencies
+    refresh_plan = plan_refresh_task()
+    extract_competitions_task() >> refresh_plan
+    extract_major_competitions_task(refresh_plan) >> load_spool_task() >> task_latest_only
+    # Details are current snapshots, so only the latest run spends quota on them
+    task_latest_only >> enrich_details_task()
+    task_latest_only >> task_dbt_deps
+    task_dbt_deps >> task_dbt_run >> task_dbt_test >> task_dbt_swap >> update_team_ratings_task()
+    task_dbt_swap >> invalidate_read_cache_task()
+
+
+football_etl_pipeline()
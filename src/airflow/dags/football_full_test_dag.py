@@ -0,0 +1,43 @@
+"""Weekly full dbt test run.
+
+The daily pipeline only tests staging rows extracted since its previous
+successful run (see dbt_football/macros/scoped_tests.sql). This DAG runs every
+test unscoped against the serving analytics schema, so problems in older data
+are still caught within a week.
+"""
+
+from datetime import timedelta
+
+import pendulum
+from airflow.decorators import dag
+from airflow.operators.bash import BashOperator
+
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=10),
+}
+
+
+@dag(
+    dag_id='football_full_test',
+    default_args=default_args,
+    description='Weekly dbt test run over all history',
+    schedule_interval='0 3 * * 0',  # Sundays at 3 AM UTC, clear of the daily ETL
+    start_date=pendulum.datetime(2024, 8, 1, tz='UTC'),
+    catchup=False,
+    max_active_runs=1,
+    tags=['football', 'dbt', 'quality'],
+)
+def football_full_test():
+
+    BashOperator(
+        task_id='dbt_test_full',
+        bash_command='cd /opt/airflow/dbt_football && dbt test --profiles-dir . --target-path target/full_test',
+    )
+
+
+football_full_test()
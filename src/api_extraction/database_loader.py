@@ -2,15 +2,27 @@
 
 import os
 import json
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Union
+from datetime import datetime, timedelta
 import logging
-from sqlalchemy import create_engine, Table, Column, Integer, String, DateTime, JSON, MetaData, Boolean, Float
+from sqlalchemy import (
+    create_engine, Table, Column, Integer, String, DateTime, JSON, MetaData, Boolean, Float,
+    select, update, bindparam, func, tuple_, text, union_all
+)
 from sqlalchemy.dialects.postgresql import insert
 
+from records import Competition, Team, Match, Standing, TeamDetail, MatchDetail, column_values, to_records
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Channel on which the raw tables announce committed changes (see
+# raw_change_listener.py)
+RAW_CHANGES_CHANNEL = 'raw_changes'
+
+# Raw tables that notify on insert and update
+NOTIFYING_TABLES = ('competitions', 'teams', 'matches', 'standings')
+
 
 class DatabaseLoader:
     """Loader for storing API data in PostgreSQL."""
@@ -51,7 +63,7 @@ class DatabaseLoader:
             Column('area_code', String),
             Column('current_season', JSON),
             Column('raw_data', JSON),
-            Column('extracted_at', DateTime, default=datetime.utcnow),
+            Column('extracted_at', DateTime, default=datetime.utcnow, index=True),
             schema='raw'
         )
 
@@ -70,7 +82,7 @@ class DatabaseLoader:
             Column('club_colors', String),
             Column('venue', String),
             Column('raw_data', JSON),
-            Column('extracted_at', DateTime, default=datetime.utcnow),
+            Column('extracted_at', DateTime, default=datetime.utcnow, index=True),
             schema='raw'
         )
 
@@ -97,7 +109,7 @@ class DatabaseLoader:
             Column('half_time_home', Integer),
             Column('half_time_away', Integer),
             Column('raw_data', JSON),
-            Column('extracted_at', DateTime, default=datetime.utcnow),
+            Column('extracted_at', DateTime, default=datetime.utcnow, index=True),
             schema='raw'
         )
 
@@ -123,19 +135,145 @@ class DatabaseLoader:
             Column('goals_against', Integer),
             Column('goal_difference', Integer),
             Column('raw_data', JSON),
+            Column('extracted_at', DateTime, default=datetime.utcnow, index=True),
+            schema='raw'
+        )
+
+        # Team details (teams/{id}): squad, staff and coach, fetched by enrichment.py
+        self.team_details_table = Table(
+            'team_details',
+            self.metadata,
+            Column('id', Integer, primary_key=True),
+            Column('name', String),
+            Column('coach_id', Integer),
+            Column('coach_name', String),
+            Column('squad_size', Integer),
+            Column('squad', JSON),
+            Column('staff', JSON),
+            Column('running_competition_ids', JSON),
+            Column('last_updated', String),
+            Column('raw_data', JSON),
+            Column('extracted_at', DateTime, default=datetime.utcnow, index=True),
+            schema='raw'
+        )
+
+        # Match details (matches/{id}): referees and lineups, fetched by enrichment.py
+        self.match_details_table = Table(
+            'match_details',
+            self.metadata,
+            Column('id', Integer, primary_key=True),
+            Column('competition_id', Integer),
+            Column('status', String),
+            Column('utc_date', DateTime),
+            Column('venue', String),
+            Column('attendance', Integer),
+            Column('referee_id', Integer),
+            Column('referee_name', String),
+            Column('referees', JSON),
+            Column('home_formation', String),
+            Column('away_formation', String),
+            Column('home_lineup', JSON),
+            Column('away_lineup', JSON),
+            Column('last_updated', String),
+            Column('raw_data', JSON),
+            Column('extracted_at', DateTime, default=datetime.utcnow, index=True),
+            schema='raw'
+        )
+
+        # Extraction log: one row per competition and entity written, used to
+        # plan which entities need refreshing on the next run
+        self.extraction_log_table = Table(
+            'extraction_log',
+            self.metadata,
+            Column('id', Integer, primary_key=True, autoincrement=True),
+            Column('competition_id', Integer, index=True),
+            Column('entity', String),
+            Column('record_count', Integer),
             Column('extracted_at', DateTime, default=datetime.utcnow),
             schema='raw'
         )
 
         # Create all tables
         self.metadata.create_all(self.engine)
+        # create_all only indexes new tables; add indexes defined since
+        for table in self.metadata.tables.values():
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         logger.info("Database tables created successfully")
+        self._create_change_triggers()
+
+    def _create_change_triggers(self):
+        """Create statement-level triggers that NOTIFY about changed raw rows.
+
+        Each INSERT or UPDATE statement sends one notification on
+        RAW_CHANGES_CHANNEL, delivered on commit, with the table, the number of
+        rows and the competitions involved. The function and triggers are only
+        created when missing, under an advisory lock, so concurrent loaders
+        neither take table locks nor race on the function's catalog row on
+        every start. Functions created by earlier versions also send ID and
+        kickoff ranges, which the listener ignores.
+        """
+        with self.engine.connect() as conn:
+            # Loaders starting together would otherwise race on "if not exists"
+            conn.execute(text("select pg_advisory_xact_lock(hashtext('raw.notify_raw_change'))"))
+            function_exists = conn.execute(
+                text("select to_regprocedure('raw.notify_raw_change()') is not null")
+            ).scalar()
+            if not function_exists:
+                conn.execute(text(f"""
+                    create function raw.notify_raw_change() returns trigger
+                    language plpgsql as $$
+                    declare
+                        competition_key text := case when TG_TABLE_NAME = 'competitions' then 'id' else 'competition_id' end;
+                        payload jsonb;
+                    begin
+                        select jsonb_build_object(
+                            'table', TG_TABLE_NAME,
+                            'op', lower(TG_OP),
+                            'rows', count(*),
+                            'competition_ids', coalesce(
+                                jsonb_agg(distinct (to_jsonb(r) ->> competition_key)::int)
+                                    filter (where to_jsonb(r) ->> competition_key is not null),
+                                '[]'::jsonb
+                            )
+                        )
+                        into payload
+                        from changed_rows r;
+
+                        if (payload ->> 'rows')::int > 0 then
+                            perform pg_notify('{RAW_CHANGES_CHANNEL}', payload::text);
+                        end if;
+                        return null;
+                    end
+                    $$
+                """))
+
+            # A trigger with a transition table covers a single event
+            for table in NOTIFYING_TABLES:
+                for event in ('insert', 'update'):
+                    trigger = f'notify_{table}_{event}'
+                    conn.execute(text(f"""
+                        do $$
+                        begin
+                            if not exists (
+                                select 1 from pg_trigger
+                                where tgname = '{trigger}' and tgrelid = 'raw.{table}'::regclass
+                            ) then
+                                create trigger {trigger}
+                                    after {event} on raw.{table}
+                                    referencing new table as changed_rows
+                                    for each statement execute function raw.notify_raw_change();
+                            end if;
+                        end
+                        $$
+                    """))
+            conn.commit()
 
-    def load_competitions(self, competitions: List[Dict]) -> int:
+    def load_competitions(self, competitions: List[Union[Dict, Competition]]) -> int:
         """Load competitions data into the database.
 
         Args:
-            competitions: List of competition dictionaries
+            competitions: List of competition dictionaries or records
 
         Returns:
             Number of records loaded
@@ -144,21 +282,8 @@ class DatabaseLoader:
             logger.warning("No competitions to load")
             return 0
 
-        records = []
-        for comp in competitions:
-            record = {
-                'id': comp.get('id'),
-                'name': comp.get('name'),
-                'code': comp.get('code'),
-                'type': comp.get('type'),
-                'emblem': comp.get('emblem'),
-                'area_name': comp.get('area', {}).get('name'),
-                'area_code': comp.get('area', {}).get('code'),
-                'current_season': comp.get('currentSeason'),
-                'raw_data': comp,
-                'extracted_at': datetime.utcnow()
-            }
-            records.append(record)
+        extracted_at = datetime.utcnow()
+        records = column_values(Competition, to_records(Competition, competitions), extracted_at)
 
         with self.engine.connect() as conn:
             stmt = insert(self.competitions_table).values(records)
@@ -182,11 +307,11 @@ class DatabaseLoader:
         logger.info(f"Loaded {len(records)} competitions")
         return len(records)
 
-    def load_teams(self, teams: List[Dict]) -> int:
+    def load_teams(self, teams: List[Union[Dict, Team]]) -> int:
         """Load teams data into the database.
 
         Args:
-            teams: List of team dictionaries
+            teams: List of team dictionaries or records
 
         Returns:
             Number of records loaded
@@ -195,23 +320,8 @@ class DatabaseLoader:
             logger.warning("No teams to load")
             return 0
 
-        records = []
-        for team in teams:
-            record = {
-                'id': team.get('id'),
-                'name': team.get('name'),
-                'short_name': team.get('shortName'),
-                'tla': team.get('tla'),
-                'crest': team.get('crest'),
-                'address': team.get('address'),
-                'website': team.get('website'),
-                'founded': team.get('founded'),
-                'club_colors': team.get('clubColors'),
-                'venue': team.get('venue'),
-                'raw_data': team,
-                'extracted_at': datetime.utcnow()
-            }
-            records.append(record)
+        extracted_at = datetime.utcnow()
+        records = column_values(Team, to_records(Team, teams), extracted_at)
 
         with self.engine.connect() as conn:
             stmt = insert(self.teams_table).values(records)
@@ -237,11 +347,11 @@ class DatabaseLoader:
         logger.info(f"Loaded {len(records)} teams")
         return len(records)
 
-    def load_matches(self, matches: List[Dict]) -> int:
+    def load_matches(self, matches: List[Union[Dict, Match]]) -> int:
         """Load matches data into the database.
 
         Args:
-            matches: List of match dictionaries
+            matches: List of match dictionaries or records
 
         Returns:
             Number of records loaded
@@ -250,35 +360,8 @@ class DatabaseLoader:
             logger.warning("No matches to load")
             return 0
 
-        records = []
-        for match in matches:
-            score = match.get('score', {})
-            full_time = score.get('fullTime', {})
-            half_time = score.get('halfTime', {})
-
-            record = {
-                'id': match.get('id'),
-                'competition_id': match.get('competition', {}).get('id'),
-                'season_id': match.get('season', {}).get('id'),
-                'utc_date': match.get('utcDate'),
-                'status': match.get('status'),
-                'matchday': match.get('matchday'),
-                'stage': match.get('stage'),
-                'group': match.get('group'),
-                'home_team_id': match.get('homeTeam', {}).get('id'),
-                'home_team_name': match.get('homeTeam', {}).get('name'),
-                'away_team_id': match.get('awayTeam', {}).get('id'),
-                'away_team_name': match.get('awayTeam', {}).get('name'),
-                'winner': score.get('winner'),
-                'duration': score.get('duration'),
-                'full_time_home': full_time.get('home'),
-                'full_time_away': full_time.get('away'),
-                'half_time_home': half_time.get('home'),
-                'half_time_away': half_time.get('away'),
-                'raw_data': match,
-                'extracted_at': datetime.utcnow()
-            }
-            records.append(record)
+        extracted_at = datetime.utcnow()
+        records = column_values(Match, to_records(Match, matches), extracted_at)
 
         with self.engine.connect() as conn:
             stmt = insert(self.matches_table).values(records)
@@ -312,64 +395,424 @@ class DatabaseLoader:
         logger.info(f"Loaded {len(records)} matches")
         return len(records)
 
-    def load_standings(self, standings_data: Dict, competition_id: int) -> int:
+    def update_match_scores(self, matches: List[Union[Dict, Match]]) -> int:
+        """Update only the status and score fields of already loaded matches.
+
+        Used by the live poller: rows whose score fields are unchanged are left
+        untouched, and matches not yet in raw.matches fall back to a full upsert.
+        raw_data is refreshed by the next regular extraction.
+
+        Args:
+            matches: List of match dictionaries or records
+
+        Returns:
+            Number of records inserted or updated
+        """
+        if not matches:
+            return 0
+
+        score_fields = [
+            'status', 'winner', 'duration',
+            'full_time_home', 'full_time_away', 'half_time_home', 'half_time_away'
+        ]
+        extracted_at = datetime.utcnow()
+        records = to_records(Match, matches)
+        ids = [record.id for record in records]
+
+        updated = 0
+        with self.engine.connect() as conn:
+            existing_ids = set(conn.execute(
+                select(self.matches_table.c.id).where(self.matches_table.c.id.in_(ids))
+            ).scalars())
+
+            updates = [
+                {'match_id': record.id, 'new_extracted_at': extracted_at,
+                 **{f'new_{field}': getattr(record, field) for field in score_fields}}
+                for record in records if record.id in existing_ids
+            ]
+            if updates:
+                table = self.matches_table
+                stmt = (
+                    update(table)
+                    .where(table.c.id == bindparam('match_id'))
+                    .where(
+                        tuple_(*[table.c[field] for field in score_fields]).is_distinct_from(
+                            tuple_(*[bindparam(f'new_{field}') for field in score_fields])
+                        )
+                    )
+                    .values(
+                        extracted_at=bindparam('new_extracted_at'),
+                        **{field: bindparam(f'new_{field}') for field in score_fields}
+                    )
+                )
+                # Rows with unchanged scores are skipped by the WHERE clause, so only
+                # the driver's row count says how many were actually written
+                updated = conn.execute(stmt, updates).rowcount
+            conn.commit()
+
+        new_matches = [record for record in records if record.id not in existing_ids]
+        inserted = self.load_matches(new_matches) if new_matches else 0
+
+        logger.info(f"Updated scores for {updated} matches, inserted {inserted} new matches")
+        return updated + inserted
+
+    def load_standings(self, standings_data: Union[Dict, List[Standing]], competition_id: int) -> int:
         """Load standings data into the database.
 
         Args:
-            standings_data: Standings data dictionary from API
+            standings_data: Standings data dictionary from API, or standing records
             competition_id: Competition ID
 
         Returns:
             Number of records loaded
         """
-        standings = standings_data.get('standings', [])
+        if isinstance(standings_data, dict):
+            standings = Standing.from_api(standings_data, competition_id)
+        else:
+            standings = standings_data
         if not standings:
             logger.warning("No standings to load")
             return 0
 
-        records = []
-        for standing in standings:
-            stage = standing.get('stage')
-            type_ = standing.get('type')
-            group = standing.get('group')
-
-            for table_entry in standing.get('table', []):
-                record = {
-                    'competition_id': competition_id,
-                    'season_id': standings_data.get('season', {}).get('id'),
-                    'stage': stage,
-                    'type': type_,
-                    'group': group,
-                    'team_id': table_entry.get('team', {}).get('id'),
-                    'team_name': table_entry.get('team', {}).get('name'),
-                    'position': table_entry.get('position'),
-                    'played_games': table_entry.get('playedGames'),
-                    'won': table_entry.get('won'),
-                    'draw': table_entry.get('draw'),
-                    'lost': table_entry.get('lost'),
-                    'points': table_entry.get('points'),
-                    'goals_for': table_entry.get('goalsFor'),
-                    'goals_against': table_entry.get('goalsAgainst'),
-                    'goal_difference': table_entry.get('goalDifference'),
-                    'raw_data': table_entry,
-                    'extracted_at': datetime.utcnow()
-                }
-                records.append(record)
-
-        if records:
-            with self.engine.connect() as conn:
-                # Delete existing standings for this competition and season
-                season_id = standings_data.get('season', {}).get('id')
-                conn.execute(
-                    self.standings_table.delete().where(
-                        (self.standings_table.c.competition_id == competition_id) &
-                        (self.standings_table.c.season_id == season_id)
-                    )
+        extracted_at = datetime.utcnow()
+        records = [standing.to_row(extracted_at) for standing in standings]
+
+        with self.engine.connect() as conn:
+            # Delete existing standings for this competition and season
+            season_id = standings[0].season_id
+            conn.execute(
+                self.standings_table.delete().where(
+                    (self.standings_table.c.competition_id == competition_id) &
+                    (self.standings_table.c.season_id == season_id)
                 )
+            )
 
-                # Insert new standings
-                conn.execute(self.standings_table.insert(), records)
-                conn.commit()
+            # Insert new standings
+            conn.execute(self.standings_table.insert(), records)
+            conn.commit()
 
         logger.info(f"Loaded {len(records)} standing records")
         return len(records)
+
+    def load_team_details(self, details: List[Union[Dict, TeamDetail]]) -> int:
+        """Load team detail payloads into the database in one upsert.
+
+        Args:
+            details: List of team detail dictionaries or records
+
+        Returns:
+            Number of records loaded
+        """
+        if not details:
+            return 0
+
+        extracted_at = datetime.utcnow()
+        records = column_values(TeamDetail, to_records(TeamDetail, details), extracted_at)
+
+        with self.engine.connect() as conn:
+            stmt = insert(self.team_details_table).values(records)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['id'],
+                set_={
+                    'name': stmt.excluded.name,
+                    'coach_id': stmt.excluded.coach_id,
+                    'coach_name': stmt.excluded.coach_name,
+                    'squad_size': stmt.excluded.squad_size,
+                    'squad': stmt.excluded.squad,
+                    'staff': stmt.excluded.staff,
+                    'running_competition_ids': stmt.excluded.running_competition_ids,
+                    'last_updated': stmt.excluded.last_updated,
+                    'raw_data': stmt.excluded.raw_data,
+                    'extracted_at': stmt.excluded.extracted_at
+                }
+            )
+            conn.execute(stmt)
+            conn.commit()
+
+        logger.info(f"Loaded {len(records)} team details")
+        return len(records)
+
+    def load_match_details(self, details: List[Union[Dict, MatchDetail]]) -> int:
+        """Load match detail payloads into the database in one upsert.
+
+        Args:
+            details: List of match detail dictionaries or records
+
+        Returns:
+            Number of records loaded
+        """
+        if not details:
+            return 0
+
+        extracted_at = datetime.utcnow()
+        records = column_values(MatchDetail, to_records(MatchDetail, details), extracted_at)
+
+        with self.engine.connect() as conn:
+            stmt = insert(self.match_details_table).values(records)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['id'],
+                set_={
+                    'competition_id': stmt.excluded.competition_id,
+                    'status': stmt.excluded.status,
+                    'utc_date': stmt.excluded.utc_date,
+                    'venue': stmt.excluded.venue,
+                    'attendance': stmt.excluded.attendance,
+                    'referee_id': stmt.excluded.referee_id,
+                    'referee_name': stmt.excluded.referee_name,
+                    'referees': stmt.excluded.referees,
+                    'home_formation': stmt.excluded.home_formation,
+                    'away_formation': stmt.excluded.away_formation,
+                    'home_lineup': stmt.excluded.home_lineup,
+                    'away_lineup': stmt.excluded.away_lineup,
+                    'last_updated': stmt.excluded.last_updated,
+                    'raw_data': stmt.excluded.raw_data,
+                    'extracted_at': stmt.excluded.extracted_at
+                }
+            )
+            conn.execute(stmt)
+            conn.commit()
+
+        logger.info(f"Loaded {len(records)} match details")
+        return len(records)
+
+    def load_entity(self, entity: str, payload: Any, competition_id: Optional[int] = None) -> int:
+        """Load one fetched payload with the matching load_* method.
+
+        Args:
+            entity: Entity name ('competitions', 'teams', 'standings' or 'matches')
+            payload: API payload or records
+            competition_id: Competition ID the payload belongs to (needed for standings)
+
+        Returns:
+            Number of records loaded
+        """
+        if entity == 'competitions':
+            return self.load_competitions(payload)
+        if entity == 'teams':
+            return self.load_teams(payload)
+        if entity == 'standings':
+            return self.load_standings(payload, competition_id)
+        if entity == 'matches':
+            return self.load_matches(payload)
+        raise ValueError(f"Unknown entity: {entity}")
+
+    def load_batch(self, batch: List[Tuple[str, Optional[int], Any]]) -> List[int]:
+        """Load several payloads, e.g. everything fetched for one competition.
+
+        This loader writes each payload in its own transaction; backends that
+        can do better (see pipelined_loader.py) load the batch in one.
+
+        Args:
+            batch: Tuples of (entity name, competition ID, payload)
+
+        Returns:
+            Number of records loaded for each batch entry
+        """
+        return [self.load_entity(entity, payload, comp_id) for entity, comp_id, payload in batch]
+
+    def get_next_kickoff(self, competition_ids: List[int]) -> Optional[datetime]:
+        """Get the earliest known kickoff that has not been played yet.
+
+        Args:
+            competition_ids: Competition IDs to consider
+
+        Returns:
+            UTC kickoff time, or None if no upcoming fixture is stored
+        """
+        table = self.matches_table
+        stmt = select(func.min(table.c.utc_date)).where(
+            table.c.competition_id.in_(competition_ids),
+            table.c.status.in_(['SCHEDULED', 'TIMED']),
+            table.c.utc_date >= datetime.utcnow() - timedelta(hours=3)
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(stmt).scalar()
+
+    def record_extractions(self, entries: List[Tuple[int, str, int]]) -> int:
+        """Log which entities were written for which competitions.
+
+        Args:
+            entries: Tuples of (competition ID, entity name, record count)
+
+        Returns:
+            Number of log rows written
+        """
+        if not entries:
+            return 0
+
+        extracted_at = datetime.utcnow()
+        rows = [
+            {'competition_id': comp_id, 'entity': entity, 'record_count': count, 'extracted_at': extracted_at}
+            for comp_id, entity, count in entries
+        ]
+        with self.engine.connect() as conn:
+            conn.execute(self.extraction_log_table.insert(), rows)
+            conn.commit()
+        return len(rows)
+
+    def get_last_extractions(self, competition_ids: List[int]) -> Dict[Tuple[int, str], datetime]:
+        """Get when each entity was last written per competition.
+
+        Args:
+            competition_ids: Competition IDs to consider
+
+        Returns:
+            Dictionary of (competition ID, entity name) to last extraction time
+        """
+        table = self.extraction_log_table
+        stmt = (
+            select(table.c.competition_id, table.c.entity, func.max(table.c.extracted_at))
+            .where(table.c.competition_id.in_(competition_ids))
+            .group_by(table.c.competition_id, table.c.entity)
+        )
+        with self.engine.connect() as conn:
+            return {(comp_id, entity): last for comp_id, entity, last in conn.execute(stmt)}
+
+    def get_current_seasons(self, competition_ids: List[int]) -> Dict[int, Dict]:
+        """Get the stored current season of each competition.
+
+        Args:
+            competition_ids: Competition IDs to consider
+
+        Returns:
+            Dictionary of competition ID to the API's currentSeason object
+        """
+        table = self.competitions_table
+        stmt = select(table.c.id, table.c.current_season).where(table.c.id.in_(competition_ids))
+        with self.engine.connect() as conn:
+            return {comp_id: season for comp_id, season in conn.execute(stmt) if season}
+
+    def get_fixture_summary(
+        self,
+        competition_ids: List[int],
+        window_start: datetime,
+        window_end: datetime,
+        played_before: datetime
+    ) -> Dict[int, Dict[str, Any]]:
+        """Summarize the stored fixture calendar of each competition.
+
+        Args:
+            competition_ids: Competition IDs to consider
+            window_start: Start of the extraction window
+            window_end: End of the extraction window (exclusive)
+            played_before: Kickoffs before this time are considered played
+
+        Returns:
+            Dictionary of competition ID to first and last stored kickoff, the
+            number of fixtures in the window and the latest played kickoff
+        """
+        table = self.matches_table
+        stmt = (
+            select(
+                table.c.competition_id,
+                func.min(table.c.utc_date),
+                func.max(table.c.utc_date),
+                func.count().filter((table.c.utc_date >= window_start) & (table.c.utc_date < window_end)),
+                func.max(table.c.utc_date).filter(table.c.utc_date < played_before),
+            )
+            .where(table.c.competition_id.in_(competition_ids))
+            .group_by(table.c.competition_id)
+        )
+        with self.engine.connect() as conn:
+            return {
+                comp_id: {
+                    'first_kickoff': first_kickoff,
+                    'last_kickoff': last_kickoff,
+                    'in_window': in_window,
+                    'last_played': last_played,
+                }
+                for comp_id, first_kickoff, last_kickoff, in_window, last_played in conn.execute(stmt)
+            }
+
+    def get_team_detail_state(
+        self,
+        competition_ids: List[int],
+        upcoming_from: datetime
+    ) -> Dict[int, Dict[str, Any]]:
+        """Summarize every team playing in the competitions and its stored details.
+
+        Args:
+            competition_ids: Competition IDs whose fixtures reference the teams
+            upcoming_from: Fixtures kicking off from this time on count as upcoming
+
+        Returns:
+            Dictionary of team ID to the number of competitions it plays in, its
+            number of upcoming fixtures and when its details were last
+            extracted (None if never)
+        """
+        matches = self.matches_table
+        sides = union_all(*[
+            select(team_column.label('team_id'), matches.c.competition_id, matches.c.utc_date)
+            .where(matches.c.competition_id.in_(competition_ids), team_column.is_not(None))
+            for team_column in (matches.c.home_team_id, matches.c.away_team_id)
+        ]).subquery()
+        details = self.team_details_table
+        stmt = (
+            select(
+                sides.c.team_id,
+                func.count(sides.c.competition_id.distinct()),
+                func.count().filter(sides.c.utc_date >= upcoming_from),
+                details.c.extracted_at,
+            )
+            .select_from(sides.outerjoin(details, details.c.id == sides.c.team_id))
+            .group_by(sides.c.team_id, details.c.extracted_at)
+        )
+        with self.engine.connect() as conn:
+            return {
+                team_id: {'competitions': competitions, 'upcoming': upcoming, 'extracted_at': extracted_at}
+                for team_id, competitions, upcoming, extracted_at in conn.execute(stmt)
+            }
+
+    def get_match_detail_state(self, competition_ids: List[int], kickoff_before: datetime) -> List[Dict[str, Any]]:
+        """List the competitions' matches with the state of their stored details.
+
+        Args:
+            competition_ids: Competition IDs to consider
+            kickoff_before: Only matches kicking off before this time are listed
+
+        Returns:
+            One dictionary per match with its ID, status and kickoff, and the
+            status and extraction time of its stored details (None if never)
+        """
+        matches = self.matches_table
+        details = self.match_details_table
+        stmt = (
+            select(
+                matches.c.id, matches.c.status, matches.c.utc_date,
+                details.c.status, details.c.extracted_at,
+            )
+            .select_from(matches.outerjoin(details, details.c.id == matches.c.id))
+            .where(matches.c.competition_id.in_(competition_ids), matches.c.utc_date < kickoff_before)
+        )
+        with self.engine.connect() as conn:
+            return [
+                {
+                    'id': match_id,
+                    'status': status,
+                    'utc_date': utc_date,
+                    'detail_status': detail_status,
+                    'extracted_at': extracted_at,
+                }
+                for match_id, status, utc_date, detail_status, extracted_at in conn.execute(stmt)
+            ]
+
+
+def create_database_loader(connection_string: str = None) -> DatabaseLoader:
+    """Create the loader selected by DATABASE_LOADER_BACKEND.
+
+    'sqlalchemy' (the default) is DatabaseLoader itself; 'psycopg' is the
+    pipelined psycopg 3 backend, which needs the psycopg package.
+
+    Args:
+        connection_string: PostgreSQL connection string
+
+    Returns:
+        Database loader
+    """
+    backend = os.getenv('DATABASE_LOADER_BACKEND', 'sqlalchemy')
+    if backend == 'psycopg':
+        from pipelined_loader import PipelinedDatabaseLoader
+        return PipelinedDatabaseLoader(connection_string)
+    if backend != 'sqlalchemy':
+        raise ValueError(f"Unknown DATABASE_LOADER_BACKEND: {backend}")
+    return DatabaseLoader(connection_string)
@@ -0,0 +1,312 @@
+"""Enrich stored teams and matches through the per-entity detail endpoints.
+
+The competition endpoints leave out squads, coaches, referees and lineups; the
+API only serves them per team (teams/{id}) and per match (matches/{id}), one
+request each. DetailPlanner works out from what is stored which of those
+requests are worth their quota:
+
+- teams playing in the planned competitions without details, or with details
+  older than `team_ttl_days`. A club in a domestic league and a European
+  competition is one request, however many fixtures reference it;
+- matches without details, with details taken under another status (e.g.
+  before the final whistle), or kicking off within `refresh_days` with details
+  older than `match_ttl_hours` (referees and lineups are announced shortly
+  before kickoff). Details of a finished match are final and never fetched
+  again. Live matches are left to the live poller.
+
+The detail tables double as the cache: a stored detail is fresh while its
+extracted_at is within the TTL. Requests are ordered by priority (results of
+the last few days, new teams, upcoming matches by kickoff, older results
+without details, then refreshes of expired details) and cut off at the run's
+request budget; the rest wait for the next run, so a backlog is worked off over
+several runs without starving new entities. DetailEnricher fetches the
+selected details and writes them in bulk, one upsert per batch.
+"""
+
+import os
+import sys
+import argparse
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+from football_api_client import FootballAPIClient
+from database_loader import DatabaseLoader, create_database_loader
+from rate_limiter import ApiKeyPool
+from extract_football_data import MAJOR_COMPETITION_IDS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Detail requests per run unless FOOTBALL_ENRICHMENT_MAX_REQUESTS says otherwise;
+# about ten minutes of a single free-tier key
+DEFAULT_MAX_REQUESTS = 100
+
+# Statuses whose details no longer change
+FINAL_STATUSES = ('FINISHED', 'AWARDED', 'CANCELLED')
+
+# In progress; the live poller keeps these up to date
+LIVE_STATUSES = ('IN_PLAY', 'PAUSED')
+
+# Priority tiers, fetched in this order within the budget
+RECENT_RESULT, NEW_TEAM, UPCOMING_MATCH, PAST_RESULT, STALE_MATCH, STALE_TEAM = range(6)
+
+
+@dataclass(slots=True, frozen=True)
+class DetailRequest:
+    """One detail request: a team or match ID, why it is needed and its rank."""
+
+    entity: str
+    entity_id: int
+    reason: str
+    priority: Tuple
+
+
+class DetailPlanner:
+    """Decide which team and match details to fetch, in priority order."""
+
+    def __init__(
+        self,
+        db_loader: DatabaseLoader,
+        team_ttl_days: float = 7,
+        match_ttl_hours: float = 24,
+        lookahead_days: int = 7,
+        refresh_days: int = 2,
+        recent_days: int = 3
+    ):
+        """Initialize the planner.
+
+        Args:
+            db_loader: Database loader used to read the stored state
+            team_ttl_days: Age after which team details are refreshed
+            match_ttl_hours: Age after which details of unfinished matches are refreshed
+            lookahead_days: Upcoming matches kicking off within this many days get details
+            refresh_days: Upcoming matches kicking off within this many days have expired details refreshed
+            recent_days: Matches played within this many days rank ahead of older results
+        """
+        self.db_loader = db_loader
+        self.team_ttl = timedelta(days=team_ttl_days)
+        self.match_ttl = timedelta(hours=match_ttl_hours)
+        self.lookahead = timedelta(days=lookahead_days)
+        self.refresh = timedelta(days=refresh_days)
+        self.recent = timedelta(days=recent_days)
+
+    def team_requests(self, teams: Dict[int, Dict[str, Any]], now: datetime) -> List[DetailRequest]:
+        """Team detail requests for a state as returned by get_team_detail_state.
+
+        Args:
+            teams: Team ID to competitions, upcoming fixtures and last extraction
+            now: Current UTC time
+
+        Returns:
+            Requests for teams whose details are missing or expired
+        """
+        planned = []
+        for team_id, state in teams.items():
+            extracted_at = state['extracted_at']
+            if extracted_at is None:
+                # Teams with the most upcoming fixtures, across most competitions, first
+                planned.append(DetailRequest(
+                    'team', team_id, 'missing', (NEW_TEAM, -state['upcoming'], -state['competitions'], team_id)
+                ))
+            elif now - extracted_at >= self.team_ttl:
+                planned.append(DetailRequest('team', team_id, 'stale', (STALE_TEAM, extracted_at, team_id)))
+        return planned
+
+    def match_requests(self, matches: List[Dict[str, Any]], now: datetime) -> List[DetailRequest]:
+        """Match detail requests for a state as returned by get_match_detail_state.
+
+        Args:
+            matches: Matches with their status, kickoff and stored detail state
+            now: Current UTC time
+
+        Returns:
+            Requests for matches whose details are missing, outdated or expired
+        """
+        planned = []
+        for match in matches:
+            status = match['status']
+            if status in LIVE_STATUSES:
+                continue
+            kickoff = match['utc_date']
+
+            if status in FINAL_STATUSES:
+                if match['detail_status'] == status:
+                    continue
+                # Most recent first; these are the details people look up
+                reason = 'missing' if match['extracted_at'] is None else 'status'
+                tier = RECENT_RESULT if reason == 'status' or now - kickoff < self.recent else PAST_RESULT
+                planned.append(DetailRequest('match', match['id'], reason, (tier, -kickoff.timestamp(), match['id'])))
+            elif match['extracted_at'] is None or match['detail_status'] != status:
+                reason = 'missing' if match['extracted_at'] is None else 'status'
+                planned.append(DetailRequest(
+                    'match', match['id'], reason, (UPCOMING_MATCH, kickoff, match['id'])
+                ))
+            elif now <= kickoff < now + self.refresh and now - match['extracted_at'] >= self.match_ttl:
+                # Postponed fixtures in the past wait for a status change instead
+                planned.append(DetailRequest('match', match['id'], 'stale', (STALE_MATCH, kickoff, match['id'])))
+        return planned
+
+    def plan(self, competition_ids: List[int], now: Optional[datetime] = None) -> List[DetailRequest]:
+        """Plan the detail requests for the competitions' teams and matches.
+
+        Args:
+            competition_ids: Competitions whose teams and matches to enrich
+            now: Current UTC time (defaults to now)
+
+        Returns:
+            Requests in the order they should be fetched
+        """
+        now = now or datetime.utcnow()
+        teams = self.db_loader.get_team_detail_state(competition_ids, upcoming_from=now)
+        matches = self.db_loader.get_match_detail_state(competition_ids, kickoff_before=now + self.lookahead)
+
+        planned = sorted(
+            self.team_requests(teams, now) + self.match_requests(matches, now),
+            key=lambda request: request.priority
+        )
+
+        references = sum(state['competitions'] for state in teams.values())
+        logger.info(
+            f"Planned {len(planned)} detail requests: "
+            f"{sum(r.entity == 'team' for r in planned)} of {len(teams)} teams "
+            f"({references} competition memberships), "
+            f"{sum(r.entity == 'match' for r in planned)} of {len(matches)} matches"
+        )
+        return planned
+
+
+class DetailEnricher:
+    """Fetch planned details within a request budget and write them in bulk."""
+
+    def __init__(
+        self,
+        api_client: FootballAPIClient,
+        db_loader: DatabaseLoader,
+        max_requests: Optional[int] = None,
+        write_batch_size: int = 50
+    ):
+        """Initialize the enricher.
+
+        Args:
+            api_client: Football API client; should share the rate-limited key pool
+            db_loader: Database loader
+            max_requests: Detail requests per run (defaults to FOOTBALL_ENRICHMENT_MAX_REQUESTS)
+            write_batch_size: Details written per upsert
+        """
+        self.api_client = api_client
+        self.db_loader = db_loader
+        self.max_requests = max_requests or int(
+            os.getenv('FOOTBALL_ENRICHMENT_MAX_REQUESTS', str(DEFAULT_MAX_REQUESTS))
+        )
+        self.write_batch_size = write_batch_size
+
+    def _fetch(self, request: DetailRequest) -> Dict:
+        """Detail payload of a request."""
+        if request.entity == 'team':
+            return self.api_client.get_team(request.entity_id)
+        match = self.api_client.get_match(request.entity_id)
+        return match if isinstance(match, dict) else match.raw
+
+    def _write(self, entity: str, payloads: List[Dict]) -> int:
+        """Write a batch of detail payloads of one entity."""
+        if entity == 'team':
+            return self.db_loader.load_team_details(payloads)
+        return self.db_loader.load_match_details(payloads)
+
+    def run(self, planned: List[DetailRequest]) -> Dict[str, int]:
+        """Fetch the highest-priority details the budget allows and store them.
+
+        Args:
+            planned: Requests in priority order, as returned by DetailPlanner.plan
+
+        Returns:
+            Counts of details written, missing at the API, failed and left for later
+        """
+        selected = planned[:self.max_requests]
+        pending: Dict[str, List[Dict]] = {'team': [], 'match': []}
+        stats = {'written': 0, 'not_found': 0, 'failed': 0, 'deferred': len(planned) - len(selected)}
+
+        for request in selected:
+            try:
+                payload = self._fetch(request)
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    stats['not_found'] += 1
+                    logger.warning(f"No details for {request.entity} {request.entity_id}")
+                else:
+                    stats['failed'] += 1
+                continue
+            except requests.exceptions.RequestException:
+                stats['failed'] += 1
+                continue
+
+            batch = pending[request.entity]
+            batch.append(payload)
+            if len(batch) >= self.write_batch_size:
+                stats['written'] += self._write(request.entity, batch)
+                batch.clear()
+
+        for entity, batch in pending.items():
+            stats['written'] += self._write(entity, batch)
+
+        logger.info(
+            f"Enrichment: {stats['written']} details written, {stats['not_found']} not found, "
+            f"{stats['failed']} failed, {stats['deferred']} deferred to the next run"
+        )
+        return stats
+
+
+def enrich_details(
+    api_client: FootballAPIClient,
+    db_loader: DatabaseLoader,
+    competition_ids: List[int],
+    max_requests: Optional[int] = None
+) -> Dict[str, int]:
+    """Plan and fetch the detail requests for the competitions.
+
+    Args:
+        api_client: Football API client
+        db_loader: Database loader
+        competition_ids: Competitions whose teams and matches to enrich
+        max_requests: Detail requests per run (defaults to FOOTBALL_ENRICHMENT_MAX_REQUESTS)
+
+    Returns:
+        Counts of details written, missing at the API, failed and left for later
+    """
+    planned = DetailPlanner(db_loader).plan(competition_ids)
+    stats = DetailEnricher(api_client, db_loader, max_requests).run(planned)
+    api_client.log_stats()
+    return stats
+
+
+def main():
+    """Enrich the major competitions' teams and matches with their details."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--competitions', type=int, nargs='+', default=MAJOR_COMPETITION_IDS)
+    parser.add_argument('--max-requests', type=int, help='Detail requests for this run')
+    parser.add_argument('--dry-run', action='store_true', help='Only print the planned requests')
+    args = parser.parse_args()
+
+    try:
+        db_loader = create_database_loader()
+        if args.dry_run:
+            for request in DetailPlanner(db_loader).plan(args.competitions)[:args.max_requests]:
+                print(f"{request.entity} {request.entity_id}: {request.reason}")
+            return
+        api_client = FootballAPIClient(key_pool=ApiKeyPool.from_env(db_loader.engine))
+        enrich_details(api_client, db_loader, args.competitions, args.max_requests)
+    except Exception as e:
+        logger.error(f"Enrichment failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Run-scoped registry for entities shared between competitions."""
+
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class EntityRegistry:
+    """Collects shared entities (e.g. teams) seen during one extraction run.
+
+    Clubs playing in a domestic league and a European competition are returned
+    by several competition endpoints. Registering them here instead of loading
+    them straight away means each distinct payload is written once, in a single
+    batch at the end of the run.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._payloads: Dict[str, Dict[int, Any]] = {}
+        self._hashes: Dict[str, Dict[int, str]] = {}
+        self._seen: Dict[str, int] = {}
+        self._sources: Dict[str, Dict[int, int]] = {}
+
+    @staticmethod
+    def _payload_hash(payload: Dict) -> str:
+        """Stable hash of a payload, independent of key order."""
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()
+
+    @staticmethod
+    def _payload(item: Any) -> Dict:
+        """API payload of an item, which may be a raw dictionary or a record."""
+        return item if isinstance(item, dict) else item.raw
+
+    def add(self, entity: str, items: List[Any], source: Optional[int] = None) -> int:
+        """Register fetched items of an entity.
+
+        Args:
+            entity: Entity name (e.g. 'teams')
+            items: API payloads or records, each with an id
+            source: ID of the competition the items were fetched for
+
+        Returns:
+            Number of items that were new or differed from the registered payload
+        """
+        payloads = self._payloads.setdefault(entity, {})
+        hashes = self._hashes.setdefault(entity, {})
+        self._seen[entity] = self._seen.get(entity, 0) + len(items)
+        if source is not None:
+            sources = self._sources.setdefault(entity, {})
+            sources[source] = sources.get(source, 0) + len(items)
+
+        changed = 0
+        for item in items:
+            payload = self._payload(item)
+            item_id = payload.get('id')
+            item_hash = self._payload_hash(payload)
+            if hashes.get(item_id) == item_hash:
+                continue
+            payloads[item_id] = item
+            hashes[item_id] = item_hash
+            changed += 1
+        return changed
+
+    def pending(self, entity: str) -> List[Any]:
+        """Distinct payloads of an entity, ordered by id for a stable write order."""
+        payloads = self._payloads.get(entity, {})
+        return [payloads[item_id] for item_id in sorted(payloads, key=lambda i: i or 0)]
+
+    def sources(self, entity: str) -> Dict[int, int]:
+        """Number of items fetched per source competition for an entity."""
+        return dict(self._sources.get(entity, {}))
+
+    def stats(self, entity: str) -> Dict[str, float]:
+        """Deduplication statistics for an entity.
+
+        Returns:
+            Dictionary with items seen, unique items and the share of redundant writes avoided
+        """
+        seen = self._seen.get(entity, 0)
+        unique = len(self._payloads.get(entity, {}))
+        return {
+            'seen': seen,
+            'unique': unique,
+            'dedup_ratio': round((seen - unique) / seen, 4) if seen else 0.0,
+        }
+
+    def log_stats(self):
+        """Log deduplication statistics for every registered entity."""
+        for entity in self._payloads:
+            stats = self.stats(entity)
+            logger.info(
+                f"{entity}: {stats['seen']} fetched, {stats['unique']} unique, "
+                f"{stats['dedup_ratio']:.1%} redundant upserts skipped"
+            )
@@ -0,0 +1,66 @@
+"""Export the Postgres raw schema to Parquet/JSON extracts for the local DuckDB dbt target."""
+
+import os
+import sys
+import argparse
+import logging
+
+import duckdb
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+RAW_TABLES = ['competitions', 'teams', 'matches', 'standings']
+
+
+def export_raw_extracts(output_dir: str, file_format: str = 'parquet') -> None:
+    """Copy every raw table from Postgres into `<output_dir>/<table>.<format>`.
+
+    Args:
+        output_dir: Directory to write the extract files into
+        file_format: Either 'parquet' or 'json'
+    """
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    db = os.getenv('POSTGRES_DB', 'football_analytics')
+    user = os.getenv('POSTGRES_USER', 'airflow')
+    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    con = duckdb.connect()
+    con.execute("install postgres")
+    con.execute("load postgres")
+    con.execute(
+        f"attach 'host={host} port={port} dbname={db} user={user} password={password}' "
+        "as warehouse (type postgres, read_only)"
+    )
+
+    for table in RAW_TABLES:
+        path = os.path.join(output_dir, f'{table}.{file_format}')
+        con.execute(f"copy (select * from warehouse.raw.{table}) to '{path}' (format {file_format})")
+        logger.info(f"Exported raw.{table} to {path}")
+
+    con.close()
+
+
+def main():
+    """Export raw extracts for local dbt development."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output-dir', default=os.path.join('dbt_football', 'data', 'raw'))
+    parser.add_argument('--format', choices=['parquet', 'json'], default='parquet')
+    args = parser.parse_args()
+
+    try:
+        export_raw_extracts(args.output_dir, args.format)
+    except Exception as e:
+        logger.error(f"Export failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
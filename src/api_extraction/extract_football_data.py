@@ -2,12 +2,17 @@
 
 import os
 import sys
+import threading
 from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 import logging
 
 from football_api_client import FootballAPIClient
-from database_loader import DatabaseLoader
+from database_loader import DatabaseLoader, create_database_loader
+from rate_limiter import ApiKeyPool
+from entity_registry import EntityRegistry
+from spool import PayloadSpool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,6 +20,28 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Major European competitions
+# Premier League (PL), La Liga (PD), Bundesliga (BL1), Serie A (SA), Ligue 1 (FL1)
+# Champions League (CL), Europa League (EL)
+MAJOR_COMPETITION_IDS = [
+    2021,  # Premier League
+    2014,  # La Liga
+    2002,  # Bundesliga
+    2019,  # Serie A
+    2015,  # Ligue 1
+    2001,  # Champions League
+    2146,  # Europa League (UEFA Europa League)
+]
+
+# Entities fetched per competition, in fetch order
+ENTITIES = ('teams', 'standings', 'matches')
+
+# Current-season snapshots; the API serves them regardless of the date range
+SNAPSHOT_ENTITIES = ('teams', 'standings')
+
+# Entities returned by several competitions; loaded once per run after deduplication
+SHARED_ENTITIES = ('teams',)
+
 
 def extract_competitions(api_client: FootballAPIClient, db_loader: DatabaseLoader):
     """Extract and load competitions data.
@@ -29,72 +56,468 @@ def extract_competitions(api_client: FootballAPIClient, db_loader: DatabaseLoade
     logger.info(f"Successfully extracted and loaded {count} competitions")
 
 
+def _match_window() -> Tuple[str, str]:
+    """Default date range for match extraction: last 30 days and next 30 days."""
+    date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+    date_to = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+    return date_from, date_to
+
+
+def match_window_for_interval(
+    interval_start: datetime,
+    interval_end: datetime,
+    lookahead_days: int = 0
+) -> Tuple[str, str]:
+    """Date range for match extraction covering a scheduler data interval.
+
+    The API filters on whole days, so the range spans every day the interval
+    touches; adjacent intervals overlap by a day, which the upserts absorb.
+
+    Args:
+        interval_start: Start of the data interval
+        interval_end: End of the data interval
+        lookahead_days: Extra days after the interval to pick up upcoming fixtures
+
+    Returns:
+        Tuple of (date_from, date_to) as YYYY-MM-DD strings
+    """
+    date_from = interval_start.strftime('%Y-%m-%d')
+    date_to = (interval_end + timedelta(days=lookahead_days)).strftime('%Y-%m-%d')
+    return date_from, date_to
+
+
+def _fetch_payloads(
+    api_client: FootballAPIClient,
+    comp_id: int,
+    date_from: str,
+    date_to: str,
+    entities: Sequence[str] = ENTITIES
+) -> Iterator[Tuple[str, Any]]:
+    """Fetch teams, standings and matches for a competition, one entity at a time.
+
+    Args:
+        api_client: Football API client
+        comp_id: Competition ID
+        date_from: Start date for matches (YYYY-MM-DD)
+        date_to: End date for matches (YYYY-MM-DD)
+        entities: Entities to fetch
+
+    Yields:
+        Tuples of (entity name, API payload)
+    """
+    if 'teams' in entities:
+        yield 'teams', api_client.get_competition_teams(comp_id)
+    if 'standings' in entities:
+        yield 'standings', api_client.get_competition_standings(comp_id)
+    if 'matches' in entities:
+        yield 'matches', api_client.get_competition_matches(
+            comp_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+
+
+def _planned_entities(
+    comp_id: int,
+    plan: Optional[Dict[int, List[str]]],
+    include_snapshots: bool
+) -> Tuple[str, ...]:
+    """Entities to fetch for a competition, as planned or all of them without a plan."""
+    entities = plan.get(comp_id, ()) if plan is not None else ENTITIES
+    return tuple(
+        entity for entity in ENTITIES
+        if entity in entities and (include_snapshots or entity not in SNAPSHOT_ENTITIES)
+    )
+
+
+def _flush_registry(
+    db_loader: DatabaseLoader,
+    registry: EntityRegistry,
+    raise_errors: bool = False
+) -> List[Tuple[int, str, int]]:
+    """Write the deduplicated shared entities of a run in one batch per entity.
+
+    Args:
+        db_loader: Database loader
+        registry: Registry filled during the run
+        raise_errors: Raise load failures instead of logging them and moving on
+
+    Returns:
+        Extraction log entries for the competitions whose entities were written
+    """
+    extracted = []
+    for entity in SHARED_ENTITIES:
+        items = registry.pending(entity)
+        if not items:
+            continue
+        try:
+            count = db_loader.load_entity(entity, items)
+            logger.info(f"Loaded {count} {entity} shared across competitions")
+            extracted.extend((comp_id, entity, n) for comp_id, n in registry.sources(entity).items())
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Error loading {entity}: {str(e)}")
+    registry.log_stats()
+    return extracted
+
+
+def _record_extractions(db_loader: DatabaseLoader, extracted: List[Tuple[int, str, int]]):
+    """Write the run's extraction log; a failure only costs the next run's planning."""
+    try:
+        db_loader.record_extractions(extracted)
+    except Exception as e:
+        logger.error(f"Error recording extraction log: {str(e)}")
+
+
 def extract_competition_data(
     api_client: FootballAPIClient,
     db_loader: DatabaseLoader,
-    competition_ids: list
-):
+    competition_ids: list,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    include_snapshots: bool = True,
+    plan: Optional[Dict[int, List[str]]] = None,
+    spool: Optional[PayloadSpool] = None,
+    max_pending: int = 2
+) -> int:
     """Extract teams, matches, and standings for specified competitions.
 
+    Payloads are fetched into the spool while a loader thread loads each
+    competition into Postgres (SpoolLoader) as soon as all of it is spooled, so
+    fetching and loading overlap and a run takes roughly as long as the slower
+    of the two. When the database falls behind by max_pending competitions,
+    fetching waits for it. Teams are written once, when fetching is done. A
+    competition that fails to fetch or load is logged and skipped; what was
+    not loaded stays in the spool for the next drain (the DAG's load_spool
+    task or `spool.py drain`).
+
     Args:
-        api_client: Football API client
+        api_client: Football API client returning dictionaries (as_records=False)
         db_loader: Database loader
         competition_ids: List of competition IDs to extract
+        date_from: Start date for matches (defaults to 30 days ago)
+        date_to: End date for matches (defaults to 30 days ahead)
+        include_snapshots: Whether to also refresh teams and standings
+        plan: Entities to fetch per competition (see RefreshPlanner); without
+            a plan every entity is fetched
+        spool: Spool to fetch into (defaults to FOOTBALL_SPOOL_DIR)
+        max_pending: Competitions that may be spooled but not yet loaded
+            before fetching waits
+
+    Returns:
+        Number of payloads spooled
     """
-    for comp_id in competition_ids:
-        try:
-            logger.info(f"Extracting data for competition {comp_id}...")
-
-            # Extract teams
-            teams = api_client.get_competition_teams(comp_id)
-            teams_count = db_loader.load_teams(teams)
-            logger.info(f"Loaded {teams_count} teams for competition {comp_id}")
-
-            # Extract standings
-            standings = api_client.get_competition_standings(comp_id)
-            standings_count = db_loader.load_standings(standings, comp_id)
-            logger.info(f"Loaded {standings_count} standings for competition {comp_id}")
-
-            # Extract matches (last 30 days and next 30 days)
-            date_from = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-            date_to = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-            matches = api_client.get_competition_matches(
-                comp_id,
-                date_from=date_from,
-                date_to=date_to
-            )
-            matches_count = db_loader.load_matches(matches)
-            logger.info(f"Loaded {matches_count} matches for competition {comp_id}")
+    if api_client.as_records:
+        raise ValueError("The spool stores API payloads; use a client with as_records=False")
+    if not (date_from and date_to):
+        date_from, date_to = _match_window()
+    spool = spool or PayloadSpool()
+
+    # Last record of each completely spooled competition (the first entry
+    # covers records left over from earlier runs)
+    competition_ends = [spool.last_seq()]
+    loaded_up_to = spool.get_offset('database_loader')
+    progress = threading.Condition()
+    loading = True
+    done = False
 
+    def pending() -> int:
+        return sum(end > loaded_up_to for end in competition_ends)
+
+    def drain():
+        nonlocal loaded_up_to, loading
+        try:
+            with spool.consumer_lock('database_loader'):
+                loader = SpoolLoader(db_loader, spool)
+                while True:
+                    with progress:
+                        progress.wait_for(lambda: done or competition_ends[-1] > loader.position)
+                        # One competition at a time, so fetching resumes as soon as one is in
+                        up_to = next((end for end in competition_ends if end > loader.position), loader.position)
+                        last_pass = done and up_to >= competition_ends[-1]
+                    loader.load(up_to_seq=up_to)
+                    with progress:
+                        loaded_up_to = loader.position
+                        progress.notify_all()
+                    if last_pass:
+                        break
+                loader.finish()
         except Exception as e:
-            logger.error(f"Error extracting data for competition {comp_id}: {str(e)}")
+            logger.error(f"Loading the spool failed, the rest stays spooled for the next drain: {str(e)}")
+        finally:
+            with progress:
+                loading = False
+                progress.notify_all()
+
+    loader_thread = threading.Thread(target=drain, name='spool-loader')
+    loader_thread.start()
+    spooled = 0
+    try:
+        for comp_id in competition_ids:
+            entities = _planned_entities(comp_id, plan, include_snapshots)
+            if not entities:
+                logger.info(f"Nothing to refresh for competition {comp_id}")
+                continue
+            with progress:
+                # Backpressure: the database may fall at most max_pending competitions behind
+                progress.wait_for(lambda: not loading or pending() < max_pending)
+            spooled += _spool_competition(api_client, spool, comp_id, entities, date_from, date_to)
+            with progress:
+                competition_ends.append(spool.last_seq())
+                progress.notify_all()
+    finally:
+        with progress:
+            done = True
+            progress.notify_all()
+        loader_thread.join()
+
+    api_client.log_stats()
+    return spooled
+
+
+def _spool_competition(
+    api_client: FootballAPIClient,
+    spool: PayloadSpool,
+    comp_id: int,
+    entities: Sequence[str],
+    date_from: str,
+    date_to: str
+) -> int:
+    """Fetch a competition's entities into the spool; a failed fetch skips the rest of them."""
+    spooled = 0
+    try:
+        logger.info(f"Extracting {', '.join(entities)} for competition {comp_id}...")
+        for entity, payload in _fetch_payloads(api_client, comp_id, date_from, date_to, entities):
+            seq = spool.append(entity, payload, competition_id=comp_id, date_from=date_from, date_to=date_to)
+            spooled += 1
+            logger.info(f"Spooled {entity} for competition {comp_id} as record {seq}")
+    except Exception as e:
+        logger.error(f"Error extracting data for competition {comp_id}: {str(e)}")
+    return spooled
+
+
+def spool_competition_data(
+    api_client: FootballAPIClient,
+    spool: PayloadSpool,
+    competition_ids: list,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    include_snapshots: bool = True,
+    plan: Optional[Dict[int, List[str]]] = None
+) -> int:
+    """Fetch competition data into the spool without touching the database.
+
+    Each payload is durably appended as soon as it is fetched, so nothing
+    fetched is lost if loading later fails; load_spool writes it to Postgres.
+    A failed fetch is logged and only skips the rest of that competition.
+
+    Args:
+        api_client: Football API client returning dictionaries (as_records=False),
+            the form payloads are stored in
+        spool: Spool to append payloads to
+        competition_ids: List of competition IDs to extract
+        date_from: Start date for matches (defaults to 30 days ago)
+        date_to: End date for matches (defaults to 30 days ahead)
+        include_snapshots: Whether to also refresh teams and standings
+        plan: Entities to fetch per competition (see RefreshPlanner); without
+            a plan every entity is fetched
+
+    Returns:
+        Number of payloads spooled
+    """
+    if api_client.as_records:
+        raise ValueError("The spool stores API payloads; use a client with as_records=False")
+    if not (date_from and date_to):
+        date_from, date_to = _match_window()
+
+    spooled = 0
+    for comp_id in competition_ids:
+        entities = _planned_entities(comp_id, plan, include_snapshots)
+        if not entities:
+            logger.info(f"Nothing to refresh for competition {comp_id}")
             continue
+        spooled += _spool_competition(api_client, spool, comp_id, entities, date_from, date_to)
+
+    api_client.log_stats()
+    return spooled
+
+
+def _competition_batches(records: Iterable[Dict]) -> Iterator[List[Dict]]:
+    """Group spool records into runs of consecutive records of the same competition."""
+    batch: List[Dict] = []
+    for record in records:
+        if batch and record['competition_id'] != batch[0]['competition_id']:
+            yield batch
+            batch = []
+        batch.append(record)
+    if batch:
+        yield batch
+
+
+class SpoolLoader:
+    """Loads spooled payloads into Postgres for one run, a competition at a time.
+
+    Teams are collected in one EntityRegistry for the whole run and written
+    once by finish(), so clubs playing in several competitions are upserted
+    once per run. A competition that fails to load is logged and skipped, and
+    the others still load. The consumer's offset only covers records that are
+    in the database: it stops before the first team record still waiting in
+    the registry and before the first competition that failed, so the next
+    drain reloads from there.
+    """
+
+    def __init__(self, db_loader: DatabaseLoader, spool: PayloadSpool, consumer: str = 'database_loader'):
+        """Initialize the loader at the consumer's offset.
+
+        Args:
+            db_loader: Database loader
+            spool: Spool to drain
+            consumer: Name the offset is tracked under
+        """
+        self.db_loader = db_loader
+        self.spool = spool
+        self.consumer = consumer
+        self.registry = EntityRegistry()
+        self.position = spool.get_offset(consumer)
+        self.loaded = 0
+        self.failed: List[int] = []
+        # First team record not written yet and first record of a failed
+        # competition; the offset must stay before both
+        self._teams_from: Optional[int] = None
+        self._failed_from: Optional[int] = None
+
+    def load(self, up_to_seq: Optional[int] = None) -> int:
+        """Load the records after the current position, one competition per load_batch.
+
+        spool_competition_data appends a competition's payloads one after the
+        other, and each such run is passed to db_loader.load_batch as a whole,
+        so a competition's standings and matches are loaded in a single
+        transaction on backends that support it.
+
+        Args:
+            up_to_seq: Last record to load (defaults to the newest one); pass the
+                end of a competition so none is loaded in parts
+
+        Returns:
+            Number of records loaded
+        """
+        up_to_seq = self.spool.last_seq() if up_to_seq is None else up_to_seq
+        if up_to_seq <= self.position:
+            return 0
+
+        loaded = 0
+        records = self.spool.read(after_seq=self.position, limit=up_to_seq - self.position)
+        for batch in _competition_batches(records):
+            self._load_competition(batch)
+            loaded += len(batch)
+            logger.info(f"Loaded spool records up to {self.position} ({self.spool.last_seq() - self.position} left)")
+        self.loaded += loaded
+        return loaded
+
+    def _load_competition(self, batch: List[Dict]):
+        """Load one competition's records and register its teams."""
+        comp_id = batch[0]['competition_id']
+        entries = []
+        for record in batch:
+            if record['entity'] in SHARED_ENTITIES:
+                self.registry.add(record['entity'], record['payload'], source=comp_id)
+                if self._teams_from is None:
+                    self._teams_from = record['seq']
+                continue
+            entries.append((record['entity'], comp_id, record['payload']))
+
+        if entries:
+            try:
+                counts = self.db_loader.load_batch(entries)
+                extracted = []
+                for (entity, _, _), count in zip(entries, counts):
+                    extracted.append((comp_id, entity, count))
+                    logger.info(f"Loaded {count} {entity} for competition {comp_id}")
+                _record_extractions(self.db_loader, extracted)
+            except Exception as e:
+                logger.error(
+                    f"Error loading spool records {batch[0]['seq']} to {batch[-1]['seq']} "
+                    f"for competition {comp_id}: {str(e)}"
+                )
+                self.failed.append(comp_id)
+                if self._failed_from is None:
+                    self._failed_from = batch[0]['seq']
+
+        self.position = batch[-1]['seq']
+        self._commit_offset()
+
+    def _commit_offset(self):
+        """Advance the consumer's offset to the last record that is in the database."""
+        blocked = [seq for seq in (self._teams_from, self._failed_from) if seq is not None]
+        offset = min(blocked) - 1 if blocked else self.position
+        if offset > self.spool.get_offset(self.consumer):
+            self.spool.commit_offset(self.consumer, offset)
+
+    def finish(self):
+        """Write the run's deduplicated teams and advance the offset past them.
+
+        Raises:
+            RuntimeError: If any competition failed to load; it stays spooled
+        """
+        _record_extractions(self.db_loader, _flush_registry(self.db_loader, self.registry, raise_errors=True))
+        self.registry = EntityRegistry()
+        self._teams_from = None
+        self._commit_offset()
+        logger.info(f"Loaded {self.loaded} spooled records")
+        if self.failed:
+            raise RuntimeError(
+                f"Competitions {', '.join(map(str, self.failed))} could not be loaded; "
+                f"they stay spooled from record {self._failed_from}"
+            )
+
+
+def load_spool(
+    db_loader: DatabaseLoader,
+    spool: PayloadSpool,
+    consumer: str = 'database_loader'
+) -> int:
+    """Load spooled payloads the consumer has not loaded yet.
+
+    Records are loaded in spool order, one competition at a time, with teams
+    deduplicated across all of them (see SpoolLoader). A competition that
+    fails to load does not stop the others, but the drain raises once they
+    are loaded and the offset stays at the first record not in the database,
+    so a retried drain resumes from there. Every load is an upsert (or a replace, for
+    standings), which makes reloading records after a crash, or replaying a
+    rewound spool, harmless.
+
+    Args:
+        db_loader: Database loader
+        spool: Spool to drain
+        consumer: Name the offset is tracked under
+
+    Returns:
+        Number of records loaded
+    """
+    with spool.consumer_lock(consumer):
+        loader = SpoolLoader(db_loader, spool, consumer)
+        loader.load()
+        loader.finish()
+    return loader.loaded
 
 
 def main():
     """Main extraction workflow."""
     try:
         # Initialize clients
-        api_client = FootballAPIClient()
-        db_loader = DatabaseLoader()
+        db_loader = create_database_loader()
+        api_client = FootballAPIClient(key_pool=ApiKeyPool.from_env(db_loader.engine))
+        spool = PayloadSpool()
 
         # Extract all competitions first
         extract_competitions(api_client, db_loader)
 
-        # Extract detailed data for major European competitions
-        # Premier League (PL), La Liga (PD), Bundesliga (BL1), Serie A (SA), Ligue 1 (FL1)
-        # Champions League (CL), Europa League (EL)
-        major_competition_ids = [
-            2021,  # Premier League
-            2014,  # La Liga
-            2002,  # Bundesliga
-            2019,  # Serie A
-            2015,  # Ligue 1
-            2001,  # Champions League
-            2146,  # Europa League (UEFA Europa League)
-        ]
-
-        extract_competition_data(api_client, db_loader, major_competition_ids)
+        # Spool detailed data for major European competitions, loading it as it
+        # arrives; the final drain raises if anything could not be loaded, which
+        # can then be retried with `python3 spool.py drain`
+        extract_competition_data(api_client, db_loader, MAJOR_COMPETITION_IDS, spool=spool)
+        load_spool(db_loader, spool)
 
         logger.info("Data extraction completed successfully!")
 
@@ -3,10 +3,14 @@
 import os
 import requests
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime, timedelta
 import logging
 
+from records import Competition, Team, Match, Standing
+from rate_limiter import ApiKeyPool
+from resilience import TailLatencyGuard
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -14,28 +18,58 @@ logger = logging.getLogger(__name__)
 class FootballAPIClient:
     """Client for interacting with Football-Data.org API."""
 
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        as_records: bool = False,
+        key_pool: Optional[ApiKeyPool] = None,
+        guard: Optional[TailLatencyGuard] = None
+    ):
         """Initialize the API client.
 
         Args:
             api_key: API key for Football-Data.org
             base_url: Base URL for the API
+            as_records: Return Competition/Team/Match/Standing records instead of raw dictionaries
+            key_pool: Shared, rate-limited pool of API keys; each request waits for a
+                key with budget left instead of using api_key
+            guard: Timeouts, hedging, retries and circuit breaker for requests
+                (defaults to one configured from the environment)
         """
         self.api_key = api_key or os.getenv('FOOTBALL_API_KEY')
         self.base_url = base_url or os.getenv('FOOTBALL_API_BASE_URL', 'https://api.football-data.org/v4')
+        self.as_records = as_records
+        self.key_pool = key_pool
+        self.guard = guard or TailLatencyGuard.from_env()
 
-        if not self.api_key:
+        if not self.api_key and not self.key_pool:
             raise ValueError("FOOTBALL_API_KEY must be provided or set in environment")
 
-        self.headers = {
-            'X-Auth-Token': self.api_key
-        }
         self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        if not self.key_pool:
+            self.headers = {
+                'X-Auth-Token': self.api_key
+            }
+            self.session.headers.update(self.headers)
+
+    def _auth_headers(self, blocking: bool = True) -> Optional[Dict[str, str]]:
+        """Headers for one request with a key from the pool (session headers otherwise).
+
+        Args:
+            blocking: Wait for a key with budget left; otherwise raise TimeoutError
+                unless one is available right now
+        """
+        if not self.key_pool:
+            return None
+        return {'X-Auth-Token': self.key_pool.acquire(timeout=None if blocking else 0)}
 
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make a request to the API with rate limiting and error handling.
 
+        Timeouts, hedging, retries of server errors and failing fast while the
+        API is down are left to the guard (see resilience.py).
+
         Args:
             endpoint: API endpoint to call
             params: Query parameters
@@ -46,7 +80,7 @@ class FootballAPIClient:
         url = f"{self.base_url}/{endpoint}"
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.guard.get(self.session, url, endpoint, params=params, auth=self._auth_headers)
 
             # Handle rate limiting
             if response.status_code == 429:
@@ -62,17 +96,28 @@ class FootballAPIClient:
             logger.error(f"API request failed for {endpoint}: {str(e)}")
             raise
 
-    def get_competitions(self) -> List[Dict]:
+    def log_stats(self):
+        """Log request latencies, hedges, retries and circuit breaker state per endpoint."""
+        self.guard.log_stats()
+
+    def get_competitions(self) -> List[Union[Dict, Competition]]:
         """Get all available competitions.
 
         Returns:
-            List of competition dictionaries
+            List of competition dictionaries (or records)
         """
         logger.info("Fetching competitions...")
         data = self._make_request('competitions')
-        return data.get('competitions', [])
+        competitions = data.get('competitions', [])
+        if self.as_records:
+            return [Competition.from_api(comp) for comp in competitions]
+        return competitions
 
-    def get_competition_standings(self, competition_id: int, season: Optional[int] = None) -> Dict:
+    def get_competition_standings(
+        self,
+        competition_id: int,
+        season: Optional[int] = None
+    ) -> Union[Dict, List[Standing]]:
         """Get standings for a specific competition.
 
         Args:
@@ -80,14 +125,17 @@ class FootballAPIClient:
             season: Season year (defaults to current)
 
         Returns:
-            Standings data
+            Standings data (or one record per table entry)
         """
         logger.info(f"Fetching standings for competition {competition_id}...")
         endpoint = f'competitions/{competition_id}/standings'
         params = {'season': season} if season else None
-        return self._make_request(endpoint, params)
+        data = self._make_request(endpoint, params)
+        if self.as_records:
+            return Standing.from_api(data, competition_id)
+        return data
 
-    def get_competition_teams(self, competition_id: int, season: Optional[int] = None) -> List[Dict]:
+    def get_competition_teams(self, competition_id: int, season: Optional[int] = None) -> List[Union[Dict, Team]]:
         """Get teams in a competition.
 
         Args:
@@ -95,13 +143,16 @@ class FootballAPIClient:
             season: Season year (defaults to current)
 
         Returns:
-            List of team dictionaries
+            List of team dictionaries (or records)
         """
         logger.info(f"Fetching teams for competition {competition_id}...")
         endpoint = f'competitions/{competition_id}/teams'
         params = {'season': season} if season else None
         data = self._make_request(endpoint, params)
-        return data.get('teams', [])
+        teams = data.get('teams', [])
+        if self.as_records:
+            return [Team.from_api(team) for team in teams]
+        return teams
 
     def get_competition_matches(
         self,
@@ -110,7 +161,7 @@ class FootballAPIClient:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         status: Optional[str] = None
-    ) -> List[Dict]:
+    ) -> List[Union[Dict, Match]]:
         """Get matches for a competition.
 
         Args:
@@ -121,7 +172,7 @@ class FootballAPIClient:
             status: Match status (SCHEDULED, LIVE, IN_PLAY, PAUSED, FINISHED, etc.)
 
         Returns:
-            List of match dictionaries
+            List of match dictionaries (or records)
         """
         logger.info(f"Fetching matches for competition {competition_id}...")
         endpoint = f'competitions/{competition_id}/matches'
@@ -137,7 +188,47 @@ class FootballAPIClient:
             params['status'] = status
 
         data = self._make_request(endpoint, params)
-        return data.get('matches', [])
+        return self._matches(data)
+
+    def get_matches(
+        self,
+        competition_ids: Optional[List[int]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[Union[Dict, Match]]:
+        """Get matches across several competitions in a single request.
+
+        Args:
+            competition_ids: IDs of the competitions to include (defaults to all available)
+            date_from: Start date (YYYY-MM-DD)
+            date_to: End date (YYYY-MM-DD)
+            status: Match status (SCHEDULED, LIVE, IN_PLAY, PAUSED, FINISHED, etc.)
+
+        Returns:
+            List of match dictionaries (or records)
+        """
+        logger.info(f"Fetching matches with status {status or 'ANY'}...")
+
+        params = {}
+        if competition_ids:
+            params['competitions'] = ','.join(str(c) for c in competition_ids)
+        if date_from:
+            params['dateFrom'] = date_from
+        if date_to:
+            params['dateTo'] = date_to
+        if status:
+            params['status'] = status
+
+        data = self._make_request('matches', params)
+        return self._matches(data)
+
+    def _matches(self, data: Dict) -> List[Union[Dict, Match]]:
+        """Matches of a list response, as records when configured."""
+        matches = data.get('matches', [])
+        if self.as_records:
+            return [Match.from_api(match) for match in matches]
+        return matches
 
     def get_team(self, team_id: int) -> Dict:
         """Get detailed information about a team.
@@ -158,7 +249,7 @@ class FootballAPIClient:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         status: Optional[str] = None
-    ) -> List[Dict]:
+    ) -> List[Union[Dict, Match]]:
         """Get matches for a specific team.
 
         Args:
@@ -169,7 +260,7 @@ class FootballAPIClient:
             status: Match status
 
         Returns:
-            List of match dictionaries
+            List of match dictionaries (or records)
         """
         logger.info(f"Fetching matches for team {team_id}...")
         endpoint = f'teams/{team_id}/matches'
@@ -185,16 +276,19 @@ class FootballAPIClient:
             params['status'] = status
 
         data = self._make_request(endpoint, params)
-        return data.get('matches', [])
+        return self._matches(data)
 
-    def get_match(self, match_id: int) -> Dict:
+    def get_match(self, match_id: int) -> Union[Dict, Match]:
         """Get detailed information about a specific match.
 
         Args:
             match_id: ID of the match
 
         Returns:
-            Match data dictionary
+            Match data dictionary (or record)
         """
         logger.info(f"Fetching match {match_id}...")
-        return self._make_request(f'matches/{match_id}')
+        match = self._make_request(f'matches/{match_id}')
+        if self.as_records:
+            return Match.from_api(match)
+        return match
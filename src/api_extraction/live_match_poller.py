@@ -0,0 +1,154 @@
+"""Low-latency poller for in-play matches.
+
+Runs alongside the daily Airflow DAG and keeps score fields of live matches in
+raw.matches fresh within a poll interval. It makes one API request per poll for
+all tracked competitions, writes only matches whose score changed, and never
+triggers an analytics rebuild.
+"""
+
+import os
+import sys
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from football_api_client import FootballAPIClient
+from database_loader import DatabaseLoader
+from rate_limiter import ApiKeyPool
+from extract_football_data import MAJOR_COMPETITION_IDS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# The API treats LIVE as IN_PLAY + PAUSED
+LIVE_STATUS = 'LIVE'
+
+
+class LiveMatchPoller:
+    """Poll in-play matches and upsert their changed scores."""
+
+    def __init__(
+        self,
+        api_client: FootballAPIClient,
+        db_loader: DatabaseLoader,
+        competition_ids: List[int],
+        requests_per_minute: int = 10,
+        budget_share: float = 0.5,
+        idle_interval: float = 300.0
+    ):
+        """Initialize the poller.
+
+        Args:
+            api_client: Football API client
+            db_loader: Database loader
+            competition_ids: Competitions to watch
+            requests_per_minute: API rate limit for the key in use
+            budget_share: Fraction of the rate limit the poller may spend
+            idle_interval: Seconds to sleep when nothing is live or about to kick off
+        """
+        self.api_client = api_client
+        self.db_loader = db_loader
+        self.competition_ids = competition_ids
+        self.poll_interval = 60.0 / max(requests_per_minute * budget_share, 1e-6)
+        self.idle_interval = idle_interval
+        self._scores: Dict[int, Tuple] = {}
+
+    @staticmethod
+    def _score_key(match: Dict) -> Tuple:
+        """Fields whose change warrants a write."""
+        score = match.get('score', {})
+        full_time = score.get('fullTime', {})
+        half_time = score.get('halfTime', {})
+        return (
+            match.get('status'),
+            full_time.get('home'),
+            full_time.get('away'),
+            half_time.get('home'),
+            half_time.get('away'),
+        )
+
+    def poll_once(self) -> int:
+        """Fetch live matches once and write the ones that changed.
+
+        Matches that dropped out of the live set since the previous poll are
+        fetched individually once, so their final score is stored too.
+
+        Returns:
+            Number of matches written
+        """
+        live_matches = self.api_client.get_matches(self.competition_ids, status=LIVE_STATUS)
+        live_ids = {match['id'] for match in live_matches}
+
+        finished = [
+            self.api_client.get_match(match_id)
+            for match_id in self._scores
+            if match_id not in live_ids
+        ]
+
+        changed = []
+        for match in live_matches + finished:
+            key = self._score_key(match)
+            if self._scores.get(match['id']) != key:
+                changed.append(match)
+            self._scores[match['id']] = key
+
+        for match in finished:
+            self._scores.pop(match['id'], None)
+
+        written = self.db_loader.update_match_scores(changed) if changed else 0
+        logger.info(f"{len(live_matches)} live matches, {written} updated")
+        return written
+
+    def _next_interval(self) -> float:
+        """Poll fast while matches are live, otherwise sleep until the next kickoff."""
+        if self._scores:
+            return self.poll_interval
+
+        next_kickoff: Optional[datetime] = self.db_loader.get_next_kickoff(self.competition_ids)
+        if next_kickoff is None:
+            return self.idle_interval
+
+        until_kickoff = (next_kickoff - datetime.utcnow()).total_seconds()
+        return min(max(until_kickoff, self.poll_interval), self.idle_interval)
+
+    def run(self):
+        """Poll until interrupted."""
+        logger.info(
+            f"Polling live matches for {len(self.competition_ids)} competitions "
+            f"every {self.poll_interval:.0f}s while in play"
+        )
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Live poll failed: {str(e)}")
+            time.sleep(self._next_interval())
+
+
+def main():
+    """Run the live match poller."""
+    try:
+        db_loader = DatabaseLoader()
+        poller = LiveMatchPoller(
+            FootballAPIClient(key_pool=ApiKeyPool.from_env(db_loader.engine)),
+            db_loader,
+            MAJOR_COMPETITION_IDS,
+            requests_per_minute=int(os.getenv('FOOTBALL_API_REQUESTS_PER_MINUTE', '10')),
+            budget_share=float(os.getenv('LIVE_POLL_BUDGET_SHARE', '0.5')),
+        )
+        poller.run()
+    except KeyboardInterrupt:
+        logger.info("Live poller stopped")
+    except Exception as e:
+        logger.error(f"Live poller failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""psycopg 3 loader backend with prepared upserts and pipeline mode.
+
+DatabaseLoader builds, compiles and executes a fresh SQLAlchemy upsert per
+call, each in its own transaction, waiting on every round trip (BEGIN, the
+statement, COMMIT). PipelinedDatabaseLoader keeps one psycopg 3 connection per
+thread, sends the same upsert text every time so the server-side prepared
+statement is reused, and queues all statements of a batch in pipeline mode
+behind a single sync, so a competition's standings and matches cost about one
+round trip and one transaction.
+
+Table creation and everything else not on the load path is inherited.
+"""
+
+import threading
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import psycopg
+from psycopg import sql
+from psycopg.types.json import Json
+from sqlalchemy import JSON
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import make_url
+
+from database_loader import DatabaseLoader
+from records import Competition, Team, Match, Standing, to_records
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PipelinedDatabaseLoader(DatabaseLoader):
+    """DatabaseLoader whose load_* methods use psycopg 3 pipelines."""
+
+    def __init__(self, connection_string: str = None):
+        """Initialize the loader.
+
+        Args:
+            connection_string: PostgreSQL connection string
+        """
+        super().__init__(connection_string)
+        # libpq does not understand SQLAlchemy's "+driver" suffix
+        self.conninfo = make_url(self.connection_string).set(drivername='postgresql').render_as_string(
+            hide_password=False
+        )
+        self._local = threading.local()
+        self._connections: List[psycopg.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._upserts = {
+            'competitions': self._upsert_sql(self.competitions_table),
+            'teams': self._upsert_sql(self.teams_table),
+            'matches': self._upsert_sql(self.matches_table),
+        }
+        self._standings_columns = [c.name for c in self.standings_table.columns if c.name != 'id']
+        self._standings_insert = self._insert_sql(self.standings_table, self._standings_columns).as_string(None)
+        self._standings_delete = "delete from raw.standings where competition_id = %s and season_id = %s"
+        self._json_columns = {
+            c.name for table in self.metadata.tables.values() for c in table.columns if isinstance(c.type, JSON)
+        }
+
+    @staticmethod
+    def _insert_sql(table, columns: List[str]) -> sql.Composed:
+        """Insert of a whole batch, passed as one array parameter per column.
+
+        Unnesting arrays keeps the statement text (and so the prepared
+        statement) the same for any number of rows, and makes a batch a single
+        statement, so the raw tables' statement-level triggers fire once.
+        """
+        column_types = {c.name: c.type.compile(dialect=postgresql.dialect()) for c in table.columns}
+        return sql.SQL("insert into {table} ({columns}) select * from unnest({arrays})").format(
+            table=sql.Identifier(table.schema, table.name),
+            columns=sql.SQL(', ').join(sql.Identifier(c) for c in columns),
+            arrays=sql.SQL(', ').join(
+                sql.SQL("{}::{}[]").format(sql.Placeholder(), sql.SQL(column_types[c])) for c in columns
+            ),
+        )
+
+    def _upsert_sql(self, table) -> Tuple[List[str], str]:
+        """Column order and text of a batch upsert on the table's id."""
+        columns = [c.name for c in table.columns]
+        query = sql.SQL("{insert} on conflict (id) do update set {updates}").format(
+            insert=self._insert_sql(table, columns),
+            updates=sql.SQL(', ').join(
+                sql.SQL("{0} = excluded.{0}").format(sql.Identifier(c)) for c in columns if c != 'id'
+            ),
+        )
+        # Render once: an identical query string is what lets psycopg reuse the prepared statement
+        return columns, query.as_string(None)
+
+    def _connection(self) -> psycopg.Connection:
+        """This thread's connection, reopened if it was closed or broke."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.closed or conn.broken:
+            # prepare_threshold=0 prepares every statement on its first execution
+            conn = psycopg.connect(self.conninfo, autocommit=True, prepare_threshold=0)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection opened by this loader."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _arrays(self, rows: List[Dict[str, Any]], columns: List[str]) -> List[List[Any]]:
+        """One array of values per column, in column order."""
+        return [
+            [Json(row[c]) for row in rows] if c in self._json_columns else [row[c] for row in rows]
+            for c in columns
+        ]
+
+    def _queue(self, cur: psycopg.Cursor, entity: str, payload: Any, competition_id: Optional[int],
+               extracted_at: datetime) -> int:
+        """Queue the statements loading one payload on a pipelined cursor."""
+        if entity == 'standings':
+            standings = (
+                Standing.from_api(payload, competition_id) if isinstance(payload, dict) else payload
+            )
+            if not standings:
+                logger.warning("No standings to load")
+                return 0
+            # Replace the competition's table for the season, as load_standings does
+            cur.execute(self._standings_delete, (competition_id, standings[0].season_id))
+            rows = [standing.to_row(extracted_at) for standing in standings]
+            cur.execute(self._standings_insert, self._arrays(rows, self._standings_columns))
+            return len(rows)
+
+        record_types = {'competitions': Competition, 'teams': Team, 'matches': Match}
+        if entity not in record_types:
+            raise ValueError(f"Unknown entity: {entity}")
+        if not payload:
+            logger.warning(f"No {entity} to load")
+            return 0
+
+        columns, query = self._upserts[entity]
+        rows = [record.to_row(extracted_at) for record in to_records(record_types[entity], payload)]
+        cur.execute(query, self._arrays(rows, columns))
+        return len(rows)
+
+    def load_batch(self, batch: List[Tuple[str, Optional[int], Any]]) -> List[int]:
+        """Load several payloads in one pipelined transaction.
+
+        Args:
+            batch: Tuples of (entity name, competition ID, payload)
+
+        Returns:
+            Number of records loaded for each batch entry
+        """
+        extracted_at = datetime.utcnow()
+        conn = self._connection()
+        # No conn.transaction(): its BEGIN and COMMIT each wait for a sync. The
+        # server runs everything up to the pipeline's single sync as one implicit
+        # transaction, rolled back as a whole if any statement fails.
+        with conn.pipeline(), conn.cursor() as cur:
+            counts = [
+                self._queue(cur, entity, payload, comp_id, extracted_at)
+                for entity, comp_id, payload in batch
+            ]
+        for (entity, comp_id, _), count in zip(batch, counts):
+            logger.info(f"Loaded {count} {entity}" + (f" for competition {comp_id}" if comp_id else ""))
+        return counts
+
+    def load_competitions(self, competitions: List[Union[Dict, Competition]]) -> int:
+        return self.load_batch([('competitions', None, competitions)])[0]
+
+    def load_teams(self, teams: List[Union[Dict, Team]]) -> int:
+        return self.load_batch([('teams', None, teams)])[0]
+
+    def load_matches(self, matches: List[Union[Dict, Match]]) -> int:
+        return self.load_batch([('matches', None, matches)])[0]
+
+    def load_standings(self, standings_data: Union[Dict, List[Standing]], competition_id: int) -> int:
+        return self.load_batch([('standings', competition_id, standings_data)])[0]
@@ -0,0 +1,179 @@
+"""Distributed rate limiting for Football-Data.org API keys.
+
+Every API key gets a token bucket stored in raw.api_rate_limits, shared by all
+client instances (Airflow workers, backfill runs, the live poller) that use the
+same database. Taking a token locks the bucket's row (SELECT ... FOR UPDATE),
+so concurrent callers queue up behind each other, and the refill is computed
+from the database clock, so workers on different hosts agree on the budget.
+
+ApiKeyPool spreads requests over several keys, each with its own bucket, so
+throughput grows with the number of keys.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Football-Data.org free tier quota
+DEFAULT_REQUESTS_PER_MINUTE = 10
+
+
+class PostgresTokenBucket:
+    """Token bucket whose state lives in a Postgres row."""
+
+    def __init__(self, engine, bucket: str, requests_per_window: int, window_seconds: float = 60.0):
+        """Initialize the bucket.
+
+        The bucket holds a single token and refills at (quota - 1) per window,
+        so any window of that length sees at most `requests_per_window`
+        requests, however they are spread over the workers.
+
+        Args:
+            engine: SQLAlchemy engine of the shared database
+            bucket: Bucket name
+            requests_per_window: Requests the API allows per window
+            window_seconds: Length of the API's quota window
+        """
+        self.engine = engine
+        self.bucket = bucket
+        self.capacity = 1.0
+        self.rate = max(requests_per_window - 1, 1) / window_seconds
+        self._create_bucket()
+
+    def _create_bucket(self):
+        with self.engine.connect() as conn:
+            # Workers starting together would otherwise race on "if not exists"
+            conn.execute(text("select pg_advisory_xact_lock(hashtext('raw.api_rate_limits'))"))
+            conn.execute(text("""
+                create table if not exists raw.api_rate_limits (
+                    bucket text primary key,
+                    tokens double precision not null,
+                    updated_at timestamptz not null
+                )
+            """))
+            conn.execute(text("""
+                insert into raw.api_rate_limits (bucket, tokens, updated_at)
+                values (:bucket, :capacity, clock_timestamp())
+                on conflict (bucket) do nothing
+            """), {'bucket': self.bucket, 'capacity': self.capacity})
+            conn.commit()
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        """Take a token if one is available.
+
+        Returns:
+            Whether a token was taken, and otherwise the seconds until one is
+        """
+        with self.engine.connect() as conn:
+            tokens, now = conn.execute(text("""
+                select
+                    least(:capacity, tokens + extract(epoch from clock_timestamp() - updated_at) * :rate),
+                    clock_timestamp()
+                from raw.api_rate_limits
+                where bucket = :bucket
+                for update
+            """), {'bucket': self.bucket, 'capacity': self.capacity, 'rate': self.rate}).one()
+
+            acquired = tokens >= 1
+            if acquired:
+                conn.execute(text("""
+                    update raw.api_rate_limits
+                    set tokens = :tokens, updated_at = :now
+                    where bucket = :bucket
+                """), {'bucket': self.bucket, 'tokens': tokens - 1, 'now': now})
+            conn.commit()
+
+        if acquired:
+            return True, 0.0
+        return False, (1 - tokens) / self.rate
+
+
+class ApiKeyPool:
+    """Hand out API keys so that no key exceeds its rate limit."""
+
+    def __init__(
+        self,
+        api_keys: List[str],
+        engine,
+        requests_per_window: int = DEFAULT_REQUESTS_PER_MINUTE,
+        window_seconds: float = 60.0
+    ):
+        """Initialize the key pool.
+
+        Args:
+            api_keys: API keys to spread requests over
+            engine: SQLAlchemy engine of the shared database
+            requests_per_window: Requests each key may make per window
+            window_seconds: Length of the API's quota window
+        """
+        if not api_keys:
+            raise ValueError("ApiKeyPool needs at least one API key")
+
+        self.api_keys = list(api_keys)
+        # Buckets are named by a key digest so keys never end up in the database
+        self.buckets = [
+            PostgresTokenBucket(
+                engine,
+                f"football_api:{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}",
+                requests_per_window,
+                window_seconds
+            )
+            for key in self.api_keys
+        ]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, engine) -> 'ApiKeyPool':
+        """Create a pool from FOOTBALL_API_KEYS (comma-separated) or FOOTBALL_API_KEY.
+
+        Args:
+            engine: SQLAlchemy engine of the shared database
+
+        Returns:
+            Key pool limited to FOOTBALL_API_REQUESTS_PER_MINUTE per key
+        """
+        keys = os.getenv('FOOTBALL_API_KEYS') or os.getenv('FOOTBALL_API_KEY', '')
+        return cls(
+            [key.strip() for key in keys.split(',') if key.strip()],
+            engine,
+            requests_per_window=int(os.getenv('FOOTBALL_API_REQUESTS_PER_MINUTE', str(DEFAULT_REQUESTS_PER_MINUTE)))
+        )
+
+    def acquire(self, timeout: Optional[float] = None) -> str:
+        """Wait for a key with budget left and take one request from it.
+
+        Keys are tried round-robin from where the previous call left off, so
+        load spreads evenly over the keys.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            API key to use for one request
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                start = self._next
+                self._next = (self._next + 1) % len(self.api_keys)
+
+            shortest_wait = None
+            for offset in range(len(self.api_keys)):
+                i = (start + offset) % len(self.api_keys)
+                acquired, wait = self.buckets[i].try_acquire()
+                if acquired:
+                    return self.api_keys[i]
+                shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+
+            if deadline is not None and time.monotonic() + shortest_wait > deadline:
+                raise TimeoutError(f"No API key available within {timeout} seconds")
+            time.sleep(shortest_wait)
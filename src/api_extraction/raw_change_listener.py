@@ -0,0 +1,304 @@
+"""Run targeted dbt builds as soon as raw tables change.
+
+DatabaseLoader installs statement-level triggers on the raw tables that NOTIFY
+on RAW_CHANGES_CHANNEL when a load commits. This listener collects those
+notifications, waits until loads have been quiet for `quiet_seconds` (or at
+most `max_delay_seconds` after the first change), and then runs only the
+incremental models and materialized views downstream of the changed tables:
+
+    dbt run --select source:raw.matches+,config.materialized:incremental \
+                     source:raw.matches+,config.materialized:materialized_view
+
+Both update the serving schema without blocking readers: incremental models
+(league_standings, team_form_rolling) delete and insert only the seasons with
+newly extracted rows, and materialized views are refreshed concurrently. Table
+models would be rebuilt in full under an exclusive lock, so they are left to
+the daily DAG, which builds and tests everything in the blue/green shadow
+schema. The competitions with changed matches are passed as the
+changed_competition_ids var, which limits the incremental models to them.
+While a targeted run is in progress the listener holds the
+ANALYTICS_SWAP_LOCK advisory lock, which swap_analytics_schema also takes, so
+a swap never happens halfway through a run. If dbt fails, the changes are put
+back and retried with exponential backoff; after `max_retries` failures they
+are dropped and left to the daily DAG.
+"""
+
+import os
+import sys
+import json
+import time
+import select
+import argparse
+import logging
+import subprocess
+from typing import Dict, List, Optional
+
+import psycopg2
+from dotenv import load_dotenv
+
+from database_loader import RAW_CHANGES_CHANNEL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_DBT_PROJECT_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'dbt_football')
+
+# Advisory lock key shared with the swap_analytics_schema macro (hashtext of the name)
+ANALYTICS_SWAP_LOCK = 'analytics_swap'
+
+# Materializations a targeted run may update in the serving schema
+IN_PLACE_MATERIALIZATIONS = ('incremental', 'materialized_view')
+
+# Longest wait before retrying a failed dbt run
+MAX_RETRY_BACKOFF_SECONDS = 3600.0
+
+
+class ChangeDebouncer:
+    """Aggregate change notifications per table until loads go quiet."""
+
+    def __init__(self, quiet_seconds: float = 30.0, max_delay_seconds: float = 300.0):
+        """Initialize the debouncer.
+
+        Args:
+            quiet_seconds: Seconds without new changes before a batch is due
+            max_delay_seconds: Seconds after the first change by which a batch
+                is due even while changes keep arriving
+        """
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._changes: Dict[str, Dict] = {}
+        self._first_at: Optional[float] = None
+        self._last_at: Optional[float] = None
+        self._retry_at: Optional[float] = None
+
+    def add(self, event: Dict, now: Optional[float] = None):
+        """Merge one notification payload into the pending batch."""
+        now = time.monotonic() if now is None else now
+        change = self._changes.setdefault(event['table'], {'rows': 0, 'competition_ids': set()})
+        change['rows'] += event.get('rows', 0)
+        change['competition_ids'].update(event.get('competition_ids') or [])
+
+        if self._first_at is None:
+            self._first_at = now
+        self._last_at = now
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the pending batch is due, or None when nothing is pending."""
+        if self._first_at is None:
+            return None
+        now = time.monotonic() if now is None else now
+        due_at = min(self._last_at + self.quiet_seconds, self._first_at + self.max_delay_seconds)
+        if self._retry_at is not None:
+            due_at = max(due_at, self._retry_at)
+        return max(0.0, due_at - now)
+
+    def requeue(self, changes: Dict[str, Dict], delay: float, now: Optional[float] = None):
+        """Put a drained batch back after a failed build, due again no sooner than delay seconds."""
+        now = time.monotonic() if now is None else now
+        for table, change in changes.items():
+            self.add({**change, 'table': table}, now)
+        self._retry_at = now + delay
+
+    def drain(self) -> Dict[str, Dict]:
+        """Take the pending batch, keyed by table name."""
+        changes = self._changes
+        self._changes = {}
+        self._first_at = self._last_at = self._retry_at = None
+        return changes
+
+
+def describe_changes(changes: Dict[str, Dict]) -> str:
+    """One-line summary of a batch of changes for the log."""
+    return '; '.join(
+        f"raw.{table}: {change['rows']} rows, competitions "
+        f"{', '.join(str(c) for c in sorted(change['competition_ids'])) or '-'}"
+        for table, change in sorted(changes.items())
+    )
+
+
+def dbt_vars(changes: Dict[str, Dict]) -> Dict[str, List[int]]:
+    """dbt vars scoping the incremental models to the competitions with changed matches."""
+    competition_ids = sorted(changes.get('matches', {}).get('competition_ids', ()))
+    return {'changed_competition_ids': competition_ids} if competition_ids else {}
+
+
+def dbt_selectors(changes: Dict[str, Dict]) -> List[str]:
+    """dbt node selectors for the models downstream of the changed tables that can be updated in place."""
+    return [
+        f'source:raw.{table}+,config.materialized:{materialized}'
+        for table in sorted(changes)
+        for materialized in IN_PLACE_MATERIALIZATIONS
+    ]
+
+
+class RawChangeListener:
+    """LISTEN for raw table changes and run debounced, targeted dbt builds."""
+
+    def __init__(
+        self,
+        debouncer: ChangeDebouncer,
+        dbt_project_dir: str = DEFAULT_DBT_PROJECT_DIR,
+        connection_string: Optional[str] = None,
+        max_retries: int = 5,
+        retry_backoff_seconds: float = 60.0
+    ):
+        """Initialize the listener.
+
+        Args:
+            debouncer: Debouncer deciding when a batch of changes is built
+            dbt_project_dir: Path to the dbt project
+            connection_string: PostgreSQL connection string
+            max_retries: Failed dbt runs retried before a batch is dropped
+            retry_backoff_seconds: Wait before the first retry, doubled for each further one
+        """
+        if not connection_string:
+            host = os.getenv('POSTGRES_HOST', 'localhost')
+            port = os.getenv('POSTGRES_PORT', '5432')
+            db = os.getenv('POSTGRES_DB', 'football_analytics')
+            user = os.getenv('POSTGRES_USER', 'airflow')
+            password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+            connection_string = f'postgresql://{user}:{password}@{host}:{port}/{db}'
+
+        self.connection_string = connection_string
+        self.debouncer = debouncer
+        self.dbt_project_dir = os.path.abspath(dbt_project_dir)
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._failures = 0
+
+    def _connect(self):
+        conn = psycopg2.connect(self.connection_string)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN {RAW_CHANGES_CHANNEL}')
+        logger.info(f"Listening on channel {RAW_CHANGES_CHANNEL}")
+        return conn
+
+    def _drain_notifications(self, conn):
+        conn.poll()
+        while conn.notifies:
+            notification = conn.notifies.pop(0)
+            try:
+                self.debouncer.add(json.loads(notification.payload))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Ignoring malformed notification {notification.payload!r}: {str(e)}")
+
+    def run_dbt(self, changes: Dict[str, Dict]) -> bool:
+        """Run the in-place models downstream of the changed tables.
+
+        Holds the ANALYTICS_SWAP_LOCK advisory lock for the duration, so the
+        DAG's swap waits for the run instead of renaming schemas under it.
+
+        Args:
+            changes: Aggregated changes keyed by table name
+
+        Returns:
+            True if dbt succeeded
+        """
+        logger.info(f"Changes: {describe_changes(changes)}")
+
+        # A separate target path keeps artifacts apart from the DAG's dbt runs
+        command = [
+            'dbt', 'run', '--profiles-dir', '.', '--target-path', 'target/listener',
+            '--select', *dbt_selectors(changes)
+        ]
+        variables = dbt_vars(changes)
+        if variables:
+            command += ['--vars', json.dumps(variables)]
+        logger.info(f"Running {' '.join(command)}")
+        start = time.monotonic()
+        lock_conn = psycopg2.connect(self.connection_string)
+        lock_conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with lock_conn.cursor() as cur:
+                cur.execute('select pg_advisory_lock(hashtext(%s))', (ANALYTICS_SWAP_LOCK,))
+            result = subprocess.run(command, cwd=self.dbt_project_dir)
+        finally:
+            # Closing the session releases the lock
+            lock_conn.close()
+        elapsed = time.monotonic() - start
+
+        if result.returncode != 0:
+            logger.error(f"dbt run failed after {elapsed:.1f}s (exit code {result.returncode})")
+            return False
+        logger.info(f"dbt run finished in {elapsed:.1f}s")
+        return True
+
+    def _after_build(self, changes: Dict[str, Dict], built: bool):
+        """Reset the failure count, or requeue the batch with backoff until it is dropped."""
+        if built:
+            self._failures = 0
+            return
+        self._failures += 1
+        if self._failures > self.max_retries:
+            logger.error(
+                f"DROPPING CHANGES after {self._failures} failed dbt runs; the daily DAG will "
+                f"build them. {describe_changes(changes)}"
+            )
+            self._failures = 0
+            return
+        delay = min(self.retry_backoff_seconds * 2 ** (self._failures - 1), MAX_RETRY_BACKOFF_SECONDS)
+        logger.warning(f"Retrying the failed dbt run in {delay:.0f}s ({self._failures} of {self.max_retries})")
+        self.debouncer.requeue(changes, delay)
+
+    def listen(self, poll_seconds: float = 60.0):
+        """Listen forever, reconnecting after connection errors.
+
+        Args:
+            poll_seconds: Longest wait for notifications while nothing is pending
+        """
+        conn = None
+        while True:
+            try:
+                if conn is None or conn.closed:
+                    conn = self._connect()
+
+                timeout = self.debouncer.seconds_until_due()
+                ready, _, _ = select.select([conn], [], [], poll_seconds if timeout is None else timeout)
+                if ready:
+                    self._drain_notifications(conn)
+
+                if self.debouncer.seconds_until_due() == 0:
+                    # Notifications arriving during the build wait on the connection
+                    changes = self.debouncer.drain()
+                    built = False
+                    try:
+                        built = self.run_dbt(changes)
+                    finally:
+                        self._after_build(changes, built)
+            except psycopg2.OperationalError as e:
+                logger.error(f"Lost database connection: {str(e)}; reconnecting in {poll_seconds:.0f}s")
+                conn = None
+                time.sleep(poll_seconds)
+
+
+def main():
+    """Listen for raw table changes and keep the analytics models current."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quiet-seconds', type=float, default=30.0, help='Quiet period before building')
+    parser.add_argument('--max-delay-seconds', type=float, default=300.0, help='Longest wait after the first change')
+    parser.add_argument('--dbt-project-dir', default=os.getenv('DBT_PROJECT_DIR', DEFAULT_DBT_PROJECT_DIR))
+    parser.add_argument('--max-retries', type=int, default=5, help='Failed dbt runs retried before dropping a batch')
+    parser.add_argument('--retry-backoff-seconds', type=float, default=60.0, help='Wait before the first retry')
+    args = parser.parse_args()
+
+    listener = RawChangeListener(
+        ChangeDebouncer(args.quiet_seconds, args.max_delay_seconds),
+        dbt_project_dir=args.dbt_project_dir,
+        max_retries=args.max_retries,
+        retry_backoff_seconds=args.retry_backoff_seconds
+    )
+    try:
+        listener.listen()
+    except KeyboardInterrupt:
+        logger.info("Listener stopped")
+    except Exception as e:
+        logger.error(f"Listener failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
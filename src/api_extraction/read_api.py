@@ -0,0 +1,309 @@
+"""Read-only HTTP API over the analytics models used for point lookups.
+
+Serves analytics.team_performance, team_head_to_head and competition_summary
+as JSON from a pooled set of database connections. Responses are kept in an
+in-process LRU cache with a TTL and carry an ETag, so clients sending
+If-None-Match get a 304 when nothing changed. The ETL DAG posts to
+/cache/invalidate after each analytics swap.
+
+Endpoints:
+    GET  /teams/<team_id>/performance[?competition_id=<id>]
+    GET  /head-to-head/<team_id>/<team_id>[?competition_id=<id>]
+    GET  /competitions/summary
+    GET  /competitions/<competition_id>/summary
+    GET  /health
+    POST /cache/invalidate
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Get a live entry, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Any, value: Any):
+        """Store an entry, evicting the least recently used one when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        """Drop every entry.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters."""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class AnalyticsReader:
+    """Point lookups against the analytics schema through a connection pool."""
+
+    def __init__(self, connection_string: Optional[str] = None, pool_size: int = 5, max_overflow: int = 5):
+        """Initialize the reader.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            pool_size: Connections kept open in the pool
+            max_overflow: Extra connections allowed under load
+        """
+        if not connection_string:
+            host = os.getenv('POSTGRES_HOST', 'localhost')
+            port = os.getenv('POSTGRES_PORT', '5432')
+            db = os.getenv('POSTGRES_DB', 'football_analytics')
+            user = os.getenv('POSTGRES_USER', 'airflow')
+            password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+            connection_string = f'postgresql://{user}:{password}@{host}:{port}/{db}'
+
+        self.engine = create_engine(
+            connection_string,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True
+        )
+
+    def _query(self, sql: str, params: Dict) -> List[Dict]:
+        """Run a read query and return rows as dictionaries."""
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(text(sql), params).mappings()]
+
+    def team_performance(self, team_id: int, competition_id: Optional[int] = None) -> List[Dict]:
+        """Performance rows of a team, one per competition."""
+        sql = 'select * from analytics.team_performance where team_id = :team_id'
+        if competition_id is not None:
+            sql += ' and competition_id = :competition_id'
+        return self._query(sql + ' order by competition_id', {'team_id': team_id, 'competition_id': competition_id})
+
+    def head_to_head(self, team_a: int, team_b: int, competition_id: Optional[int] = None) -> List[Dict]:
+        """Head-to-head rows of a pair of teams, one per competition."""
+        # The model stores each pair once, with the lower team ID as team1
+        team1_id, team2_id = sorted((team_a, team_b))
+        sql = 'select * from analytics.team_head_to_head where team1_id = :team1_id and team2_id = :team2_id'
+        if competition_id is not None:
+            sql += ' and competition_id = :competition_id'
+        return self._query(
+            sql + ' order by competition_id',
+            {'team1_id': team1_id, 'team2_id': team2_id, 'competition_id': competition_id}
+        )
+
+    def competition_summary(self, competition_id: Optional[int] = None) -> List[Dict]:
+        """Summary rows of one competition, or of all of them."""
+        sql = 'select * from analytics.competition_summary'
+        if competition_id is not None:
+            sql += ' where competition_id = :competition_id'
+        return self._query(sql + ' order by competition_id', {'competition_id': competition_id})
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types returned by the database."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+# (pattern, reader method, names of the captured path parameters)
+ROUTES = [
+    (re.compile(r'^/teams/(\d+)/performance$'), 'team_performance', ['team_id']),
+    (re.compile(r'^/head-to-head/(\d+)/(\d+)$'), 'head_to_head', ['team_a', 'team_b']),
+    (re.compile(r'^/competitions/summary$'), 'competition_summary', []),
+    (re.compile(r'^/competitions/(\d+)/summary$'), 'competition_summary', ['competition_id']),
+]
+
+
+class ReadAPIHandler(BaseHTTPRequestHandler):
+    """Request handler; the server instance carries the reader and the cache."""
+
+    server_version = 'FootballReadAPI/1.0'
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any):
+        self._send(status, json.dumps(payload, default=_json_default).encode('utf-8'))
+
+    def _resolve(self, path: str, query: Dict[str, List[str]]) -> Optional[Tuple[str, Dict[str, int]]]:
+        """Match a path to a reader method and its integer arguments."""
+        for pattern, method, names in ROUTES:
+            match = pattern.match(path)
+            if match:
+                kwargs = {name: int(value) for name, value in zip(names, match.groups())}
+                if 'competition_id' in query and method != 'competition_summary':
+                    kwargs['competition_id'] = int(query['competition_id'][0])
+                return method, kwargs
+        return None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        if url.path == '/health':
+            self._send_json(200, {'status': 'ok', 'cache': self.server.cache.stats()})
+            return
+
+        try:
+            route = self._resolve(url.path, parse_qs(url.query))
+        except ValueError:
+            self._send_json(400, {'error': 'competition_id must be an integer'})
+            return
+        if route is None:
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        method, kwargs = route
+        key = (method, tuple(sorted(kwargs.items())))
+        cached = self.server.cache.get(key)
+        if cached is None:
+            try:
+                rows = getattr(self.server.reader, method)(**kwargs)
+            except Exception as e:
+                logger.error(f"Query {method} failed: {str(e)}")
+                self._send_json(503, {'error': 'analytics database unavailable'})
+                return
+            body = json.dumps(rows, default=_json_default).encode('utf-8')
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            self.server.cache.set(key, cached)
+
+        body, etag = cached
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, headers={'ETag': etag})
+        else:
+            self._send(200, body, headers={'ETag': etag})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/cache/invalidate':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        token = self.server.invalidate_token
+        if token and self.headers.get('X-Invalidate-Token') != token:
+            self._send_json(403, {'error': 'invalid token'})
+            return
+
+        dropped = self.server.cache.clear()
+        logger.info(f"Cache invalidated, {dropped} entries dropped")
+        self._send_json(200, {'invalidated': dropped})
+
+
+class ReadAPIServer(ThreadingHTTPServer):
+    """Threaded HTTP server sharing one reader and one cache across requests."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        reader: AnalyticsReader,
+        cache: TTLCache,
+        invalidate_token: Optional[str] = None
+    ):
+        """Initialize the server.
+
+        Args:
+            address: Host and port to listen on
+            reader: Analytics reader
+            cache: Response cache
+            invalidate_token: Token required by /cache/invalidate, if set
+        """
+        super().__init__(address, ReadAPIHandler)
+        self.reader = reader
+        self.cache = cache
+        self.invalidate_token = invalidate_token
+
+
+def main():
+    """Serve the read API."""
+    host = os.getenv('READ_API_HOST', '0.0.0.0')
+    port = int(os.getenv('READ_API_PORT', '8000'))
+
+    try:
+        server = ReadAPIServer(
+            (host, port),
+            AnalyticsReader(pool_size=int(os.getenv('READ_API_POOL_SIZE', '5'))),
+            TTLCache(
+                max_entries=int(os.getenv('READ_API_CACHE_ENTRIES', '1024')),
+                ttl_seconds=float(os.getenv('READ_API_CACHE_TTL', '300'))
+            ),
+            invalidate_token=os.getenv('READ_API_INVALIDATE_TOKEN')
+        )
+        logger.info(f"Read API listening on {host}:{port}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Read API stopped")
+    except Exception as e:
+        logger.error(f"Read API failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
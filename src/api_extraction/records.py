@@ -0,0 +1,429 @@
+"""Typed records for the data passed between the API client and the database loader.
+
+Each record is a slotted dataclass built once from an API payload. It holds the
+flattened columns of its raw table, plus the original payload for the raw_data
+column. Slots keep per-instance memory well below a dict, and attribute access
+is faster than key lookups, which adds up across large match batches.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+RecordT = TypeVar('RecordT', 'Competition', 'Team', 'Match', 'Standing', 'TeamDetail', 'MatchDetail')
+
+
+@dataclass(slots=True)
+class Competition:
+    """A row of raw.competitions."""
+
+    id: Optional[int]
+    name: Optional[str]
+    code: Optional[str]
+    type: Optional[str]
+    emblem: Optional[str]
+    area_name: Optional[str]
+    area_code: Optional[str]
+    current_season: Optional[Dict]
+    raw: Dict
+
+    @classmethod
+    def from_api(cls, comp: Dict) -> 'Competition':
+        """Build a record from a competition payload."""
+        area = comp.get('area') or {}
+        return cls(
+            comp.get('id'),
+            comp.get('name'),
+            comp.get('code'),
+            comp.get('type'),
+            comp.get('emblem'),
+            area.get('name'),
+            area.get('code'),
+            comp.get('currentSeason'),
+            comp,
+        )
+
+    def to_row(self, extracted_at: datetime) -> Dict[str, Any]:
+        """Column values for an insert into raw.competitions."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'code': self.code,
+            'type': self.type,
+            'emblem': self.emblem,
+            'area_name': self.area_name,
+            'area_code': self.area_code,
+            'current_season': self.current_season,
+            'raw_data': self.raw,
+            'extracted_at': extracted_at,
+        }
+
+
+@dataclass(slots=True)
+class Team:
+    """A row of raw.teams."""
+
+    id: Optional[int]
+    name: Optional[str]
+    short_name: Optional[str]
+    tla: Optional[str]
+    crest: Optional[str]
+    address: Optional[str]
+    website: Optional[str]
+    founded: Optional[int]
+    club_colors: Optional[str]
+    venue: Optional[str]
+    raw: Dict
+
+    @classmethod
+    def from_api(cls, team: Dict) -> 'Team':
+        """Build a record from a team payload."""
+        return cls(
+            team.get('id'),
+            team.get('name'),
+            team.get('shortName'),
+            team.get('tla'),
+            team.get('crest'),
+            team.get('address'),
+            team.get('website'),
+            team.get('founded'),
+            team.get('clubColors'),
+            team.get('venue'),
+            team,
+        )
+
+    def to_row(self, extracted_at: datetime) -> Dict[str, Any]:
+        """Column values for an insert into raw.teams."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'short_name': self.short_name,
+            'tla': self.tla,
+            'crest': self.crest,
+            'address': self.address,
+            'website': self.website,
+            'founded': self.founded,
+            'club_colors': self.club_colors,
+            'venue': self.venue,
+            'raw_data': self.raw,
+            'extracted_at': extracted_at,
+        }
+
+
+@dataclass(slots=True)
+class Match:
+    """A row of raw.matches."""
+
+    id: Optional[int]
+    competition_id: Optional[int]
+    season_id: Optional[int]
+    utc_date: Optional[str]
+    status: Optional[str]
+    matchday: Optional[int]
+    stage: Optional[str]
+    group: Optional[str]
+    home_team_id: Optional[int]
+    home_team_name: Optional[str]
+    away_team_id: Optional[int]
+    away_team_name: Optional[str]
+    winner: Optional[str]
+    duration: Optional[str]
+    full_time_home: Optional[int]
+    full_time_away: Optional[int]
+    half_time_home: Optional[int]
+    half_time_away: Optional[int]
+    raw: Dict
+
+    @classmethod
+    def from_api(cls, match: Dict) -> 'Match':
+        """Build a record from a match payload."""
+        score = match.get('score') or {}
+        full_time = score.get('fullTime') or {}
+        half_time = score.get('halfTime') or {}
+        home_team = match.get('homeTeam') or {}
+        away_team = match.get('awayTeam') or {}
+        return cls(
+            match.get('id'),
+            (match.get('competition') or {}).get('id'),
+            (match.get('season') or {}).get('id'),
+            match.get('utcDate'),
+            match.get('status'),
+            match.get('matchday'),
+            match.get('stage'),
+            match.get('group'),
+            home_team.get('id'),
+            home_team.get('name'),
+            away_team.get('id'),
+            away_team.get('name'),
+            score.get('winner'),
+            score.get('duration'),
+            full_time.get('home'),
+            full_time.get('away'),
+            half_time.get('home'),
+            half_time.get('away'),
+            match,
+        )
+
+    def to_row(self, extracted_at: datetime) -> Dict[str, Any]:
+        """Column values for an insert into raw.matches."""
+        return {
+            'id': self.id,
+            'competition_id': self.competition_id,
+            'season_id': self.season_id,
+            'utc_date': self.utc_date,
+            'status': self.status,
+            'matchday': self.matchday,
+            'stage': self.stage,
+            'group': self.group,
+            'home_team_id': self.home_team_id,
+            'home_team_name': self.home_team_name,
+            'away_team_id': self.away_team_id,
+            'away_team_name': self.away_team_name,
+            'winner': self.winner,
+            'duration': self.duration,
+            'full_time_home': self.full_time_home,
+            'full_time_away': self.full_time_away,
+            'half_time_home': self.half_time_home,
+            'half_time_away': self.half_time_away,
+            'raw_data': self.raw,
+            'extracted_at': extracted_at,
+        }
+
+
+@dataclass(slots=True)
+class Standing:
+    """A row of raw.standings: one team's line in one standings table."""
+
+    competition_id: Optional[int]
+    season_id: Optional[int]
+    stage: Optional[str]
+    type: Optional[str]
+    group: Optional[str]
+    team_id: Optional[int]
+    team_name: Optional[str]
+    position: Optional[int]
+    played_games: Optional[int]
+    won: Optional[int]
+    draw: Optional[int]
+    lost: Optional[int]
+    points: Optional[int]
+    goals_for: Optional[int]
+    goals_against: Optional[int]
+    goal_difference: Optional[int]
+    raw: Dict
+
+    @classmethod
+    def from_api(cls, standings_data: Dict, competition_id: int) -> List['Standing']:
+        """Build records for every table entry of a standings payload.
+
+        Args:
+            standings_data: Standings data dictionary from API
+            competition_id: Competition ID
+
+        Returns:
+            List of standing records
+        """
+        season_id = (standings_data.get('season') or {}).get('id')
+        records = []
+        for standing in standings_data.get('standings', []):
+            stage = standing.get('stage')
+            type_ = standing.get('type')
+            group = standing.get('group')
+
+            for entry in standing.get('table', []):
+                team = entry.get('team') or {}
+                records.append(cls(
+                    competition_id,
+                    season_id,
+                    stage,
+                    type_,
+                    group,
+                    team.get('id'),
+                    team.get('name'),
+                    entry.get('position'),
+                    entry.get('playedGames'),
+                    entry.get('won'),
+                    entry.get('draw'),
+                    entry.get('lost'),
+                    entry.get('points'),
+                    entry.get('goalsFor'),
+                    entry.get('goalsAgainst'),
+                    entry.get('goalDifference'),
+                    entry,
+                ))
+        return records
+
+    def to_row(self, extracted_at: datetime) -> Dict[str, Any]:
+        """Column values for an insert into raw.standings."""
+        return {
+            'competition_id': self.competition_id,
+            'season_id': self.season_id,
+            'stage': self.stage,
+            'type': self.type,
+            'group': self.group,
+            'team_id': self.team_id,
+            'team_name': self.team_name,
+            'position': self.position,
+            'played_games': self.played_games,
+            'won': self.won,
+            'draw': self.draw,
+            'lost': self.lost,
+            'points': self.points,
+            'goals_for': self.goals_for,
+            'goals_against': self.goals_against,
+            'goal_difference': self.goal_difference,
+            'raw_data': self.raw,
+            'extracted_at': extracted_at,
+        }
+
+
+@dataclass(slots=True)
+class TeamDetail:
+    """A row of raw.team_details: the teams/{id} payload with squad and coach."""
+
+    id: Optional[int]
+    name: Optional[str]
+    coach_id: Optional[int]
+    coach_name: Optional[str]
+    squad_size: int
+    squad: List[Dict]
+    staff: List[Dict]
+    running_competition_ids: List[int]
+    last_updated: Optional[str]
+    raw: Dict
+
+    @classmethod
+    def from_api(cls, team: Dict) -> 'TeamDetail':
+        """Build a record from a team detail payload."""
+        coach = team.get('coach') or {}
+        squad = team.get('squad') or []
+        return cls(
+            team.get('id'),
+            team.get('name'),
+            coach.get('id'),
+            coach.get('name'),
+            len(squad),
+            squad,
+            team.get('staff') or [],
+            [comp.get('id') for comp in team.get('runningCompetitions') or []],
+            team.get('lastUpdated'),
+            team,
+        )
+
+    def to_row(self, extracted_at: datetime) -> Dict[str, Any]:
+        """Column values for an insert into raw.team_details."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'coach_id': self.coach_id,
+            'coach_name': self.coach_name,
+            'squad_size': self.squad_size,
+            'squad': self.squad,
+            'staff': self.staff,
+            'running_competition_ids': self.running_competition_ids,
+            'last_updated': self.last_updated,
+            'raw_data': self.raw,
+            'extracted_at': extracted_at,
+        }
+
+
+@dataclass(slots=True)
+class MatchDetail:
+    """A row of raw.match_details: the matches/{id} payload with referees and lineups."""
+
+    id: Optional[int]
+    competition_id: Optional[int]
+    status: Optional[str]
+    utc_date: Optional[str]
+    venue: Optional[str]
+    attendance: Optional[int]
+    referee_id: Optional[int]
+    referee_name: Optional[str]
+    referees: List[Dict]
+    home_formation: Optional[str]
+    away_formation: Optional[str]
+    home_lineup: List[Dict]
+    away_lineup: List[Dict]
+    last_updated: Optional[str]
+    raw: Dict
+
+    @classmethod
+    def from_api(cls, match: Dict) -> 'MatchDetail':
+        """Build a record from a match detail payload."""
+        referees = match.get('referees') or []
+        # Assistants and VAR officials are listed too; the referee has type REFEREE
+        referee = next((r for r in referees if r.get('type') == 'REFEREE'), {})
+        home_team = match.get('homeTeam') or {}
+        away_team = match.get('awayTeam') or {}
+        return cls(
+            match.get('id'),
+            (match.get('competition') or {}).get('id'),
+            match.get('status'),
+            match.get('utcDate'),
+            match.get('venue'),
+            match.get('attendance'),
+            referee.get('id'),
+            referee.get('name'),
+            referees,
+            home_team.get('formation'),
+            away_team.get('formation'),
+            home_team.get('lineup') or [],
+            away_team.get('lineup') or [],
+            match.get('lastUpdated'),
+            match,
+        )
+
+    def to_row(self, extracted_at: datetime) -> Dict[str, Any]:
+        """Column values for an insert into raw.match_details."""
+        return {
+            'id': self.id,
+            'competition_id': self.competition_id,
+            'status': self.status,
+            'utc_date': self.utc_date,
+            'venue': self.venue,
+            'attendance': self.attendance,
+            'referee_id': self.referee_id,
+            'referee_name': self.referee_name,
+            'referees': self.referees,
+            'home_formation': self.home_formation,
+            'away_formation': self.away_formation,
+            'home_lineup': self.home_lineup,
+            'away_lineup': self.away_lineup,
+            'last_updated': self.last_updated,
+            'raw_data': self.raw,
+            'extracted_at': extracted_at,
+        }
+
+
+def to_records(record_type: Type[RecordT], items: Iterable[Any]) -> List[RecordT]:
+    """Convert API payloads to records, passing through items that already are records.
+
+    Args:
+        record_type: Competition, Team, Match, TeamDetail or MatchDetail
+        items: API payload dictionaries and/or records of record_type
+
+    Returns:
+        List of records
+    """
+    return [item if isinstance(item, record_type) else record_type.from_api(item) for item in items]
+
+
+def column_values(record_type: Type[RecordT], records: Iterable[RecordT], extracted_at: datetime) -> List[Tuple]:
+    """Insert values of records as tuples in their table's column order.
+
+    A record's fields are its table's columns in order, with raw standing for
+    raw_data and extracted_at left to the load, so the values are read straight
+    from the slots without building a row dict per record. Not for Standing,
+    whose table starts with a serial id.
+
+    Args:
+        record_type: Competition, Team, Match, TeamDetail or MatchDetail
+        records: Records of record_type
+        extracted_at: Load timestamp appended to every row
+
+    Returns:
+        One tuple per record, for insert().values()
+    """
+    getter = attrgetter(*(field.name for field in fields(record_type)))
+    return [getter(record) + (extracted_at,) for record in records]
@@ -0,0 +1,132 @@
+"""Plan which competitions and entities an extraction run needs to refresh.
+
+The planner only reads what is already stored: each competition's current
+season from raw.competitions, the fixture calendar in raw.matches and the
+extraction log. It decides, per competition and entity:
+
+- nothing during the off-season;
+- matches when stored fixtures fall in the extraction window, or when the
+  stored calendar does not cover the window yet;
+- standings at most once every `standings_refresh_days`, and only when a
+  fixture has ended since the last refresh. Tables are derived from matches by
+  the league_standings dbt model; the API snapshot only reconciles them;
+- teams at most once every `team_refresh_days`.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from database_loader import DatabaseLoader
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Time after kickoff by which a match is assumed to be over (incl. extra time)
+MATCH_DURATION = timedelta(hours=2, minutes=30)
+
+
+class RefreshPlanner:
+    """Decide per competition which entities to fetch from the API."""
+
+    def __init__(self, db_loader: DatabaseLoader, team_refresh_days: int = 7, standings_refresh_days: int = 7):
+        """Initialize the planner.
+
+        Args:
+            db_loader: Database loader used to read the stored state
+            team_refresh_days: Minimum number of days between team refreshes
+            standings_refresh_days: Minimum number of days between API standings refreshes
+        """
+        self.db_loader = db_loader
+        self.team_refresh_interval = timedelta(days=team_refresh_days)
+        self.standings_refresh_interval = timedelta(days=standings_refresh_days)
+
+    @staticmethod
+    def _in_off_season(season: Optional[Dict], window_start: datetime, window_end: datetime, now: datetime) -> bool:
+        """Whether the window falls outside the competition's current season.
+
+        A window before the season start only counts as off-season when it
+        reaches the present; older windows may belong to a previous season.
+        """
+        if not season or not season.get('startDate') or not season.get('endDate'):
+            return False
+        season_start = datetime.strptime(season['startDate'], '%Y-%m-%d')
+        season_end = datetime.strptime(season['endDate'], '%Y-%m-%d') + timedelta(days=1)
+        if window_start >= season_end:
+            return True
+        return window_end <= season_start and window_end >= now
+
+    def plan(
+        self,
+        competition_ids: List[int],
+        date_from: str,
+        date_to: str,
+        include_snapshots: bool = True,
+        now: Optional[datetime] = None
+    ) -> Dict[int, List[str]]:
+        """Plan the entities to refresh for each competition.
+
+        Args:
+            competition_ids: Competitions to consider
+            date_from: Start date of the match window (YYYY-MM-DD)
+            date_to: End date of the match window (YYYY-MM-DD, inclusive)
+            include_snapshots: Whether teams and standings may be refreshed
+            now: Current UTC time (defaults to now)
+
+        Returns:
+            Dictionary of competition ID to entity names; competitions with
+            nothing to refresh are omitted
+        """
+        now = now or datetime.utcnow()
+        window_start = datetime.strptime(date_from, '%Y-%m-%d')
+        window_end = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
+
+        seasons = self.db_loader.get_current_seasons(competition_ids)
+        fixtures = self.db_loader.get_fixture_summary(
+            competition_ids, window_start, window_end, played_before=now - MATCH_DURATION
+        )
+        last_extracted = self.db_loader.get_last_extractions(competition_ids)
+
+        plan = {}
+        for comp_id in competition_ids:
+            if self._in_off_season(seasons.get(comp_id), window_start, window_end, now):
+                logger.info(f"Competition {comp_id}: off-season, skipping")
+                continue
+
+            calendar = fixtures.get(comp_id)
+            entities = []
+
+            # Skip matches only when the stored calendar brackets an empty window
+            # (e.g. an international break)
+            calendar_covers_window = (
+                calendar is not None
+                and calendar['first_kickoff'] < window_start
+                and calendar['last_kickoff'] >= window_end
+            )
+            if not calendar_covers_window or calendar['in_window'] > 0:
+                entities.append('matches')
+
+            if include_snapshots:
+                last_standings = last_extracted.get((comp_id, 'standings'))
+                last_played = calendar['last_played'] if calendar else None
+                # Only a fixture that ended since the last refresh changes the table
+                if last_standings is None or (
+                    now - last_standings >= self.standings_refresh_interval
+                    and last_played is not None
+                    and last_played + MATCH_DURATION >= last_standings
+                ):
+                    entities.append('standings')
+
+                last_teams = last_extracted.get((comp_id, 'teams'))
+                if last_teams is None or now - last_teams >= self.team_refresh_interval:
+                    entities.append('teams')
+
+            if entities:
+                plan[comp_id] = entities
+            else:
+                logger.info(f"Competition {comp_id}: up to date, skipping")
+
+        planned_calls = sum(len(entities) for entities in plan.values())
+        full_calls = len(competition_ids) * (3 if include_snapshots else 1)
+        logger.info(f"Planned {planned_calls} of {full_calls} API calls across {len(plan)} competitions")
+        return plan
@@ -0,0 +1,432 @@
+"""Tail-latency control for Football-Data.org requests.
+
+A single hung connection used to hold a task for the flat 30-second timeout,
+and a flapping upstream made every remaining request wait it out before
+Airflow retried the whole task. TailLatencyGuard wraps each GET with:
+
+- per-endpoint latency tracking: endpoints are grouped with their IDs replaced
+  (teams/{id}, competitions/{id}/matches), each keeping a window of recent
+  latencies;
+- adaptive timeouts: once an endpoint has `min_samples` latencies, its read
+  timeout is `timeout_multiplier` times the observed p99, between
+  `min_timeout` and the default timeout;
+- hedged requests: a GET still unanswered after the endpoint's p95 is sent a
+  second time and the first response wins. Hedges only go out when the key
+  pool has a token to spare right now and stay below `max_hedge_ratio` of all
+  requests, so they never eat into the quota other requests wait for;
+- retries: timeouts, connection errors and 5xx answers are retried
+  `max_retries` times with jittered exponential backoff;
+- a circuit breaker: after `failure_threshold` consecutive failures requests
+  fail fast with CircuitOpenError for `reset_seconds`, then a single probe
+  decides whether to close it again.
+
+stats() returns per-endpoint counters, percentiles and current timeouts plus
+the breaker state; log_stats() logs them at the end of a run.
+"""
+
+import os
+import re
+import time
+import random
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Previous flat timeout; still used until an endpoint has enough samples
+DEFAULT_TIMEOUT = 30.0
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+_ID_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def endpoint_key(endpoint: str) -> str:
+    """Group an endpoint with others of its kind, e.g. teams/86 as teams/{id}."""
+    return _ID_SEGMENT.sub('{id}', f"/{endpoint.strip('/')}")[1:]
+
+
+def _percentile(ordered: list, quantile: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open probe."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables it)
+            reset_seconds: Seconds the circuit stays open before a probe is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+        # Thread sending the half-open probe; only it may release the probe
+        self._prober: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go out now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self._prober = threading.get_ident()
+                return True
+            return False
+
+    def release_probe(self):
+        """Let another probe through if this thread's probe ended without an outcome."""
+        with self._lock:
+            if self._probing and self._prober == threading.get_ident():
+                self._probing = False
+                self._prober = None
+
+    def retry_in(self) -> float:
+        """Seconds until the open circuit lets a probe through."""
+        with self._lock:
+            return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Football API recovered; circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+            self._prober = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            self._prober = None
+            if not self.failure_threshold:
+                return
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    logger.warning(
+                        f"Football API failed {self.failures} times in a row; "
+                        f"failing fast for {self.reset_seconds:.0f}s"
+                    )
+                self.state = OPEN
+                self.opened += 1
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.failures, 'opened': self.opened}
+
+
+class _EndpointStats:
+    """Latency window and counters of one endpoint group."""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.counts = defaultdict(int)
+
+
+class TailLatencyGuard:
+    """Adaptive timeouts, hedging, retries and a circuit breaker around API GETs."""
+
+    def __init__(
+        self,
+        default_timeout: float = DEFAULT_TIMEOUT,
+        connect_timeout: float = 5.0,
+        min_timeout: float = 5.0,
+        timeout_multiplier: float = 3.0,
+        hedge_quantile: float = 0.95,
+        max_hedge_ratio: float = 0.1,
+        max_retries: int = 2,
+        backoff_seconds: float = 1.0,
+        min_samples: int = 10,
+        window: int = 200,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """Initialize the guard.
+
+        Args:
+            default_timeout: Read timeout while an endpoint has fewer than min_samples
+                latencies, and the ceiling of adaptive timeouts
+            connect_timeout: Timeout for establishing a connection
+            min_timeout: Floor of adaptive read timeouts
+            timeout_multiplier: Adaptive read timeout as a multiple of the endpoint's p99
+            hedge_quantile: Latency quantile after which an unanswered GET is hedged
+            max_hedge_ratio: Hedges allowed as a share of requests (0 disables hedging)
+            max_retries: Retries after a timeout, connection error or 5xx answer
+            backoff_seconds: Backoff before the first retry, doubled for each further one
+            min_samples: Latencies an endpoint needs before its timeout and hedge delay adapt
+            window: Recent latencies kept per endpoint
+            breaker: Circuit breaker shared by all endpoints (defaults to a new one)
+        """
+        self.default_timeout = default_timeout
+        self.connect_timeout = connect_timeout
+        self.min_timeout = min_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.hedge_quantile = hedge_quantile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.min_samples = min_samples
+        self.window = window
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread_sessions = threading.local()
+
+    @classmethod
+    def from_env(cls) -> 'TailLatencyGuard':
+        """Create a guard configured by the FOOTBALL_API_* environment variables."""
+        return cls(
+            default_timeout=float(os.getenv('FOOTBALL_API_TIMEOUT', str(DEFAULT_TIMEOUT))),
+            max_hedge_ratio=float(os.getenv('FOOTBALL_API_MAX_HEDGE_RATIO', '0.1')),
+            max_retries=int(os.getenv('FOOTBALL_API_MAX_RETRIES', '2')),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv('FOOTBALL_API_BREAKER_THRESHOLD', '5')),
+                reset_seconds=float(os.getenv('FOOTBALL_API_BREAKER_RESET_SECONDS', '30')),
+            ),
+        )
+
+    def _endpoint(self, key: str) -> _EndpointStats:
+        with self._lock:
+            if key not in self._endpoints:
+                self._endpoints[key] = _EndpointStats(self.window)
+            return self._endpoints[key]
+
+    def _latencies(self, key: str) -> list:
+        """Sorted recent latencies of an endpoint, empty below min_samples."""
+        endpoint = self._endpoint(key)
+        with self._lock:
+            if len(endpoint.latencies) < self.min_samples:
+                return []
+            return sorted(endpoint.latencies)
+
+    def _count(self, key: str, counter: str):
+        endpoint = self._endpoint(key)
+        with self._lock:
+            endpoint.counts[counter] += 1
+
+    def timeout(self, endpoint: str) -> Tuple[float, float]:
+        """Connect and read timeout for the next request to an endpoint."""
+        latencies = self._latencies(endpoint_key(endpoint))
+        read = self.default_timeout
+        if latencies:
+            p99 = _percentile(latencies, 0.99)
+            read = min(self.default_timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+        return min(self.connect_timeout, read), read
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Seconds after which a GET to an endpoint is hedged, or None if it is not."""
+        if not self.max_hedge_ratio:
+            return None
+        latencies = self._latencies(endpoint_key(endpoint))
+        if not latencies:
+            return None
+        return _percentile(latencies, self.hedge_quantile)
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.max_hedge_ratio * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    def _send(self, session: requests.Session, key: str, url: str, params, headers, timeout) -> requests.Response:
+        """Send one GET and record its latency."""
+        start = time.monotonic()
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+        except requests.exceptions.Timeout:
+            self._count(key, 'timeouts')
+            raise
+        if response.status_code < 500 and response.status_code != 429:
+            endpoint = self._endpoint(key)
+            with self._lock:
+                endpoint.latencies.append(time.monotonic() - start)
+        return response
+
+    def _send_in_thread(self, session: requests.Session, key: str, url: str, params, headers, timeout):
+        """_send on an executor thread, with that thread's own copy of the session.
+
+        requests.Session is not thread-safe, so the primary GET and its hedge
+        must not share the client's session.
+        """
+        own = getattr(self._thread_sessions, 'session', None)
+        if own is None:
+            own = self._thread_sessions.session = requests.Session()
+        own.headers.clear()
+        own.headers.update(session.headers)
+        own.auth, own.proxies, own.verify, own.cert = session.auth, session.proxies, session.verify, session.cert
+        return self._send(own, key, url, params, headers, timeout)
+
+    def _hedged_send(
+        self,
+        session: requests.Session,
+        key: str,
+        url: str,
+        params,
+        auth: Callable[[bool], Optional[Dict[str, str]]],
+        timeout
+    ) -> requests.Response:
+        """Send a GET, and a second one if the first is slower than the hedge delay."""
+        delay = self.hedge_delay(key)
+        headers = auth(True)
+        if delay is None:
+            return self._send(session, key, url, params, headers, timeout)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='api-hedge')
+        primary = self._executor.submit(self._send_in_thread, session, key, url, params, headers, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge():
+            return primary.result()
+
+        try:
+            # Only a token that is free right now; waiting would defeat the hedge
+            hedge_headers = auth(False)
+        except TimeoutError:
+            with self._lock:
+                self._hedges -= 1
+            return primary.result()
+
+        self._count(key, 'hedges')
+        hedge = self._executor.submit(self._send_in_thread, session, key, url, params, hedge_headers, timeout)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                if future is hedge:
+                    self._count(key, 'hedge_wins')
+                # The loser finishes in the background; release its connection
+                for other in pending:
+                    other.add_done_callback(lambda f: f.exception() is None and f.result().close())
+                return future.result()
+        raise error
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        auth: Optional[Callable[[bool], Optional[Dict[str, str]]]] = None
+    ) -> requests.Response:
+        """GET an API endpoint within the guard's timeouts, hedging, retries and breaker.
+
+        Args:
+            session: Session to send the request with
+            url: Full request URL
+            endpoint: API endpoint the URL points to, used to group latencies
+            params: Query parameters
+            auth: Returns the headers for one request; called with False for hedges,
+                when it should raise TimeoutError rather than wait for a token
+
+        Returns:
+            The response, which may still be an error (4xx, or 5xx after the last retry)
+
+        Raises:
+            CircuitOpenError: The circuit is open
+            requests.exceptions.RequestException: The last attempt timed out or failed to connect
+        """
+        key = endpoint_key(endpoint)
+        auth = auth or (lambda blocking: None)
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self._count(key, 'rejected')
+                raise CircuitOpenError(
+                    f"Circuit open after repeated failures; not calling {endpoint} "
+                    f"for another {self.breaker.retry_in():.0f}s"
+                )
+            if attempt:
+                self._count(key, 'retries')
+            self._count(key, 'requests')
+            with self._lock:
+                self._requests += 1
+
+            try:
+                response = self._hedged_send(session, key, url, params, auth, self.timeout(endpoint))
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self._count(key, 'errors')
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Request to {endpoint} failed ({str(e)}); retrying")
+            else:
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                self._count(key, 'errors')
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    return response
+                logger.warning(f"Request to {endpoint} answered {response.status_code}; retrying")
+                response.close()
+            finally:
+                # A probe that ended without an outcome (no key in time, another
+                # request error) must not leave the breaker half-open for good
+                self.breaker.release_probe()
+
+            time.sleep(min(self.backoff_seconds * 2 ** attempt, 30.0) * random.uniform(0.5, 1.0))
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint counters, latency percentiles and timeouts, and the breaker state."""
+        endpoints = {}
+        with self._lock:
+            snapshot = {key: (sorted(e.latencies), dict(e.counts)) for key, e in self._endpoints.items()}
+        for key, (latencies, counts) in snapshot.items():
+            stats = {
+                counter: counts.get(counter, 0)
+                for counter in ('requests', 'errors', 'timeouts', 'retries', 'hedges', 'hedge_wins', 'rejected')
+            }
+            for name, quantile in (('p50_ms', 0.5), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+                stats[name] = round(_percentile(latencies, quantile) * 1000, 1) if latencies else None
+            stats['timeout_s'] = round(self.timeout(key)[1], 2)
+            endpoints[key] = stats
+        return {'circuit': self.breaker.stats(), 'endpoints': endpoints}
+
+    def log_stats(self):
+        """Log request outcomes and latencies per endpoint and the breaker state."""
+        stats = self.stats()
+        for key, endpoint in sorted(stats['endpoints'].items()):
+            latency = (
+                f"p50 {endpoint['p50_ms']:.0f}ms, p99 {endpoint['p99_ms']:.0f}ms"
+                if endpoint['p50_ms'] is not None else 'no latencies'
+            )
+            logger.info(
+                f"API {key}: {endpoint['requests']} requests ({endpoint['retries']} retries), "
+                f"{endpoint['errors']} errors ({endpoint['timeouts']} timeouts), "
+                f"{endpoint['hedges']} hedged ({endpoint['hedge_wins']} won), "
+                f"{endpoint['rejected']} rejected by the breaker; {latency}, timeout {endpoint['timeout_s']:g}s"
+            )
+        circuit = stats['circuit']
+        logger.info(f"API circuit {circuit['state']}, opened {circuit['opened']} times")
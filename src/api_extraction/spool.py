@@ -0,0 +1,298 @@
+"""Durable on-disk spool between API extraction and database loading.
+
+Fetched payloads are appended to the spool before anything touches the
+database, so API quota spent on a run is never lost to a slow or unavailable
+Postgres: loads can be retried, batched or replayed from disk at database
+speed.
+
+Layout of a spool directory:
+
+    index.json                       committed segments and their last sequence number
+    segments/<first seq>.jsonl.gz    gzip-compressed JSON lines, one record per line
+    segments/<first seq>.idx         byte offset of each record in its segment (8 bytes each)
+    offsets/<consumer>.json          last sequence number each consumer has loaded
+    .lock                            serializes writers across processes
+
+Each record is written as its own gzip member and fsynced before the index is
+updated, so the index is the commit point: bytes past a segment's committed
+length (a write torn by a crash) are truncated by the next append and never
+read. The record offsets let a read start at any sequence number instead of
+decompressing its segment from the beginning.
+"""
+
+import io
+import os
+import sys
+import json
+import gzip
+import time
+import fcntl
+import struct
+import logging
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Segments roll over once they reach this size (compressed)
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Entry of a segment's offsets file: the byte offset of one record's gzip member
+OFFSET_ENTRY = struct.Struct('<Q')
+
+
+def _write_json_atomic(path: str, data: Any):
+    """Replace a JSON file so readers see either the old or the new version."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class PayloadSpool:
+    """Append-only, segmented spool of fetched API payloads."""
+
+    def __init__(self, directory: Optional[str] = None, segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        """Initialize the spool, creating its directory if needed.
+
+        Args:
+            directory: Spool directory (defaults to FOOTBALL_SPOOL_DIR or ./spool)
+            segment_bytes: Size at which the current segment is closed and a new one started
+        """
+        self.directory = directory or os.getenv('FOOTBALL_SPOOL_DIR', 'spool')
+        self.segment_bytes = segment_bytes
+        self.segments_dir = os.path.join(self.directory, 'segments')
+        self.offsets_dir = os.path.join(self.directory, 'offsets')
+        self.index_path = os.path.join(self.directory, 'index.json')
+        os.makedirs(self.segments_dir, exist_ok=True)
+        os.makedirs(self.offsets_dir, exist_ok=True)
+
+    @contextmanager
+    def _locked(self, name: str = '.lock'):
+        """Hold an exclusive lock on a file in the spool directory."""
+        with open(os.path.join(self.directory, name), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self) -> List[Dict]:
+        """Committed segments, oldest first."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path) as f:
+            return json.load(f)['segments']
+
+    def _segment_path(self, segment: Dict) -> str:
+        return os.path.join(self.segments_dir, segment['name'])
+
+    def _offsets_path(self, segment: Dict) -> str:
+        return os.path.join(self.segments_dir, segment['name'].replace('.jsonl.gz', '.idx'))
+
+    def _member_range(self, segment: Dict, after_seq: int, limit: Optional[int]) -> Tuple[int, int]:
+        """Byte range of a segment holding its records after after_seq, at most limit of them.
+
+        Segments written before offsets were recorded have no offsets file (or
+        zeros for their first records) and are read from the start.
+        """
+        committed = segment['last_seq'] - segment['first_seq'] + 1
+        first = max(after_seq + 1 - segment['first_seq'], 0)
+        last = committed if limit is None else min(first + limit, committed)
+        try:
+            with open(self._offsets_path(segment), 'rb') as f:
+                f.seek(first * OFFSET_ENTRY.size)
+                start, = OFFSET_ENTRY.unpack(f.read(OFFSET_ENTRY.size))
+                if last >= committed:
+                    return start, segment['bytes']
+                f.seek(last * OFFSET_ENTRY.size)
+                end, = OFFSET_ENTRY.unpack(f.read(OFFSET_ENTRY.size))
+        except (FileNotFoundError, struct.error):
+            return 0, segment['bytes']
+        # Records appended before the offsets file existed are recorded as 0
+        return (start, end) if end > start else (0, segment['bytes'])
+
+    def append(self, entity: str, payload: Any, competition_id: Optional[int] = None, **metadata) -> int:
+        """Durably append one fetched payload.
+
+        Args:
+            entity: Entity name ('teams', 'standings' or 'matches')
+            payload: API payload as returned in dictionary mode
+            competition_id: Competition the payload was fetched for
+            **metadata: Extra fields stored with the record (e.g. the date range)
+
+        Returns:
+            Sequence number of the record
+        """
+        with self._locked():
+            segments = self._read_index()
+            seq = segments[-1]['last_seq'] + 1 if segments else 1
+
+            if not segments or segments[-1]['bytes'] >= self.segment_bytes:
+                segments.append({'name': f"{seq:020d}.jsonl.gz", 'first_seq': seq, 'last_seq': seq - 1, 'bytes': 0})
+            segment = segments[-1]
+
+            line = json.dumps({
+                'seq': seq,
+                'entity': entity,
+                'competition_id': competition_id,
+                'fetched_at': datetime.utcnow().isoformat(),
+                'payload': payload,
+                **metadata,
+            }, default=str)
+            member = gzip.compress(line.encode('utf-8') + b'\n')
+
+            with open(self._segment_path(segment), 'ab') as f:
+                # Drop anything past the committed length left by an interrupted append
+                f.truncate(segment['bytes'])
+                f.write(member)
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._offsets_path(segment), 'ab') as f:
+                f.truncate((segment['last_seq'] - segment['first_seq'] + 1) * OFFSET_ENTRY.size)
+                f.write(OFFSET_ENTRY.pack(segment['bytes']))
+                f.flush()
+                os.fsync(f.fileno())
+
+            segment['last_seq'] = seq
+            segment['bytes'] += len(member)
+            _write_json_atomic(self.index_path, {'segments': segments})
+            return seq
+
+    def last_seq(self) -> int:
+        """Sequence number of the newest committed record (0 if the spool is empty)."""
+        segments = self._read_index()
+        return segments[-1]['last_seq'] if segments else 0
+
+    def read(self, after_seq: int = 0, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Read committed records in order.
+
+        Args:
+            after_seq: Only return records with a higher sequence number
+            limit: Maximum number of records to return
+
+        Yields:
+            Records with seq, entity, competition_id, fetched_at and payload
+        """
+        returned = 0
+        for segment in self._read_index():
+            if segment['last_seq'] <= after_seq:
+                continue
+            # Only committed records are read, never a concurrent or torn append
+            start, end = self._member_range(
+                segment, after_seq, None if limit is None else limit - returned
+            )
+            with open(self._segment_path(segment), 'rb') as f:
+                f.seek(start)
+                committed = io.BytesIO(f.read(end - start))
+            with gzip.GzipFile(fileobj=committed) as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record['seq'] <= after_seq:
+                        continue
+                    yield record
+                    returned += 1
+                    if limit is not None and returned >= limit:
+                        return
+
+    def get_offset(self, consumer: str) -> int:
+        """Last sequence number a consumer has processed (0 if it never ran)."""
+        path = os.path.join(self.offsets_dir, f"{consumer}.json")
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            return json.load(f)['seq']
+
+    def commit_offset(self, consumer: str, seq: int):
+        """Record that a consumer has processed every record up to seq."""
+        _write_json_atomic(
+            os.path.join(self.offsets_dir, f"{consumer}.json"),
+            {'seq': seq, 'committed_at': datetime.utcnow().isoformat()}
+        )
+
+    @contextmanager
+    def consumer_lock(self, consumer: str):
+        """Allow only one process at a time to drain the spool as a consumer."""
+        with self._locked(f".{consumer}.lock"):
+            yield
+
+    def purge(self, up_to_seq: int, min_age_seconds: float = 0) -> int:
+        """Delete closed segments whose records are all at or below up_to_seq.
+
+        Args:
+            up_to_seq: Records up to this sequence number are no longer needed
+            min_age_seconds: Keep segments modified more recently than this, for replays
+
+        Returns:
+            Number of segments deleted
+        """
+        with self._locked():
+            segments = self._read_index()
+            # The newest segment is still being appended to and is always kept
+            cutoff = time.time() - min_age_seconds
+            removable = [
+                segment for segment in segments[:-1]
+                if segment['last_seq'] <= up_to_seq and os.path.getmtime(self._segment_path(segment)) < cutoff
+            ]
+            if not removable:
+                return 0
+
+            _write_json_atomic(self.index_path, {'segments': [s for s in segments if s not in removable]})
+            for segment in removable:
+                os.remove(self._segment_path(segment))
+                if os.path.exists(self._offsets_path(segment)):
+                    os.remove(self._offsets_path(segment))
+            logger.info(f"Purged {len(removable)} spool segments up to record {up_to_seq}")
+            return len(removable)
+
+    def status(self) -> Dict[str, Any]:
+        """Size of the spool and the position of every consumer."""
+        segments = self._read_index()
+        consumers = sorted(name[:-len('.json')] for name in os.listdir(self.offsets_dir) if name.endswith('.json'))
+        last_seq = self.last_seq()
+        return {
+            'segments': len(segments),
+            'bytes': sum(segment['bytes'] for segment in segments),
+            'first_seq': segments[0]['first_seq'] if segments else 0,
+            'last_seq': last_seq,
+            'consumers': {
+                consumer: {'offset': self.get_offset(consumer), 'lag': last_seq - self.get_offset(consumer)}
+                for consumer in consumers
+            },
+        }
+
+
+def main():
+    """Inspect, drain or rewind a spool from the command line."""
+    parser = argparse.ArgumentParser(description='Manage the extraction spool')
+    parser.add_argument('command', choices=['status', 'drain', 'rewind'])
+    parser.add_argument('--dir', help='Spool directory (defaults to FOOTBALL_SPOOL_DIR)')
+    parser.add_argument('--consumer', default='database_loader')
+    parser.add_argument('--to-seq', type=int, default=0, help='Offset to rewind to; later records are loaded again')
+    args = parser.parse_args()
+
+    spool = PayloadSpool(args.dir)
+    if args.command == 'status':
+        print(json.dumps(spool.status(), indent=2))
+    elif args.command == 'rewind':
+        with spool.consumer_lock(args.consumer):
+            spool.commit_offset(args.consumer, args.to_seq)
+        logger.info(f"Consumer {args.consumer} rewound to record {args.to_seq}")
+    else:
+        from database_loader import create_database_loader
+        from extract_football_data import load_spool
+
+        try:
+            load_spool(create_database_loader(), spool, consumer=args.consumer)
+        except Exception as e:
+            logger.error(f"Draining the spool failed: {str(e)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Elo team ratings computed with NumPy over the full match history.
+
+Matches are read from analytics.match_results in date order and rated in
+batches of one calendar day: every match of a day is rated from the ratings
+as they stood before that day, and the rating changes are applied together.
+A team plays at most once a day, so this gives the same result as rating the
+matches one by one, while each batch is a handful of array operations.
+
+Ratings use the World Football Elo formula: a K-factor scaled by the goal
+margin, and a home advantage added to the home team's rating when computing
+the expected result. State is kept in ratings.team_ratings, so a run only
+rates matches newer than the last rated one.
+"""
+
+import os
+import sys
+import argparse
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import (
+    create_engine, Table, Column, Integer, String, DateTime, Float, MetaData, text
+)
+from sqlalchemy.dialects.postgresql import insert
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+BASE_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 65.0
+
+# Kept outside the analytics schema, which is swapped on every dbt build
+RATINGS_SCHEMA = 'ratings'
+
+
+def goal_margin_multiplier(goal_difference: np.ndarray) -> np.ndarray:
+    """K-factor multiplier for the goal margin (1, 1.5, then (11 + margin) / 8).
+
+    Args:
+        goal_difference: Home goals minus away goals per match
+
+    Returns:
+        Multiplier per match
+    """
+    margin = np.abs(goal_difference).astype(np.float64)
+    return np.where(margin <= 1, 1.0, np.where(margin == 2, 1.5, (11.0 + margin) / 8.0))
+
+
+def rate_matches(
+    ratings: np.ndarray,
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_goals: np.ndarray,
+    away_goals: np.ndarray,
+    match_days: np.ndarray,
+    k_factor: float = K_FACTOR,
+    home_advantage: float = HOME_ADVANTAGE
+) -> np.ndarray:
+    """Apply Elo updates for date-ordered matches, one day per batch.
+
+    Args:
+        ratings: Rating per team index; updated in place
+        home_idx: Home team index per match
+        away_idx: Away team index per match
+        home_goals: Home goals per match
+        away_goals: Away goals per match
+        match_days: Day of each match (any sortable integer or datetime64[D]),
+            non-decreasing
+        k_factor: Base K-factor
+        home_advantage: Rating points added to the home team for the expectation
+
+    Returns:
+        Home team rating change per match
+    """
+    goal_difference = home_goals.astype(np.int64) - away_goals.astype(np.int64)
+    actual = np.where(goal_difference > 0, 1.0, np.where(goal_difference < 0, 0.0, 0.5))
+    k = k_factor * goal_margin_multiplier(goal_difference)
+    deltas = np.empty(len(home_idx), dtype=np.float64)
+
+    if len(match_days) == 0:
+        return deltas
+
+    starts = np.flatnonzero(np.r_[True, match_days[1:] != match_days[:-1]])
+    ends = np.r_[starts[1:], len(match_days)]
+
+    for start, end in zip(starts, ends):
+        home = home_idx[start:end]
+        away = away_idx[start:end]
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[away] - ratings[home] - home_advantage) / 400.0))
+        delta = k[start:end] * (actual[start:end] - expected)
+        # add.at accumulates correctly should a team appear twice in a batch
+        np.add.at(ratings, home, delta)
+        np.add.at(ratings, away, -delta)
+        deltas[start:end] = delta
+
+    return deltas
+
+
+class TeamRatingEngine:
+    """Maintain Elo ratings for every team in analytics.match_results."""
+
+    def __init__(
+        self,
+        connection_string: Optional[str] = None,
+        k_factor: float = K_FACTOR,
+        home_advantage: float = HOME_ADVANTAGE
+    ):
+        """Initialize the rating engine.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            k_factor: Base K-factor
+            home_advantage: Rating points added to the home team for the expectation
+        """
+        if not connection_string:
+            host = os.getenv('POSTGRES_HOST', 'localhost')
+            port = os.getenv('POSTGRES_PORT', '5432')
+            db = os.getenv('POSTGRES_DB', 'football_analytics')
+            user = os.getenv('POSTGRES_USER', 'airflow')
+            password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+            connection_string = f'postgresql://{user}:{password}@{host}:{port}/{db}'
+
+        self.engine = create_engine(connection_string)
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the ratings schema and table if they don't exist."""
+        with self.engine.connect() as conn:
+            conn.execute(text(f'create schema if not exists {RATINGS_SCHEMA}'))
+            conn.commit()
+
+        metadata = MetaData(schema=RATINGS_SCHEMA)
+        self.team_ratings_table = Table(
+            'team_ratings',
+            metadata,
+            Column('team_id', Integer, primary_key=True),
+            Column('team_name', String),
+            Column('rating', Float),
+            Column('matches_rated', Integer),
+            Column('last_match_id', Integer),
+            Column('last_match_date', DateTime),
+            Column('updated_at', DateTime, default=datetime.utcnow),
+            schema=RATINGS_SCHEMA
+        )
+        metadata.create_all(self.engine)
+
+    def _load_state(self) -> pd.DataFrame:
+        """Stored ratings, one row per team."""
+        with self.engine.connect() as conn:
+            return pd.read_sql(
+                text(f'select team_id, team_name, rating, matches_rated, last_match_id, last_match_date '
+                     f'from {RATINGS_SCHEMA}.team_ratings'),
+                conn
+            )
+
+    def _fetch_matches(self, after: Optional[Tuple[datetime, int]]) -> pd.DataFrame:
+        """Finished matches in rating order, optionally only those after a watermark."""
+        query = (
+            'select match_id, match_date, home_team_id, home_team_name, away_team_id, away_team_name, '
+            'home_score, away_score from analytics.match_results '
+            'where home_score is not null and away_score is not null'
+        )
+        params = {}
+        if after is not None:
+            query += ' and (match_date, match_id) > (:last_match_date, :last_match_id)'
+            params = {'last_match_date': after[0], 'last_match_id': after[1]}
+        query += ' order by match_date, match_id'
+
+        with self.engine.connect() as conn:
+            return pd.read_sql(text(query), conn, params=params)
+
+    def update(self, full_refresh: bool = False) -> int:
+        """Rate all matches played since the last run and store the new ratings.
+
+        Results that arrive for dates before the last rated match are not
+        picked up incrementally; run with full_refresh to rate them.
+
+        Args:
+            full_refresh: Discard stored ratings and rate the full history
+
+        Returns:
+            Number of matches rated
+        """
+        state = self._load_state()
+        if full_refresh or state.empty:
+            state = state.iloc[0:0]
+            watermark = None
+        else:
+            latest = state.sort_values(['last_match_date', 'last_match_id']).iloc[-1]
+            watermark = (latest['last_match_date'].to_pydatetime(), int(latest['last_match_id']))
+
+        matches = self._fetch_matches(watermark)
+        if matches.empty:
+            logger.info("No new matches to rate")
+            return 0
+
+        # Dense team indices over stored and newly seen teams
+        team_ids, inverse = np.unique(
+            np.concatenate([
+                state['team_id'].to_numpy(dtype=np.int64),
+                matches['home_team_id'].to_numpy(dtype=np.int64),
+                matches['away_team_id'].to_numpy(dtype=np.int64),
+            ]),
+            return_inverse=True
+        )
+        n_state, n_matches = len(state), len(matches)
+        state_idx = inverse[:n_state]
+        home_idx = inverse[n_state:n_state + n_matches]
+        away_idx = inverse[n_state + n_matches:]
+
+        ratings = np.full(len(team_ids), BASE_RATING)
+        ratings[state_idx] = state['rating'].to_numpy(dtype=np.float64)
+        matches_rated = np.zeros(len(team_ids), dtype=np.int64)
+        matches_rated[state_idx] = state['matches_rated'].to_numpy(dtype=np.int64)
+
+        rate_matches(
+            ratings,
+            home_idx,
+            away_idx,
+            matches['home_score'].to_numpy(),
+            matches['away_score'].to_numpy(),
+            matches['match_date'].to_numpy(dtype='datetime64[D]'),
+            k_factor=self.k_factor,
+            home_advantage=self.home_advantage
+        )
+        matches_rated += np.bincount(home_idx, minlength=len(team_ids))
+        matches_rated += np.bincount(away_idx, minlength=len(team_ids))
+
+        self._store(team_ids, ratings, matches_rated, matches, home_idx, away_idx, replace=watermark is None)
+        logger.info(f"Rated {n_matches} matches for {len(team_ids)} teams")
+        return n_matches
+
+    def _store(
+        self,
+        team_ids: np.ndarray,
+        ratings: np.ndarray,
+        matches_rated: np.ndarray,
+        matches: pd.DataFrame,
+        home_idx: np.ndarray,
+        away_idx: np.ndarray,
+        replace: bool
+    ):
+        """Upsert ratings of the teams that played in the rated matches."""
+        # Last match (and the name used in it) per team, from the date-ordered batch
+        appearances = pd.DataFrame({
+            'idx': np.concatenate([home_idx, away_idx]),
+            'team_name': np.concatenate([matches['home_team_name'].to_numpy(), matches['away_team_name'].to_numpy()]),
+            'match_id': np.tile(matches['match_id'].to_numpy(), 2),
+            'match_date': np.tile(matches['match_date'].to_numpy(), 2),
+            'order': np.tile(np.arange(len(matches)), 2),
+        })
+        last = appearances.sort_values('order').groupby('idx').last()
+
+        updated_at = datetime.utcnow()
+        records = [
+            {
+                'team_id': int(team_ids[idx]),
+                'team_name': row.team_name,
+                'rating': float(ratings[idx]),
+                'matches_rated': int(matches_rated[idx]),
+                'last_match_id': int(row.match_id),
+                'last_match_date': pd.Timestamp(row.match_date).to_pydatetime(),
+                'updated_at': updated_at,
+            }
+            for idx, row in zip(last.index, last.itertuples())
+        ]
+
+        with self.engine.connect() as conn:
+            if replace:
+                conn.execute(self.team_ratings_table.delete())
+            stmt = insert(self.team_ratings_table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['team_id'],
+                set_={
+                    'team_name': stmt.excluded.team_name,
+                    'rating': stmt.excluded.rating,
+                    'matches_rated': stmt.excluded.matches_rated,
+                    'last_match_id': stmt.excluded.last_match_id,
+                    'last_match_date': stmt.excluded.last_match_date,
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+            conn.execute(stmt, records)
+            conn.commit()
+
+
+def main():
+    """Update team ratings from analytics.match_results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--full-refresh', action='store_true', help='Re-rate the full match history')
+    args = parser.parse_args()
+
+    try:
+        TeamRatingEngine().update(full_refresh=args.full_refresh)
+    except Exception as e:
+        logger.error(f"Team rating update failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
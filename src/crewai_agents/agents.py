@@ -1,16 +1,8 @@
 """CrewAI agent definitions for football analytics team."""
 
 from crewai import Agent
-from langchain.llms import OpenAI
-import os
 
-
-# Initialize LLM (can be configured for DeepSeek or other providers)
-llm = OpenAI(
-    temperature=0.7,
-    model_name="gpt-3.5-turbo",
-    openai_api_key=os.getenv("OPENAI_API_KEY")
-)
+from llm import get_llm
 
 
 def create_bi_analyst() -> Agent:
@@ -38,7 +30,7 @@ def create_bi_analyst() -> Agent:
         pipeline delivers the insights stakeholders need.""",
         verbose=True,
         allow_delegation=True,
-        llm=llm
+        llm=get_llm()
     )
 
 
@@ -67,7 +59,7 @@ def create_data_analyst() -> Agent:
         clean, well-modeled, and ready for visualization.""",
         verbose=True,
         allow_delegation=True,
-        llm=llm
+        llm=get_llm()
     )
 
 
@@ -97,7 +89,7 @@ def create_data_engineer() -> Agent:
         handling all the technical complexity so analysts can focus on insights.""",
         verbose=True,
         allow_delegation=True,
-        llm=llm
+        llm=get_llm()
     )
 
 
@@ -128,5 +120,5 @@ def create_lead_data_engineer() -> Agent:
         and working towards the same goals.""",
         verbose=True,
         allow_delegation=True,
-        llm=llm
+        llm=get_llm()
     )
@@ -0,0 +1,255 @@
+"""Compact, token-budgeted project context for the crew's review tasks.
+
+Instead of each task re-describing the pipeline (and agents reasoning about it
+from scratch), the review tasks embed a precomputed summary of:
+
+- lineage: every dbt model, its materialization and its ref()/source() inputs;
+- columns: column lists of the raw, staging and analytics relations (from the
+  warehouse, or the documented columns in schema.yml when it is unreachable);
+- warehouse: row counts and sizes of the raw tables;
+- loaders: public signatures of the extraction and loading code.
+
+Sections are computed once per run and cached on disk under a hash of the
+source files they are derived from (plus the date, so warehouse statistics
+refresh daily). Each task takes the sections it needs, trimmed to a token
+budget.
+"""
+
+import os
+import re
+import ast
+import json
+import glob
+import hashlib
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import yaml
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DBT_MODELS_DIR = os.path.join(REPO_ROOT, 'dbt_football', 'models')
+LOADER_FILES = [
+    os.path.join(REPO_ROOT, 'src', 'api_extraction', name)
+    for name in ('football_api_client.py', 'extract_football_data.py', 'database_loader.py', 'refresh_planner.py')
+]
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache')
+
+SECTIONS = ('lineage', 'columns', 'warehouse', 'loaders')
+WAREHOUSE_SCHEMAS = ('raw', 'staging', 'analytics')
+
+# Rough token estimate; close enough for budgeting English and code
+CHARS_PER_TOKEN = 4
+
+REF_PATTERN = re.compile(r"ref\(\s*['\"](\w+)['\"]\s*\)")
+SOURCE_PATTERN = re.compile(r"source\(\s*['\"](\w+)['\"]\s*,\s*['\"](\w+)['\"]\s*\)")
+MATERIALIZED_PATTERN = re.compile(r"materialized\s*=\s*\(?\s*['\"](\w+)['\"]")
+
+_sections: Dict[str, Dict[str, str]] = {}
+
+
+def _source_files() -> List[str]:
+    """Files the pack is derived from."""
+    models = glob.glob(os.path.join(DBT_MODELS_DIR, '**', '*.sql'), recursive=True)
+    schemas = glob.glob(os.path.join(DBT_MODELS_DIR, '**', '*.yml'), recursive=True)
+    return sorted(models + schemas) + LOADER_FILES
+
+
+def _files_hash(paths: List[str]) -> str:
+    digest = hashlib.sha256(date.today().isoformat().encode('utf-8'))
+    for path in paths:
+        digest.update(os.path.relpath(path, REPO_ROOT).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def dbt_lineage() -> str:
+    """One line per dbt model: layer.model (materialization) <- inputs."""
+    lines = []
+    for path in sorted(glob.glob(os.path.join(DBT_MODELS_DIR, '**', '*.sql'), recursive=True)):
+        layer = os.path.basename(os.path.dirname(path))
+        with open(path) as f:
+            sql = f.read()
+        materialized = MATERIALIZED_PATTERN.search(sql)
+        inputs = sorted(set(REF_PATTERN.findall(sql))) + sorted({f'{s}.{t}' for s, t in SOURCE_PATTERN.findall(sql)})
+        lines.append(
+            f"- {layer}.{os.path.splitext(os.path.basename(path))[0]} "
+            f"({materialized.group(1) if materialized else 'default'}) <- {', '.join(inputs) or '-'}"
+        )
+    return '\n'.join(lines)
+
+
+def documented_columns() -> str:
+    """Columns documented in the dbt schema.yml files."""
+    lines = []
+    for path in sorted(glob.glob(os.path.join(DBT_MODELS_DIR, '**', '*.yml'), recursive=True)):
+        with open(path) as f:
+            spec = yaml.safe_load(f) or {}
+        for model in spec.get('models', []):
+            columns = [column['name'] for column in model.get('columns', [])]
+            if columns:
+                lines.append(f"- {model['name']}: {', '.join(columns)} (documented only)")
+    return '\n'.join(lines)
+
+
+def _engine():
+    from sqlalchemy import create_engine
+
+    host = os.getenv('POSTGRES_HOST', 'localhost')
+    port = os.getenv('POSTGRES_PORT', '5432')
+    db = os.getenv('POSTGRES_DB', 'football_analytics')
+    user = os.getenv('POSTGRES_USER', 'airflow')
+    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+    return create_engine(
+        f'postgresql://{user}:{password}@{host}:{port}/{db}',
+        connect_args={'connect_timeout': 5}
+    )
+
+
+def warehouse_sections() -> Dict[str, str]:
+    """Column lists and raw table statistics read from the warehouse.
+
+    Returns:
+        Dictionary with 'columns' and 'warehouse' sections; empty if the
+        warehouse cannot be reached
+    """
+    from sqlalchemy import text
+
+    try:
+        with _engine().connect() as conn:
+            columns = conn.execute(text("""
+                select table_schema, table_name, string_agg(column_name, ', ' order by ordinal_position)
+                from information_schema.columns
+                where table_schema in :schemas
+                group by table_schema, table_name
+                order by table_schema, table_name
+            """).bindparams(schemas=WAREHOUSE_SCHEMAS)).fetchall()
+            stats = conn.execute(text("""
+                select relname, n_live_tup, pg_size_pretty(pg_total_relation_size(relid))
+                from pg_stat_user_tables
+                where schemaname = 'raw'
+                order by relname
+            """)).fetchall()
+    except Exception as e:
+        logger.warning(f"Warehouse unavailable for the context pack: {str(e)}")
+        return {}
+
+    return {
+        'columns': '\n'.join(f"- {schema}.{table}: {names}" for schema, table, names in columns),
+        'warehouse': '\n'.join(f"- raw.{table}: ~{rows:,} rows, {size}" for table, rows, size in stats),
+    }
+
+
+def _signature(node: ast.FunctionDef) -> str:
+    args = [arg.arg for arg in node.args.args if arg.arg not in ('self', 'cls')]
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ''
+    doc = ast.get_docstring(node)
+    summary = f": {doc.splitlines()[0]}" if doc else ''
+    return f"{node.name}({', '.join(args)}){returns}{summary}"
+
+
+def loader_signatures() -> str:
+    """Public functions and methods of the extraction and loading modules."""
+    lines = []
+    for path in LOADER_FILES:
+        with open(path) as f:
+            tree = ast.parse(f.read())
+        lines.append(f"{os.path.basename(path)}:")
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and not node.name.startswith('_'):
+                lines.append(f"- {_signature(node)}")
+            elif isinstance(node, ast.ClassDef):
+                for method in node.body:
+                    if isinstance(method, ast.FunctionDef) and not method.name.startswith('_'):
+                        lines.append(f"- {node.name}.{_signature(method)}")
+    return '\n'.join(lines)
+
+
+def _compute_sections() -> Dict[str, str]:
+    sections = {'lineage': dbt_lineage(), 'loaders': loader_signatures()}
+    sections.update(warehouse_sections())
+    return sections
+
+
+def load_sections(use_cache: bool = True) -> Dict[str, str]:
+    """All pack sections, from memory, the disk cache, or computed.
+
+    Args:
+        use_cache: Read and write the on-disk cache
+
+    Returns:
+        Dictionary of section name to text
+    """
+    key = _files_hash(_source_files())
+    if key in _sections:
+        return _sections[key]
+
+    cache_path = os.path.join(CACHE_DIR, f'context_pack_{key[:16]}.json')
+    if use_cache and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            sections = json.load(f)
+    else:
+        sections = _compute_sections()
+        # Without the warehouse the pack is incomplete; retry on the next run
+        if use_cache and 'warehouse' in sections:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'w') as f:
+                json.dump(sections, f)
+        sections.setdefault('columns', documented_columns())
+        sections.setdefault('warehouse', 'Unavailable (warehouse not reachable when the pack was built)')
+
+    _sections[key] = sections
+    return sections
+
+
+def _trim(text: str, max_chars: int) -> str:
+    """Cut text to whole lines within max_chars, noting what was left out."""
+    if len(text) <= max_chars:
+        return text
+    lines = text.splitlines()
+    kept, used = [], 0
+    for line in lines:
+        if used + len(line) + 1 > max_chars - 40:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    kept.append(f"... ({len(lines) - len(kept)} more lines omitted)")
+    return '\n'.join(kept)
+
+
+def build_context_pack(sections: Sequence[str] = SECTIONS, max_tokens: Optional[int] = None) -> str:
+    """Render the requested sections within a token budget.
+
+    The budget is shared evenly; a section that needs less leaves the rest to
+    the sections after it.
+
+    Args:
+        sections: Section names, in the order they appear
+        max_tokens: Token budget (defaults to CREW_CONTEXT_PACK_TOKENS or 1200)
+
+    Returns:
+        Markdown text of the context pack
+    """
+    max_tokens = max_tokens or int(os.getenv('CREW_CONTEXT_PACK_TOKENS', '1200'))
+    available = load_sections()
+    remaining = max_tokens * CHARS_PER_TOKEN
+
+    parts = []
+    for i, name in enumerate(sections):
+        heading = f"## {name.capitalize()}\n"
+        share = remaining // (len(sections) - i)
+        body = _trim(available[name], max(0, share - len(heading)))
+        parts.append(heading + body)
+        remaining -= len(heading) + len(body)
+
+    pack = '\n\n'.join(parts)
+    logger.info(f"Context pack ({', '.join(sections)}): ~{len(pack) // CHARS_PER_TOKEN} tokens")
+    return pack
+
+
+if __name__ == "__main__":
+    print(build_context_pack(max_tokens=100000))
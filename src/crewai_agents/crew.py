@@ -1,12 +1,17 @@
 """CrewAI crew setup for football analytics team."""
 
-from crewai import Crew, Process
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Set
+
+from crewai import Crew, Process, Task
 from agents import (
     create_bi_analyst,
     create_data_analyst,
     create_data_engineer,
     create_lead_data_engineer
 )
+from llm import log_cache_stats
 from tasks import (
     create_bi_requirements_task,
     create_technical_specs_task,
@@ -35,17 +40,12 @@ def create_football_analytics_crew() -> Crew:
         lead_engineer,
         context=[task_bi_requirements]
     )
-    task_pipeline_review = create_pipeline_review_task(
-        data_engineer,
-        context=[task_technical_specs]
-    )
-    task_dbt_review = create_dbt_review_task(
-        data_analyst,
-        context=[task_technical_specs]
-    )
+    # The reviews read the project context pack instead of earlier outputs
+    task_pipeline_review = create_pipeline_review_task(data_engineer)
+    task_dbt_review = create_dbt_review_task(data_analyst)
     task_visualization_plan = create_visualization_plan_task(
         bi_analyst,
-        context=[task_dbt_review]
+        context=[task_technical_specs]
     )
     task_implementation_summary = create_implementation_summary_task(
         lead_engineer,
@@ -74,11 +74,76 @@ def create_football_analytics_crew() -> Crew:
     return crew
 
 
-def run_crew():
-    """Execute the football analytics crew."""
+def task_dependencies(tasks: List[Task]) -> Dict[int, Set[int]]:
+    """Derive the task dependency graph from each task's context.
+
+    Args:
+        tasks: Tasks in crew order
+
+    Returns:
+        Dictionary of task index to the indices of the tasks it depends on
+    """
+    index = {id(task): i for i, task in enumerate(tasks)}
+    dependencies = {}
+    for i, task in enumerate(tasks):
+        upstream = set()
+        for context_task in task.context or []:
+            if id(context_task) not in index:
+                raise ValueError(f"Task {i} depends on a task that is not part of the crew")
+            upstream.add(index[id(context_task)])
+        dependencies[i] = upstream
+    return dependencies
+
+
+def run_tasks_parallel(tasks: List[Task], max_workers: Optional[int] = None) -> str:
+    """Execute tasks as soon as the tasks in their context have finished.
+
+    Independent tasks (e.g. the pipeline and dbt reviews, which both only need
+    the technical specs) run concurrently on a thread pool; a task reads its
+    context from the outputs of the tasks it depends on. Tasks assigned to the
+    same agent never run at the same time.
+
+    Args:
+        tasks: Tasks in crew order
+        max_workers: Maximum number of tasks running at once
+
+    Returns:
+        Output of the last task
+    """
+    dependencies = task_dependencies(tasks)
+    agent_locks = {id(task.agent): threading.Lock() for task in tasks}
+    outputs = {}
+
+    def execute(i: int) -> str:
+        with agent_locks[id(tasks[i].agent)]:
+            return tasks[i].execute()
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as executor:
+        running = {}
+        while len(outputs) < len(tasks):
+            for i in range(len(tasks)):
+                if i not in outputs and i not in running.values() and dependencies[i] <= outputs.keys():
+                    running[executor.submit(execute, i)] = i
+            if not running:
+                raise ValueError("Task context contains a cycle")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                outputs[running.pop(future)] = future.result()
+
+    return outputs[len(tasks) - 1]
+
+
+def run_crew(parallel: bool = True):
+    """Execute the football analytics crew.
+
+    Args:
+        parallel: Run independent tasks concurrently instead of one by one
+    """
     crew = create_football_analytics_crew()
-    result = crew.kickoff()
-    return result
+    if not parallel:
+        return crew.kickoff()
+    return run_tasks_parallel(crew.tasks)
 
 
 if __name__ == "__main__":
@@ -89,3 +154,4 @@ if __name__ == "__main__":
     print("Crew execution completed!")
     print("\nFinal Output:")
     print(result)
+    log_cache_stats()
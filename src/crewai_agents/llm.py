@@ -0,0 +1,73 @@
+"""Shared LLM for the crew, built on first use."""
+
+import os
+import threading
+
+from llm_cache import CACHE_MODES, DEFAULT_CACHE_PATH, CachedLLM, LLMResponseCache
+
+# Model parameters; also part of every response cache key
+LLM_PARAMS = {
+    'model_name': 'gpt-3.5-turbo',
+    'temperature': 0.7,
+}
+
+_llm = None
+_lock = threading.Lock()
+
+
+def _build_llm():
+    """Build the model, wrapped in the response cache unless it is switched off."""
+    mode = os.getenv('CREW_LLM_CACHE_MODE', 'read_write')
+    if mode not in CACHE_MODES:
+        raise ValueError(f"CREW_LLM_CACHE_MODE must be one of {', '.join(CACHE_MODES)}, got {mode!r}")
+
+    inner = None
+    # Replay answers from recorded responses only, so no client (or API key) is needed
+    if mode != 'replay':
+        from langchain.llms import OpenAI
+
+        # Can be configured for DeepSeek or other providers
+        inner = OpenAI(openai_api_key=os.getenv("OPENAI_API_KEY"), **LLM_PARAMS)
+    if mode == 'off':
+        return inner
+
+    cache = LLMResponseCache(
+        path=os.getenv('CREW_LLM_CACHE_PATH', DEFAULT_CACHE_PATH),
+        ttl_hours=float(os.getenv('CREW_LLM_CACHE_TTL_HOURS', str(24 * 7))),
+        max_entries=int(os.getenv('CREW_LLM_CACHE_MAX_ENTRIES', '10000'))
+    )
+    return CachedLLM(inner=inner, cache=cache, llm_params=LLM_PARAMS, mode=mode)
+
+
+def get_llm():
+    """Get the shared LLM, constructing it on the first call.
+
+    Importing the agents module no longer builds an OpenAI client (or needs
+    OPENAI_API_KEY); the client is created when the first agent is.
+
+    Returns:
+        LangChain LLM used by every agent
+    """
+    global _llm
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                _llm = _build_llm()
+    return _llm
+
+
+def set_llm(llm):
+    """Use the given LLM for agents created from now on (e.g. another provider).
+
+    Args:
+        llm: LangChain LLM
+    """
+    global _llm
+    with _lock:
+        _llm = llm
+
+
+def log_cache_stats():
+    """Log the response cache hit rate and model time saved, if the cache is on."""
+    if isinstance(_llm, CachedLLM):
+        _llm.cache.log_stats()
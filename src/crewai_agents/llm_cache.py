@@ -0,0 +1,174 @@
+"""Persistent, content-addressed cache for the crew's LLM responses.
+
+Responses are stored in SQLite under a SHA-256 of the model parameters, the
+prompt and the stop words, so a crew run whose prompts did not change is
+answered from disk. Entries expire after a TTL, and the least recently used
+ones are evicted beyond a maximum entry count.
+
+Modes (CREW_LLM_CACHE_MODE):
+    read_write  Answer from the cache, call the model on a miss (default)
+    record      Always call the model and overwrite the cached response
+    replay      Answer only from the cache; a miss is an error, so a crew
+                runs fully offline and never needs an API key
+    off         No cache
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain.llms.base import LLM
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('read_write', 'record', 'replay', 'off')
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'llm_responses.sqlite')
+
+
+class CacheMiss(KeyError):
+    """Raised in replay mode when a prompt has no recorded response."""
+
+
+class LLMResponseCache:
+    """SQLite store of LLM responses with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_hours: float = 24 * 7, max_entries: int = 10000):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            ttl_hours: Hours a response stays valid
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            create table if not exists llm_responses (
+                key text primary key,
+                response text not null,
+                latency_seconds real not null,
+                created_at real not null,
+                last_used_at real not null
+            )
+        """)
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    @staticmethod
+    def make_key(llm_params: Dict[str, Any], prompt: str, stop: Optional[List[str]] = None) -> str:
+        """Hash of the model parameters, prompt and stop words."""
+        payload = json.dumps({'llm': llm_params, 'prompt': prompt, 'stop': stop}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Get a live response and count the hit or miss.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response, or None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'select response, latency_seconds, created_at from llm_responses where key = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute('update llm_responses set last_used_at = ? where key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.seconds_saved += row[1]
+            return row[0]
+
+    def store(self, key: str, response: str, latency_seconds: float):
+        """Store a response, then drop expired and least recently used entries.
+
+        Args:
+            key: Cache key from make_key
+            response: Model response
+            latency_seconds: Time the model took to answer
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'insert or replace into llm_responses values (?, ?, ?, ?, ?)',
+                (key, response, latency_seconds, now, now)
+            )
+            self._conn.execute('delete from llm_responses where created_at < ?', (now - self.ttl_seconds,))
+            self._conn.execute("""
+                delete from llm_responses where key in (
+                    select key from llm_responses order by last_used_at desc limit -1 offset ?
+                )
+            """, (self.max_entries,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, hit rate and model time saved since the cache was opened."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'seconds_saved': self.seconds_saved,
+            }
+
+    def log_stats(self):
+        """Log the hit rate and model time saved."""
+        stats = self.stats()
+        logger.info(
+            f"LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate), {stats['seconds_saved']:.1f}s of model time saved"
+        )
+
+
+class CachedLLM(LLM):
+    """LLM that answers from an LLMResponseCache before calling the wrapped model."""
+
+    inner: Optional[Any] = None
+    cache: Any
+    llm_params: Dict[str, Any]
+    mode: str = 'read_write'
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def _llm_type(self) -> str:
+        return 'cached'
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {'llm_params': self.llm_params, 'mode': self.mode}
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        key = self.cache.make_key(self.llm_params, prompt, stop)
+
+        if self.mode != 'record':
+            response = self.cache.lookup(key)
+            if response is not None:
+                return response
+            if self.mode == 'replay':
+                raise CacheMiss(f"No recorded response for prompt {key[:12]}; record the crew first")
+
+        start = time.monotonic()
+        response = self.inner.invoke(prompt, stop=stop)
+        self.cache.store(key, response, time.monotonic() - start)
+        return response
@@ -1,7 +1,9 @@
 """CrewAI task definitions for football analytics workflow."""
 
 from crewai import Task
-from typing import List
+from typing import List, Optional
+
+from context_pack import build_context_pack
 
 
 def create_bi_requirements_task(agent) -> Task:
@@ -72,85 +74,59 @@ def create_technical_specs_task(agent, context: List[Task]) -> Task:
     )
 
 
-def create_pipeline_review_task(agent, context: List[Task]) -> Task:
+def create_pipeline_review_task(agent, context: Optional[List[Task]] = None) -> Task:
     """Create task for Data Engineer to review pipeline implementation.
 
+    The project context pack describes the code, so the task needs no earlier
+    task outputs.
+
     Args:
         agent: Data Engineer agent
-        context: Previous tasks to use as context
+        context: Previous tasks to use as context (none by default)
 
     Returns:
         Task for reviewing pipeline implementation
     """
     return Task(
-        description="""Review the existing ETL pipeline implementation against the
-        technical specifications. Evaluate:
-
-        1. API extraction code (football_api_client.py, extract_football_data.py)
-           - Is error handling robust?
-           - Are rate limits handled properly?
-           - Is the data coverage sufficient?
-
-        2. Database loader (database_loader.py)
-           - Are tables properly structured?
-           - Is upsert logic correct?
-           - Are indexes needed for performance?
-
-        3. Airflow DAG (football_etl_dag.py)
-           - Is the schedule appropriate?
-           - Are task dependencies correct?
-           - Is retry logic adequate?
-
-        Provide specific recommendations for improvements or confirm the implementation
-        is production-ready.""",
+        description="""Review the ETL pipeline described in the project context below:
+        error handling and rate limits of the API client, upsert logic and indexes of
+        the database loader, and the Airflow DAG's schedule, dependencies and retries.
+        Recommend specific improvements or confirm what is production-ready.
+
+        Project context:
+        """ + build_context_pack(('loaders', 'warehouse')),
         agent=agent,
         context=context,
-        expected_output="""A code review document containing:
-        1. Assessment of each component (API client, database loader, Airflow DAG)
-        2. List of issues found (if any) with severity levels
-        3. Specific recommendations for improvements
-        4. Confirmation of what is working well
-        5. Overall readiness assessment"""
+        expected_output="""A code review: assessment per component, issues with severity,
+        recommendations, what works well, and overall readiness."""
     )
 
 
-def create_dbt_review_task(agent, context: List[Task]) -> Task:
+def create_dbt_review_task(agent, context: Optional[List[Task]] = None) -> Task:
     """Create task for Data Analyst to review dbt models.
 
+    The project context pack describes the models, so the task needs no
+    earlier task outputs.
+
     Args:
         agent: Data Analyst agent
-        context: Previous tasks to use as context
+        context: Previous tasks to use as context (none by default)
 
     Returns:
         Task for reviewing dbt implementation
     """
     return Task(
-        description="""Review the existing dbt models against the technical specifications
-        and business requirements. Evaluate:
+        description="""Review the dbt models in the project context below: staging
+        fields, types and naming, analytics calculations and coverage of football
+        analytics questions, and data quality tests. Recommend missing models,
+        metrics or tests.
 
-        1. Staging models (stg_competitions, stg_teams, stg_matches, stg_standings)
-           - Are all necessary fields extracted?
-           - Are data types appropriate?
-           - Is the naming convention consistent?
-
-        2. Analytics models (team_performance, match_results, competition_summary, team_head_to_head)
-           - Do they answer the business questions?
-           - Are calculations correct?
-           - Are there missing metrics that should be added?
-
-        3. Data quality
-           - Are tests defined?
-           - Are there data quality issues to address?
-
-        Provide specific recommendations for additional models, metrics, or improvements.""",
+        Project context:
+        """ + build_context_pack(('lineage', 'columns', 'warehouse')),
         agent=agent,
         context=context,
-        expected_output="""A dbt review document containing:
-        1. Assessment of staging layer completeness
-        2. Assessment of analytics models against business requirements
-        3. List of missing models or metrics
-        4. Recommendations for additional transformations
-        5. Data quality assessment and test recommendations"""
+        expected_output="""A dbt review: staging and analytics assessment, missing models or
+        metrics, and data quality and test recommendations."""
     )
 
 
@@ -159,36 +135,23 @@ def create_visualization_plan_task(agent, context: List[Task]) -> Task:
 
     Args:
         agent: BI Analyst agent
-        context: Previous tasks to use as context
+        context: Previous tasks to use as context (the technical specifications)
 
     Returns:
         Task for planning visualizations
     """
     return Task(
-        description="""Based on the available analytics models and business requirements,
-        create a detailed plan for Metabase dashboards and visualizations.
+        description="""Plan 2-3 Metabase dashboards answering the business questions in
+        the technical specifications, built on the analytics models in the project
+        context below. For each chart give the analytics table it queries, filters,
+        chart type and key metrics.
 
-        For each business question, specify:
-        - Dashboard name and purpose
-        - Individual charts/visualizations needed
-        - What analytics table(s) to query
-        - What filters should be available
-        - Chart type (bar, line, pie, table, etc.)
-        - Key metrics to highlight
-
-        Design 2-3 comprehensive dashboards that would provide maximum value to
-        stakeholders.""",
+        Project context:
+        """ + build_context_pack(('lineage', 'columns'), max_tokens=600),
         agent=agent,
         context=context,
-        expected_output="""A visualization plan document containing:
-        1. Dashboard 1: Overview dashboard with key metrics
-           - List of charts and their specifications
-        2. Dashboard 2: Team performance dashboard
-           - List of charts and their specifications
-        3. Dashboard 3: Competition analysis dashboard
-           - List of charts and their specifications
-        4. For each chart: data source, filters, chart type, and purpose
-        5. Sample SQL queries for key visualizations"""
+        expected_output="""A visualization plan: per dashboard its purpose and charts, each with
+        data source, filters, chart type and purpose, plus sample SQL for key charts."""
     )
 
 